@@ -7,12 +7,15 @@ This module is responsible for:
 3. Executing actions through AgentContextProtocol
 """
 
+import logging
 import threading
 import time
 import json
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
 from datetime import datetime, timezone
 
+from config.experiments import AI_PARTICIPANT_TYPES
 from functions import parse_iso_timestamp_utc
 import routes.session as session_module
 from routes.participant import (
@@ -23,6 +26,37 @@ from routes.participant import (
 from agent.agent_context_protocol import AgentContextProtocol
 from agent.llm_client import create_llm_client, LLMClient
 
+# Per-cycle diagnostics (full LLM responses, parsed actions, dashboard config) go through
+# this logger at DEBUG so nothing is formatted unless LOG_LEVEL=DEBUG.
+logger = logging.getLogger(__name__)
+
+
+# Extracted text of each agent's assigned document, keyed on (participant_id, session_id).
+# The assignment does not change during a session, but the prompt is rebuilt (and the PDF
+# re-parsed) on every perception cycle. The TTL lets a late re-assignment through even if
+# the explicit invalidation below is missed.
+_ASSIGNED_DOC_CACHE_TTL = 300.0
+_ASSIGNED_DOC_CACHE_MAX = 1024
+_assigned_doc_cache: Dict[Tuple[str, str], Tuple[float, str, Optional[str]]] = {}
+_assigned_doc_cache_lock = threading.Lock()
+# filename -> (done event, [content]) for extractions in progress. Agents of a session start
+# together and are often assigned the same PDF; the first caller parses it and the rest wait
+# for that result instead of all parsing the file at once.
+_doc_extract_inflight: Dict[str, Tuple[threading.Event, list]] = {}
+_DOC_EXTRACT_WAIT_SECONDS = 30.0
+
+# Prompt file contents by prompt name. Every runner loads its template when it is created,
+# and all agents of a session share the same one or two files.
+_prompt_template_cache: Dict[str, str] = {}
+
+
+def invalidate_assigned_document(participant_id: str, session_id: Optional[str] = None):
+    """Drop cached document text for a participant (all sessions when session_id is None)."""
+    with _assigned_doc_cache_lock:
+        for key in list(_assigned_doc_cache):
+            if key[0] == participant_id and (session_id is None or key[1] == session_id):
+                del _assigned_doc_cache[key]
+
 
 class AgentRunner:
     """Manages agent perception and action execution"""
@@ -62,6 +96,10 @@ class AgentRunner:
         # Agent state
         self.is_running = False
         self.perception_thread = None
+        # Set by stop() so the perception loop wakes from its wait immediately
+        self._stop_event = None
+        # Position of this agent in session['participants'] at the last lookup
+        self._participant_index = None
         self.protocol = AgentContextProtocol(participant_id, session_id, experiment_type)
         
         # Load prompt template (will be loaded later when we have participant info)
@@ -88,7 +126,7 @@ class AgentRunner:
                             # Check if there are human participants
                             participants_list = session.get('participants', [])
                             has_human_participant = any(
-                                p.get('type', '').lower() not in ['ai', 'ai_agent'] 
+                                p.get('type', '').lower() not in AI_PARTICIPANT_TYPES 
                                 for p in participants_list
                             )
                             # Only auto-trigger initial vote if no human participants
@@ -109,20 +147,46 @@ class AgentRunner:
                 import traceback
                 traceback.print_exc()
         
-        self.perception_thread = threading.Thread(target=self._perception_loop, daemon=True)
+        # Fresh event per loop: a previous loop still finishing an LLM call keeps its own
+        # (already set) event and exits instead of resuming alongside the new one.
+        self._stop_event = threading.Event()
+        self.perception_thread = threading.Thread(
+            target=self._perception_loop, args=(self._stop_event,), daemon=True
+        )
         self.perception_thread.start()
         print(f'[AgentRunner] Started agent {self.participant_id} for session {self.session_id}')
     
+    def reconfigure(self, experiment_type: str, participant_role: Optional[str] = None):
+        """
+        Point a live runner at a new experiment type (and role) without stopping it. The LLM
+        client and perception thread are kept; the next perception cycle uses the new settings.
+        """
+        if participant_role is None:
+            participant_role = self.participant_role
+        if experiment_type == self.experiment_type and participant_role == self.participant_role:
+            return
+        self.experiment_type = experiment_type
+        self.participant_role = participant_role
+        self.protocol = AgentContextProtocol(self.participant_id, self.session_id, experiment_type)
+        self.prompt_template = None
+        logger.info('Reconfigured agent %s for %s', self.participant_id, experiment_type)
+    
+    def request_stop(self):
+        """Signal the perception loop to stop without waiting for it"""
+        self.is_running = False
+        if self._stop_event:
+            self._stop_event.set()
+
     def stop(self):
         """Stop the agent perception loop"""
-        self.is_running = False
+        self.request_stop()
         if self.perception_thread:
             self.perception_thread.join(timeout=2.0)
         print(f'[AgentRunner] Stopped agent {self.participant_id}')
     
-    def _perception_loop(self):
+    def _perception_loop(self, stop_event: threading.Event):
         """Main perception loop that runs periodically"""
-        while self.is_running:
+        while self.is_running and not stop_event.is_set():
             try:
                 # Check if session is still running
                 session_key, session = find_session_by_identifier(self.session_id)
@@ -134,14 +198,14 @@ class AgentRunner:
                 # Only run if session status is 'running'
                 if session.get('status') != 'running':
                     # Wait a bit before checking again
-                    time.sleep(5)
+                    stop_event.wait(5)
                     continue
 
                 # Meeting room + Realtime bridge: no chat-completions perception loop
                 try:
                     from services.realtime_session_config import session_includes_meeting_room
                     if session_includes_meeting_room(session):
-                        time.sleep(5)
+                        stop_event.wait(5)
                         continue
                 except Exception:
                     pass
@@ -157,14 +221,14 @@ class AgentRunner:
                 self._perceive_and_act(session, session_key)
                 
                 # Wait for next perception window
-                time.sleep(perception_window)
+                stop_event.wait(perception_window)
                 
             except Exception as e:
                 print(f'[AgentRunner] Error in perception loop: {e}')
                 import traceback
                 traceback.print_exc()
                 # Wait a bit before retrying
-                time.sleep(5)
+                stop_event.wait(5)
     
     def _perceive_and_act(self, session: Dict[str, Any], session_key: str):
         """Perceive environment and generate/execute actions"""
@@ -230,38 +294,26 @@ class AgentRunner:
                 print(f'[AgentRunner] No response from LLM for participant {self.participant_id}')
                 return
             
-            # Debug: Print LLM response
+            # Debug: LLM response
             participant_name = participant.get("name") or participant.get("participant_name")
-            print(f'\n{"="*80}')
-            print(f'[AgentRunner] DEBUG - LLM RESPONSE')
-            print(f'{"="*80}')
-            print(f'Participant: {participant_name} ({self.participant_id})')
-            print(f'Response Length: {len(response)} characters')
-            print(f'\n--- Full LLM Response ---')
-            print(response)
-            print(f'--- End LLM Response ---')
-            print(f'{"="*80}\n')
+            logger.debug(
+                'LLM response for %s (%s), %d characters:\n%s',
+                participant_name, self.participant_id, len(response), response
+            )
             
             # Parse response
             actions = self._parse_response(response)
             
-            # Debug: Print parsed actions
+            # Debug: parsed actions
             if actions:
-                print(f'\n{"="*80}')
-                print(f'[AgentRunner] DEBUG - PARSED ACTIONS')
-                print(f'{"="*80}')
-                print(f'Participant: {participant_name} ({self.participant_id})')
-                print(f'Total Actions: {len(actions)}')
-                print(f'\n--- Actions List ---')
-                for i, action in enumerate(actions):
-                    print(f'\nAction {i+1}:')
-                    print(json.dumps(action, indent=2, ensure_ascii=False))
-                print(f'\n--- End Actions List ---')
-                print(f'{"="*80}\n')
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        'Parsed %d action(s) for %s (%s):\n%s',
+                        len(actions), participant_name, self.participant_id,
+                        json.dumps(actions, indent=2, ensure_ascii=False)
+                    )
             else:
-                print(f'\n{"="*80}')
-                print(f'[AgentRunner] DEBUG - No actions parsed from response')
-                print(f'{"="*80}\n')
+                logger.debug('No actions parsed from response for %s', self.participant_id)
             
             if not actions:
                 print(f'[AgentRunner] No actions generated for participant {self.participant_id}')
@@ -664,25 +716,16 @@ Response:"""
             'Session.Interaction.awarenessDashboard'
         )
         
-        # Debug: Print awareness dashboard config
-        print(f'\n[AgentRunner] DEBUG - Awareness Dashboard Config:')
-        print(f'  Raw value from get_value_from_session_params: {awareness_dashboard}')
-        print(f'  Type: {type(awareness_dashboard)}')
-        if isinstance(awareness_dashboard, dict):
-            print(f'  Enabled: {awareness_dashboard.get("enabled")}')
-            print(f'  Items: {awareness_dashboard.get("items")}')
-        
-        # Also check session.interaction directly
-        session_interaction = session.get('interaction', {})
-        print(f'  Session.interaction structure: {json.dumps(session_interaction, indent=2, default=str)}')
+        # Debug: awareness dashboard config
+        logger.debug('Awareness Dashboard config for %s: %r', self.participant_id, awareness_dashboard)
         
         # Check if awareness dashboard is enabled
         if not isinstance(awareness_dashboard, dict) or not awareness_dashboard.get('enabled'):
             # If not enabled, return empty list (no information about others)
-            print(f'[AgentRunner] Awareness Dashboard is DISABLED or invalid config')
+            logger.debug('Awareness Dashboard is DISABLED or invalid config')
             return []
         
-        print(f'[AgentRunner] Awareness Dashboard is ENABLED with items: {awareness_dashboard.get("items")}')
+        logger.debug('Awareness Dashboard is ENABLED with items: %s', awareness_dashboard.get('items'))
         
         # Get enabled items (can be indices or paths)
         items = awareness_dashboard.get('items', [])
@@ -690,21 +733,8 @@ Response:"""
             return []
         
         # Get the awareness dashboard options to map indices to paths
-        from config.experiments import get_experiment_by_id
-        exp_cfg = get_experiment_by_id(self.experiment_type) or {}
-        interaction_cfg = exp_cfg.get('interaction', {})
-        
-        # Find awareness dashboard config
-        awareness_config = None
-        if isinstance(interaction_cfg, dict):
-            for category, settings in interaction_cfg.items():
-                if isinstance(settings, list):
-                    for setting in settings:
-                        if isinstance(setting, dict) and setting.get('path') == 'Session.Interaction.awarenessDashboard':
-                            awareness_config = setting
-                            break
-        
-        options = awareness_config.get('options', []) if awareness_config else []
+        from config.experiments import get_interaction_options
+        options = get_interaction_options(self.experiment_type, 'Session.Interaction.awarenessDashboard')
         
         # Map items (indices or paths) to actual paths
         enabled_paths = []
@@ -1054,13 +1084,13 @@ Response:"""
             read_names_str = ', '.join(read_essay_names) if read_essay_names else 'None'
             
             # Debug logging
-            print(f'[AgentRunner] Including {len(read_essays)} read essays in prompt: {read_names_str}')
+            logger.debug('Including %d read essays in prompt: %s', len(read_essays), read_names_str)
             
             # Append read essays section to the prompt
             read_essays_section = f"\n\n<READ ESSAYS CONTENT>\nYou have already read the following essays: {read_names_str}. The full content is provided below. You do NOT need to read them again with get_essay_content action.\n\n{read_essays_str}\n</READ ESSAYS CONTENT>\n"
             prompt = prompt + read_essays_section
         else:
-            print(f'[AgentRunner] No read essays found for participant {participant.get("id")} (participant keys: {list(participant.keys())})')
+            logger.debug('No read essays found for participant %s', participant.get('id'))
         
         return prompt
     
@@ -1173,7 +1203,42 @@ Response:"""
         return prompt
     
     def _read_document_content(self, filename: str) -> Optional[str]:
-        """Read PDF document content"""
+        """Read PDF document content (cached per agent, see _assigned_doc_cache)"""
+        key = (self.participant_id, self.session_id)
+        now = time.monotonic()
+        with _assigned_doc_cache_lock:
+            cached = _assigned_doc_cache.get(key)
+        if cached and cached[1] == filename and now - cached[0] < _ASSIGNED_DOC_CACHE_TTL:
+            return cached[2]
+
+        content = self._extract_document_once(filename)
+        if content is None:
+            return None
+        with _assigned_doc_cache_lock:
+            if len(_assigned_doc_cache) >= _ASSIGNED_DOC_CACHE_MAX and key not in _assigned_doc_cache:
+                _assigned_doc_cache.pop(next(iter(_assigned_doc_cache)))
+            _assigned_doc_cache[key] = (now, filename, content)
+        return content
+
+    def _extract_document_once(self, filename: str) -> Optional[str]:
+        """Extract a document, sharing one in-flight extraction between concurrent callers"""
+        done = threading.Event()
+        with _assigned_doc_cache_lock:
+            pending = _doc_extract_inflight.setdefault(filename, (done, [None]))
+        if pending[0] is not done:
+            if pending[0].wait(_DOC_EXTRACT_WAIT_SECONDS):
+                return pending[1][0]
+            return self._extract_document_content(filename)
+        try:
+            pending[1][0] = self._extract_document_content(filename)
+        finally:
+            with _assigned_doc_cache_lock:
+                _doc_extract_inflight.pop(filename, None)
+            done.set()
+        return pending[1][0]
+
+    def _extract_document_content(self, filename: str) -> Optional[str]:
+        """Extract text from a PDF in uploads/essays"""
         try:
             import os
             upload_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'uploads', 'essays')
@@ -1463,8 +1528,6 @@ Response:"""
     
     def _load_prompt_template(self, participant: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """Load prompt template for the experiment type (supports role-specific prompts)"""
-        import os
-        
         # Determine prompt file name based on experiment type and role
         if self.experiment_type == 'wordguessing':
             role = self.participant_role or (participant.get('role') if participant else None)
@@ -1475,6 +1538,17 @@ Response:"""
         else:
             prompt_name = f'{self.experiment_type}_agent'
         
+        cached = _prompt_template_cache.get(prompt_name)
+        if cached is not None:
+            return cached
+        template = self._read_prompt_template(prompt_name)
+        if template is not None:
+            _prompt_template_cache[prompt_name] = template
+        return template
+    
+    def _read_prompt_template(self, prompt_name: str) -> Optional[str]:
+        import os
+        
         # Try relative to this file (most reliable)
         current_dir = os.path.dirname(os.path.abspath(__file__))
         prompt_file = os.path.join(current_dir, 'prompts', f'{prompt_name}_prompt.txt')
@@ -1502,14 +1576,25 @@ Response:"""
     def _find_participant(self, session: Dict[str, Any]):
         """Find participant by participant_id"""
         participants = session.get('participants', [])
-        for p in participants:
+        # Called several times per perception cycle; the roster rarely changes, so try the
+        # remembered position first and only rescan when it no longer holds this agent
+        idx = self._participant_index
+        if idx is not None and idx < len(participants) and participants[idx].get('id') == self.participant_id:
+            return participants[idx]
+        for i, p in enumerate(participants):
             if p.get('id') == self.participant_id:
+                self._participant_index = i
                 return p
+        self._participant_index = None
         return None
 
 
 # Global registry of agent runners
 _agent_runners: Dict[str, AgentRunner] = {}
+# session_id -> participant_ids with a registered runner, so a session's agents can be
+# found without walking its participant list or every registered runner
+_session_agents: Dict[str, Set[str]] = {}
+_session_agents_lock = threading.Lock()
 
 
 def get_agent_runner(participant_id: str, session_id: str) -> Optional[AgentRunner]:
@@ -1540,20 +1625,23 @@ def register_agent_runner(
     """
     key = f"{session_id}:{participant_id}"
     
-    if key in _agent_runners:
-        # Already registered - ensure it's started (idempotent)
-        runner = _agent_runners[key]
-        runner.start()
-        return runner
-    
-    runner = AgentRunner(
-        participant_id, 
-        session_id, 
-        experiment_type, 
-        participant_role=participant_role,
-        llm_config=llm_config
-    )
-    _agent_runners[key] = runner
+    runner = _agent_runners.get(key)
+    if runner is None:
+        candidate = AgentRunner(
+            participant_id, 
+            session_id, 
+            experiment_type, 
+            participant_role=participant_role,
+            llm_config=llm_config
+        )
+        # setdefault is an atomic test-and-set: if two requests register the same agent
+        # concurrently, only one runner is kept and the other (never started) is discarded.
+        runner = _agent_runners.setdefault(key, candidate)
+        with _session_agents_lock:
+            _session_agents.setdefault(session_id, set()).add(participant_id)
+    else:
+        # Already registered (e.g. the researcher switched experiment_type): update it in place
+        runner.reconfigure(experiment_type, participant_role)
     
     # Start immediately - perception loop will wait until session status is 'running'
     # before taking actions (see _perception_loop)
@@ -1562,102 +1650,183 @@ def register_agent_runner(
     return runner
 
 
-def start_agent_runner(participant_id: str, session_id: str):
-    """Start agent runner for a participant and mark as online"""
-    runner = get_agent_runner(participant_id, session_id)
-    if runner:
-        runner.start()
-        print(f'[AgentRunner] Started agent runner for participant {participant_id}')
+def _set_agents_status(session_id: str, participant_ids: Iterable[str], status: str):
+    """Set status on the given agent participants, then commit and broadcast the session once"""
+    try:
+        session_key, session = find_session_by_identifier(session_id)
+        if not session:
+            # Expected when agents are stopped because their session was deleted
+            if status == 'online':
+                logger.warning('Session %s not found when updating online status', session_id)
+            return
         
-        # Mark participant as online and broadcast update
-        try:
-            sessions = session_module.sessions
-            session_key, session = find_session_by_identifier(session_id)
-            if not session:
-                print(f'[AgentRunner] Warning: Session {session_id} not found when updating online status')
-                return
-            
-            participants = session.get('participants', [])
-            updated = False
-            participant_name = None
-            
-            for participant in participants:
-                if participant.get('id') == participant_id:
-                    old_status = participant.get('status', 'offline')
-                    participant['status'] = 'online'
-                    participant_name = participant.get('name') or participant.get('participant_name')
-                    updated = True
-                    print(f'[AgentRunner] Updated status for participant {participant_id} ({participant_name}): {old_status} -> online')
-                    break
-            
-            if updated:
-                session['participants'] = participants
-                session_module.commit_session(session_key, session)
-                
-                # Broadcast update
-                from websocket.handlers import broadcast_participant_update
-                broadcast_participant_update(
-                    session_id=session_id,
-                    participants=participants,
-                    session_info=session,
-                    update_type='partial'
+        wanted = set(participant_ids)
+        participants = session.get('participants', [])
+        updated = []
+        
+        for participant in participants:
+            participant_id = participant.get('id')
+            if participant_id in wanted:
+                old_status = participant.get('status', 'offline')
+                participant['status'] = status
+                updated.append(participant_id)
+                logger.debug(
+                    'Updated status for participant %s (%s): %s -> %s',
+                    participant_id, participant.get('name') or participant.get('participant_name'), old_status, status,
                 )
-                print(f'[AgentRunner] Broadcasted online status update for participant {participant_id} ({participant_name})')
-            else:
-                print(f'[AgentRunner] Warning: Participant {participant_id} not found in session when updating online status')
+        
+        if not updated:
+            logger.warning('Participants %s not found in session when updating %s status', sorted(wanted), status)
+            return
+        
+        session['participants'] = participants
+        session_module.commit_session(session_key, session)
+        
+        # Broadcast update
+        from websocket.handlers import broadcast_participant_update
+        broadcast_participant_update(
+            session_id=session_id,
+            participants=participants,
+            session_info=session,
+            update_type='partial'
+        )
+        logger.debug('Broadcasted %s status update for %s participant(s)', status, len(updated))
+    
+    except Exception:
+        logger.exception('Error updating %s status', status)
 
-        except Exception as e:
-            print(f'[AgentRunner] Error updating online status: {e}')
-            import traceback
-            traceback.print_exc()
-    else:
-        print(f'[AgentRunner] Warning: Runner not found for participant {participant_id} in session {session_id}. Make sure agent is registered first.')
+
+def _start_runner(participant_id: str, session_id: str) -> bool:
+    runner = get_agent_runner(participant_id, session_id)
+    if not runner:
+        logger.warning('Runner not found for participant %s in session %s. Make sure agent is registered first.', participant_id, session_id)
+        return False
+    runner.start()
+    logger.debug('Started agent runner for participant %s', participant_id)
+    return True
+
+
+def _detach_runner(participant_id: str, session_id: str) -> Optional[AgentRunner]:
+    """Unregister a runner, signal its loop to stop and drop its cached document; return it"""
+    # pop() claims the runner atomically so concurrent stops cannot both tear it down
+    runner = _agent_runners.pop(f"{session_id}:{participant_id}", None)
+    if not runner:
+        return None
+    with _session_agents_lock:
+        ids = _session_agents.get(session_id)
+        if ids is not None:
+            ids.discard(participant_id)
+            if not ids:
+                del _session_agents[session_id]
+    runner.request_stop()
+    invalidate_assigned_document(participant_id, session_id)
+    return runner
+
+
+def _shutdown_runner(runner: AgentRunner) -> bool:
+    """Wait for a detached runner's thread to finish"""
+    runner.stop()
+    # An iteration that was already running can have cached the document again; drop it unless
+    # a new runner (started after the detach) now owns that key
+    if f"{runner.session_id}:{runner.participant_id}" not in _agent_runners:
+        invalidate_assigned_document(runner.participant_id, runner.session_id)
+    return True
+
+
+def _stop_runner(participant_id: str, session_id: str) -> bool:
+    runner = _detach_runner(participant_id, session_id)
+    if not runner:
+        return False
+    return _shutdown_runner(runner)
+
+
+def start_agent_runner(participant_id: str, session_id: str):
+    """Start agent runner for a participant and mark as online"""
+    if _start_runner(participant_id, session_id):
+        _set_agents_status(session_id, [participant_id], 'online')
 
 
 def stop_agent_runner(participant_id: str, session_id: str):
     """Stop agent runner for a participant and mark as offline"""
-    runner = get_agent_runner(participant_id, session_id)
-    if runner:
-        runner.stop()
-        key = f"{session_id}:{participant_id}"
-        del _agent_runners[key]
-        
-        # Mark participant as offline and broadcast update
+    if _stop_runner(participant_id, session_id):
+        _set_agents_status(session_id, [participant_id], 'offline')
+
+
+# Upper bound on concurrent start/stop calls when a session changes state. Stopping joins
+# each perception thread (up to 2 s), so doing a whole roster serially adds up.
+AGENT_ACTIVATION_WORKERS = 8
+
+
+def _for_each_agent(fn, participant_ids: Iterable[str], session_id: str) -> List[str]:
+    """Run fn(participant_id, session_id) for each agent; return the ids it succeeded for"""
+    ids = [pid for pid in participant_ids if pid]
+    if len(ids) <= 1:
+        results = [fn(pid, session_id) for pid in ids]
+    else:
+        with ThreadPoolExecutor(max_workers=min(AGENT_ACTIVATION_WORKERS, len(ids))) as ex:
+            results = list(ex.map(lambda pid: fn(pid, session_id), ids))
+    return [pid for pid, ok in zip(ids, results) if ok]
+
+
+def start_agent_runners(participant_ids: Iterable[str], session_id: str) -> List[str]:
+    """Start several agent runners concurrently, then mark them online with one commit and broadcast; return the started ids"""
+    started = _for_each_agent(_start_runner, participant_ids, session_id)
+    if started:
+        _set_agents_status(session_id, started, 'online')
+    return started
+
+
+def stop_agent_runners(participant_ids: Iterable[str], session_id: str) -> List[str]:
+    """Stop several agent runners concurrently, then mark them offline with one commit and broadcast; return the stopped ids"""
+    stopped = _for_each_agent(_stop_runner, participant_ids, session_id)
+    if stopped:
+        _set_agents_status(session_id, stopped, 'offline')
+    return stopped
+
+
+def detach_agent_runners(participant_ids: Iterable[str], session_id: str, on_stopped=None) -> List[str]:
+    """
+    Unregister several agent runners and signal them to stop now, and wait for their threads in
+    a background task; return the detached ids. Unlike stop_agent_runners this neither waits for the perception threads
+    nor commits: the caller marks the returned agents offline with its own save.
+    on_stopped(ids) runs in the background task once every thread has been stopped.
+    """
+    runners = {}
+    for pid in participant_ids:
+        runner = _detach_runner(pid, session_id) if pid else None
+        if runner:
+            runners[pid] = runner
+    if not runners:
+        return []
+
+    def _stop_all():
         try:
-            sessions = session_module.sessions
-            session_key, session = find_session_by_identifier(session_id)
-            if session:
-                participants = session.get('participants', [])
-                updated = False
-                
-                for participant in participants:
-                    if participant.get('id') == participant_id:
-                        old_status = participant.get('status', 'online')
-                        participant['status'] = 'offline'
-                        updated = True
-                        print(f'[AgentRunner] Updated status for participant {participant_id}: {old_status} -> offline')
-                        break
-                
-                if updated:
-                    session['participants'] = participants
-                    session_module.commit_session(session_key, session)
-                    
-                    # Broadcast update
-                    from websocket.handlers import broadcast_participant_update
-                    broadcast_participant_update(
-                        session_id=session_id,
-                        participants=participants,
-                        session_info=session,
-                        update_type='partial'
-                    )
-                    print(f'[AgentRunner] Marked participant {participant_id} as offline')
-        except Exception as e:
-            print(f'[AgentRunner] Error updating offline status: {e}')
+            _for_each_agent(lambda pid, _sid: _shutdown_runner(runners[pid]), runners, session_id)
+            if on_stopped:
+                on_stopped(list(runners))
+        except Exception:
+            logger.exception('Error stopping detached agent runners for session %s', session_id)
+
+    threading.Thread(target=_stop_all, daemon=True).start()
+    return list(runners)
+
+
+def stop_session_agent_runners(session_id: str):
+    """Stop every agent runner registered for a session"""
+    with _session_agents_lock:
+        ids = _session_agents.pop(session_id, None)
+    if ids:
+        stop_agent_runners(ids, session_id)
 
 
 def stop_all_agent_runners():
     """Stop all agent runners"""
-    for runner in _agent_runners.values():
+    with _session_agents_lock:
+        _session_agents.clear()
+    while _agent_runners:
+        try:
+            _, runner = _agent_runners.popitem()
+        except KeyError:
+            break
         runner.stop()
-    _agent_runners.clear()
 
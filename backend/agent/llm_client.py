@@ -49,8 +49,8 @@ class OpenAIClient(LLMClient):
     
     def __init__(self, api_key: str):
         try:
-            from openai import OpenAI
-            self.client = OpenAI(api_key=api_key)
+            from services.openai_clients import get_openai_client
+            self.client = get_openai_client(api_key)
         except ImportError:
             raise ImportError("OpenAI package not installed. Install with: pip install openai")
     
@@ -89,12 +89,8 @@ class AzureOpenAIClient(LLMClient):
         deployment: Optional[str] = None
     ):
         try:
-            from openai import AzureOpenAI
-            self.client = AzureOpenAI(
-                api_version=api_version,
-                azure_endpoint=endpoint,
-                api_key=api_key,
-            )
+            from services.openai_clients import get_azure_openai_client
+            self.client = get_azure_openai_client(api_key, api_version, endpoint)
             self.deployment = deployment
         except ImportError:
             raise ImportError("OpenAI package not installed. Install with: pip install openai")
@@ -6,7 +6,32 @@ try:
 except ImportError:
     pass  # python-dotenv optional; use env vars directly if not installed
 
+import atexit
+import logging
+import logging.handlers
+import queue
+
+# Hot-path diagnostics use logging at DEBUG; LOG_LEVEL=DEBUG turns them on (WARNING silences
+# per-connection chatter). Handlers only enqueue records; a listener thread writes them to
+# stderr, so socket and request threads never block on console I/O.
+_log_queue = queue.SimpleQueue()
+_log_output = logging.StreamHandler()
+_log_output.setFormatter(logging.Formatter('[%(name)s] %(message)s'))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_output)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+_log_enqueue = logging.handlers.QueueHandler(_log_queue)
+_log_enqueue.setFormatter(logging.Formatter('%(message)s'))  # layout is applied by _log_output
+logging.basicConfig(
+    level=getattr(logging, (os.environ.get('LOG_LEVEL') or 'INFO').upper(), logging.INFO),
+    handlers=[_log_enqueue],
+)
+# One access-log line per HTTP request (including every Socket.IO long-poll) is only kept at DEBUG
+if logging.getLogger().getEffectiveLevel() > logging.DEBUG:
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
 from flask import Flask, render_template, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_socketio import SocketIO
 from flask_cors import CORS
 from routes.session import session_bp, hydrate_sessions_from_db
@@ -14,8 +39,34 @@ from routes.participant import participant_bp
 from routes.mturk import mturk_bp
 from routes.realtime_routes import realtime_bp
 from routes.meeting_floor_routes import meeting_floor_bp
+from websocket import json_codec
+
+class _CodecJSONProvider(DefaultJSONProvider):
+    """
+    jsonify() and request.get_json() through websocket.json_codec (orjson when installed), like
+    Socket.IO packets. Output matches the default provider: keys sorted, and types orjson leaves
+    to `default` (datetime as an HTTP date, Decimal, ...) converted by Flask's own default.
+    Debug-mode pretty printing keeps the stdlib encoder.
+    """
+
+    def dumps(self, obj, **kwargs):
+        orjson = json_codec.orjson
+        if orjson is not None and 'indent' not in kwargs:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            try:
+                return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+            except TypeError:
+                pass  # e.g. mixed key types; the stdlib encoder decides
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        return json_codec.loads(s, **kwargs)
+
 
 app = Flask(__name__)
+app.json = _CodecJSONProvider(app)
 app.config['SECRET_KEY'] = os.environ.get('FLASK_SECRET_KEY') or os.environ.get('SECRET_KEY') or 'your-secret-key-here'
 
 # Register blueprints
@@ -28,11 +79,16 @@ app.register_blueprint(meeting_floor_bp)
 # Restore researcher sessions from PostgreSQL before other services use the in-memory store
 hydrate_sessions_from_db()
 
+# Open the request pool's first connections in the background, ahead of the first writes
+import threading
+from services.db import warm_pool
+threading.Thread(target=warm_pool, daemon=True).start()
+
 # Enable CORS for all routes
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 
 # Initialize SocketIO
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading', json=json_codec)
 
 # Import handlers after socketio is initialized to avoid circular import
 from websocket import handlers
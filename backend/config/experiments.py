@@ -1,6 +1,8 @@
 # Experiment configurations
 # This should match the frontend experiment configs
 
+from functools import lru_cache
+
 EXPERIMENTS = [
     {
         'id': 'shapefactory',
@@ -816,6 +818,9 @@ EXPERIMENTS = [
     }
 ]
 
+# participant['type'] values (lowercased) that mark an AI agent rather than a human
+AI_PARTICIPANT_TYPES = frozenset({'ai', 'ai_agent'})
+
 PARTICIPANTS = [
     {
         "shapefactory": [
@@ -1080,6 +1085,32 @@ def get_experiment_by_id(experiment_id):
             return exp
     return None
 
+@lru_cache(maxsize=256)
+def get_interaction_options(experiment_id, path):
+    """
+    Get the options of the interaction setting with the given path (e.g. 'Session.Interaction.awarenessDashboard')
+    from the experiment's default config. The config is static, so the lookup is cached; returns a tuple.
+    """
+    def walk(node):
+        if isinstance(node, dict):
+            if node.get('path') == path:
+                return node
+            for v in node.values():
+                r = walk(v)
+                if r is not None:
+                    return r
+        elif isinstance(node, list):
+            for it in node:
+                r = walk(it)
+                if r is not None:
+                    return r
+        return None
+
+    exp_cfg = get_experiment_by_id(experiment_id) or {}
+    setting = walk(exp_cfg.get('interaction', {}))
+    options = setting.get('options', []) if setting else []
+    return tuple(options) if isinstance(options, list) else ()
+
 def get_participant_by_id(participant_id):
     """Get participant config by ID"""
     for participant in PARTICIPANTS:
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import os
+import threading
+import time
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Tuple
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 
 import routes.session as session_module
 
@@ -24,9 +27,10 @@ def _find_session_by_identifier(session_identifier: str):
     identifier = unquote(session_identifier)
     if identifier in session_module.sessions:
         return identifier, session_module.sessions[identifier]
-    for sid, session in session_module.sessions.items():
-        if session.get("session_name", "").lower() == identifier.lower():
-            return sid, session
+    sid = session_module.find_session_key_by_name(identifier)
+    session = session_module.sessions.get(sid) if sid is not None else None
+    if session is not None:
+        return sid, session
     return None, None
 
 
@@ -42,13 +46,48 @@ def _mturk_endpoint_for_env(environment: str) -> str:
 
 
 def _get_mturk_client(environment: str):
+    region = (os.environ.get("AWS_REGION") or "us-east-1").strip()
+    return _mturk_client(region, _mturk_endpoint_for_env(environment))
+
+
+@lru_cache(maxsize=4)
+def _mturk_client(region: str, endpoint: str):
+    # Building a boto3 client loads the service model and opens a new connection pool; clients
+    # are thread-safe, so keep one per region/endpoint (as s3_storage does for S3).
     import boto3
 
-    region = (os.environ.get("AWS_REGION") or "us-east-1").strip()
-    endpoint = _mturk_endpoint_for_env(environment)
     return boto3.client("mturk", region_name=region, endpoint_url=endpoint)
 
 
+# Encoded assignment listings, (environment, hit_id) -> (monotonic time, JSON body). A listing
+# pages through the MTurk API (one HTTPS call per 100 assignments) and the researcher dashboard
+# requests it again on every refresh. Approving or rejecting clears the cache so the new status
+# shows at once; newly submitted assignments appear within the TTL.
+MTURK_ASSIGNMENTS_TTL = 30.0
+_assignments_cache: Dict[Tuple[str, str], Tuple[float, bytes]] = {}
+# Bumped by every clear; a listing fetched across an approve/reject is not stored
+_assignments_generation = 0
+_assignments_lock = threading.Lock()
+
+
+def _clear_assignments_cache() -> None:
+    global _assignments_generation
+    with _assignments_lock:
+        _assignments_generation += 1
+        _assignments_cache.clear()
+
+
+def _store_assignments(cache_key: Tuple[str, str], generation: int, body: bytes) -> None:
+    """Cache a listing fetched at `generation`, unless the cache was cleared meanwhile."""
+    now = time.monotonic()
+    with _assignments_lock:
+        if generation != _assignments_generation:
+            return
+        for key in [k for k, (ts, _) in _assignments_cache.items() if now - ts >= MTURK_ASSIGNMENTS_TTL]:
+            del _assignments_cache[key]
+        _assignments_cache[cache_key] = (now, body)
+
+
 def _error_response(prefix: str, exc: Exception, status: int = 500):
     return jsonify({"success": False, "error": f"{prefix}: {exc}"}), status
 
@@ -103,6 +142,12 @@ def list_assignments(session_identifier):
             return jsonify({"success": False, "error": "No associated HIT for this session"}), 400
 
         environment = _normalize_environment(mturk_cfg.get("environment"))
+        cache_key = (environment, hit_id)
+        cached = _assignments_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < MTURK_ASSIGNMENTS_TTL:
+            return Response(cached[1], status=200, mimetype="application/json")
+        generation = _assignments_generation
+
         client = _get_mturk_client(environment)
 
         assignments = []
@@ -131,7 +176,11 @@ def list_assignments(session_identifier):
             if not next_token:
                 break
 
-        return jsonify({"success": True, "hit_id": hit_id, "assignments": assignments}), 200
+        from websocket.json_codec import dumpb
+
+        body = dumpb({"success": True, "hit_id": hit_id, "assignments": assignments})
+        _store_assignments(cache_key, generation, body)
+        return Response(body, status=200, mimetype="application/json")
     except (BotoCoreError, ClientError) as exc:
         return _error_response("MTurk API error while listing assignments", exc, 502)
     except Exception as exc:
@@ -150,6 +199,7 @@ def approve_assignment(assignment_id):
             RequesterFeedback=feedback,
             OverrideRejection=False,
         )
+        _clear_assignments_cache()
         return jsonify({"success": True, "assignment_id": assignment_id}), 200
     except (BotoCoreError, ClientError) as exc:
         return _error_response("MTurk API error while approving assignment", exc, 502)
@@ -171,6 +221,7 @@ def reject_assignment(assignment_id):
             AssignmentId=assignment_id,
             RequesterFeedback=reason,
         )
+        _clear_assignments_cache()
         return jsonify({"success": True, "assignment_id": assignment_id}), 200
     except (BotoCoreError, ClientError) as exc:
         return _error_response("MTurk API error while rejecting assignment", exc, 502)
@@ -1,13 +1,16 @@
 # REST API for participants
 
-from flask import request, jsonify, Blueprint, send_from_directory
+from flask import request, jsonify, Blueprint, Response, send_from_directory
 import routes.session as session_module  # Import session module to access sessions storage
+import logging
 import os
 import tempfile
+import time
 import uuid
-from config.experiments import PARTICIPANTS, get_experiment_by_id
+from config.experiments import AI_PARTICIPANT_TYPES, PARTICIPANTS, get_experiment_by_id, get_interaction_options
 from websocket.handlers import broadcast_participant_update
 import copy
+import functools
 import uuid
 from datetime import datetime, timezone
 from functions import resolve_function, start_production
@@ -15,9 +18,18 @@ from functions import resolve_function, start_production
 # Create a blueprint for participant routes
 participant_bp = Blueprint('participant', __name__)
 
+logger = logging.getLogger(__name__)
+
 # Access sessions storage from session module
 sessions = session_module.sessions
 
+# Success bodies on the per-action endpoints go out through session_module.json_response
+# (orjson bytes); a payload that never changes is encoded once here.
+_SUCCESS_BODY = b'{"success":true}'
+
+# First-hop aliases for Participant.* binding paths (special-case common aliasing: wealth -> money)
+_PARTICIPANT_PATH_ALIASES = {'wealth': 'money'}
+
 
 def _parse_action_timestamp_sort_key(ts) -> float:
     """Chronological sort key for action log timestamps (Z / offset / legacy naive as UTC)."""
@@ -48,7 +60,7 @@ def _find_participant(found_session, participant_id):
 def _register_participant_agent_runner(found_session, session_key, participant) -> bool:
     """Register/start agent runner for an AI participant when experiment_type is available."""
     participant_type = (participant.get('type') or '').lower()
-    if participant_type not in ('ai', 'ai_agent'):
+    if participant_type not in AI_PARTICIPANT_TYPES:
         return False
 
     experiment_type = found_session.get('experiment_type')
@@ -82,7 +94,7 @@ def _log_human_action(session_key, found_session, participant_id, action_type, a
     participant = _find_participant(found_session, participant_id)
     if not participant:
         return
-    is_human = (participant.get('type', '') or '').lower() not in ('ai', 'ai_agent')
+    is_human = (participant.get('type', '') or '').lower() not in AI_PARTICIPANT_TYPES
     if not is_human:
         return  # Only log human actions from HTTP routes (agent actions logged in agent_context_protocol)
     from services.action_logger import log_action
@@ -116,8 +128,10 @@ def find_session_by_identifier(session_identifier):
         return session_identifier, sessions[session_identifier]
     
     # Try to find by session_name (case-insensitive)
-    for sid, session in sessions.items():
-        if session.get('session_name', '').lower() == session_identifier.lower():
+    sid = session_module.find_session_key_by_name(session_identifier)
+    if sid is not None:
+        session = sessions.get(sid)
+        if session is not None:
             return sid, session
     
     return None, None
@@ -128,16 +142,32 @@ def find_participant_by_name(participant_name, session):
         return None
     
     participants_list = session.get('participants', [])
+    wanted = participant_name.lower()
     
     # Search for participant by name (case-insensitive)
     for participant in participants_list:
         # Check both 'name' and 'participant_name' fields for compatibility
         participant_name_field = participant.get('name') or participant.get('participant_name')
-        if participant_name_field and participant_name_field.lower() == participant_name.lower():
+        if participant_name_field and participant_name_field.lower() == wanted:
             return participant
     
     return None
 
+# Resolved Session.Params.* / Session.Interaction.* values per session_id. Agents, the
+# production service and every interface rebuild resolve the same paths against a config
+# that rarely changes; writers call invalidate_session_params() and the TTL bounds the rest.
+SESSION_PARAMS_CACHE_TTL = 5.0
+_session_params_cache = {}  # session_id -> (created_at, {path: value})
+
+
+def invalidate_session_params(session_id=None):
+    """Forget cached param values for one session (or all sessions when session_id is None)."""
+    if session_id is None:
+        _session_params_cache.clear()
+    else:
+        _session_params_cache.pop(session_id, None)
+
+
 def get_value_from_session_params(session, path):
     """
     Get value from session params based on path (e.g., 'Session.Params.startingMoney' or 'Session.essays').
@@ -145,7 +175,26 @@ def get_value_from_session_params(session, path):
     """
     if not path or not isinstance(path, str):
         return None
-    
+
+    # Top-level fields (Session.essays) are plain dict reads and change often; only cache
+    # the nested Params/Interaction lookups.
+    session_id = session.get('session_id') if isinstance(session, dict) else None
+    if not session_id or path.count('.') < 2:
+        return _resolve_session_param(session, path)
+
+    now = time.monotonic()
+    entry = _session_params_cache.get(session_id)
+    if entry is None or now - entry[0] >= SESSION_PARAMS_CACHE_TTL:
+        entry = (now, {})
+        _session_params_cache[session_id] = entry
+    values = entry[1]
+    if path in values:
+        return values[path]
+    return values.setdefault(path, _resolve_session_param(session, path))
+
+
+def _resolve_session_param(session, path):
+    """Uncached lookup behind get_value_from_session_params."""
     # Parse path: Session.Params.startingMoney -> ['Session', 'Params', 'startingMoney']
     # or Session.essays -> ['Session', 'essays']
     parts = path.split('.')
@@ -158,9 +207,9 @@ def get_value_from_session_params(session, path):
         field_name = parts[1]  # e.g., 'essays'
         value = session.get(field_name) if isinstance(session, dict) else None
         # Debug logging for essays
-        if field_name == 'essays':
-            print(f'[get_value_from_session_params] Getting Session.essays: {len(value) if isinstance(value, list) else "not a list"} items')
-            print(f'[get_value_from_session_params] Essays value: {value}')
+        if field_name == 'essays' and logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Session params: Getting Session.essays: %s items', len(value) if isinstance(value, list) else "not a list")
+            logger.debug('Session params: Essays value: %s', value)
         return value
     
     # Handle Session.Params.xxx or Session.Interaction.xxx
@@ -178,7 +227,7 @@ def get_value_from_session_params(session, path):
     if section.lower() == 'params' and isinstance(section_data, dict):
         if param_name in section_data:
             value = section_data[param_name]
-            print(f'[get_value_from_session_params] Found {path} in flattened params: {value}')
+            logger.debug('Session params: Found %s in flattened params: %s', path, value)
             return value
 
     # Fallback: if params section is missing or not in the expected list format,
@@ -213,7 +262,7 @@ def get_value_from_session_params(session, path):
             value = section_data[param_name]
             # Debug logging for awarenessDashboard
             if path == 'Session.Interaction.awarenessDashboard':
-                print(f'[get_value_from_session_params] Found {path} via direct access: {value}')
+                logger.debug('Session params: Found %s via direct access: %s', path, value)
             return value
         
         # If not found, try nested structure (for config structure with path fields)
@@ -247,13 +296,13 @@ def get_value_from_session_params(session, path):
         result = find_in_interaction(section_data, path)
         
         # Debug logging for awarenessDashboard
-        if path == 'Session.Interaction.awarenessDashboard':
-            print(f'[get_value_from_session_params] Looking for {path}')
-            print(f'[get_value_from_session_params] Param name: {param_name}')
-            print(f'[get_value_from_session_params] Section data keys: {list(section_data.keys()) if isinstance(section_data, dict) else "not a dict"}')
-            print(f'[get_value_from_session_params] Direct access result: {section_data.get(param_name) if isinstance(section_data, dict) else "N/A"}')
-            print(f'[get_value_from_session_params] Nested search result: {result}')
-            print(f'[get_value_from_session_params] Final result: {result or section_data.get(param_name) if isinstance(section_data, dict) else result}')
+        if path == 'Session.Interaction.awarenessDashboard' and logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Session params: Looking for %s', path)
+            logger.debug('Session params: Param name: %s', param_name)
+            logger.debug('Session params: Section data keys: %s', list(section_data.keys()) if isinstance(section_data, dict) else "not a dict")
+            logger.debug('Session params: Direct access result: %s', section_data.get(param_name) if isinstance(section_data, dict) else "N/A")
+            logger.debug('Session params: Nested search result: %s', result)
+            logger.debug('Session params: Final result: %s', result or section_data.get(param_name) if isinstance(section_data, dict) else result)
         
         return result
     
@@ -297,6 +346,47 @@ def get_participant_config(experiment_id, session=None):
     
     return config_copy
 
+# Participant templates already specialized for a session's options limits, keyed by
+# (experiment_id, resolved limit values). update_participant_experiment_params runs on every
+# production, trade and interface rebuild and only reads the template, so it shares one
+# specialized copy instead of deep-copying PARTICIPANTS each time. Treat entries as read-only.
+_participant_template_cache = {}
+
+
+def _get_participant_template(experiment_id, session):
+    """
+    Return the (read-only) participant template for experiment_id with options limited by the
+    session params, or None if the experiment has no participant config.
+    """
+    participant_config = None
+    for participant_group in PARTICIPANTS:
+        if experiment_id in participant_group:
+            participant_config = participant_group[experiment_id]
+            break
+    if not participant_config:
+        return None
+
+    limit_values = ()
+    params_cfg = participant_config[0].get('experiment_params') if isinstance(participant_config[0], dict) else None
+    if isinstance(params_cfg, dict):
+        # Only numeric limits change the template (see get_participant_config)
+        limit_values = tuple(
+            limit if isinstance(limit, (int, float)) else None
+            for limit in (
+                get_value_from_session_params(session, param_config['options_limit_path'])
+                for param_config in params_cfg.values()
+                if isinstance(param_config, dict) and 'options_limit_path' in param_config
+            )
+        )
+
+    cache_key = (experiment_id, limit_values)
+    template = _participant_template_cache.get(cache_key)
+    if template is None:
+        config_copy = get_participant_config(experiment_id, session)
+        template = config_copy[0] if config_copy else None
+        _participant_template_cache[cache_key] = template
+    return template
+
 def generate_participant_interface_config(session, participant):
     """
     Based on the session configuration, generate the configuration (e.g., UI elements) for the participant.
@@ -343,13 +433,11 @@ def update_participant_experiment_params(participant, session):
 
         # Try top-level first, then experiment_params
         cur = p
-        # Special-case common aliasing: wealth -> money
-        alias_map = {'wealth': 'money'}
 
         for idx, key in enumerate(parts[1:]):
             # First hop: allow aliasing
-            if idx == 0 and key in alias_map:
-                key_candidates = [key, alias_map[key]]
+            if idx == 0 and key in _PARTICIPANT_PATH_ALIASES:
+                key_candidates = [key, _PARTICIPANT_PATH_ALIASES[key]]
             else:
                 key_candidates = [key]
 
@@ -444,7 +532,7 @@ def update_participant_experiment_params(participant, session):
                 limit_int = int(limit_value)
                 if limit_int > 0:
                     return options[:limit_int]
-        return options
+        return list(options)
 
     def _eval_visible_if(expr, session_obj, participant_obj=None):
         """
@@ -537,11 +625,7 @@ def update_participant_experiment_params(participant, session):
                     if not options and isinstance(session_obj, dict):
                         experiment_id = session_obj.get('experiment_type')
                         if experiment_id:
-                            exp_cfg = get_experiment_by_id(experiment_id) or {}
-                            exp_interaction = exp_cfg.get('interaction', {})
-                            param_cfg_from_exp = _find_interaction_param(exp_interaction, base_param_path)
-                            if param_cfg_from_exp:
-                                options = param_cfg_from_exp.get('options', [])
+                            options = get_interaction_options(experiment_id, base_param_path)
                     selected_paths = []
                     for idx in items:
                         if isinstance(idx, int) and 0 <= idx < len(options):
@@ -596,13 +680,11 @@ def update_participant_experiment_params(participant, session):
     if not experiment_id:
         return participant
     
-    # Get participant config
-    participant_config = get_participant_config(experiment_id, session)
-    if not participant_config or len(participant_config) == 0:
+    # Get participant config (shared, read-only; values taken from it are copied below)
+    participant_template = _get_participant_template(experiment_id, session)
+    if participant_template is None:
         return participant
     
-    participant_template = participant_config[0]
-    
     # Initialize experiment_params if it doesn't exist
     if 'experiment_params' not in participant:
         participant['experiment_params'] = {}
@@ -630,8 +712,8 @@ def update_participant_experiment_params(participant, session):
                 
                 # Debug logging for essays
                 if param_name == 'essays' and init_path == 'Session.essays':
-                    print(f'[Participant] Processing essays field - existing_value: {existing_value}')
-                    print(f'[Participant] Existing value type: {type(existing_value)}, length: {len(existing_value) if isinstance(existing_value, list) else "N/A"}')
+                    logger.debug('Processing essays field - existing_value: %s', existing_value)
+                    logger.debug('Existing value type: %s, length: %s', type(existing_value), len(existing_value) if isinstance(existing_value, list) else "N/A")
                 
                 if existing_value is not None:
                     # Special case: For list fields, if existing value is empty, sync from session
@@ -658,7 +740,7 @@ def update_participant_experiment_params(participant, session):
                                     if item not in exp_params[param_name]:
                                         exp_params[param_name].append(item)
                             participant['experiment_params'] = exp_params
-                            print(f'[Participant] Synced {len(exp_params[param_name])} essays from session (empty list case)')
+                            logger.debug('Synced %s essays from session (empty list case)', len(exp_params[param_name]))
                             should_update = False
                         else:
                             # Field already exists (has been modified at runtime), preserve it
@@ -681,7 +763,7 @@ def update_participant_experiment_params(participant, session):
                                             added_count += 1
                                 if added_count > 0:
                                     participant['experiment_params'] = exp_params
-                                    print(f'[Participant] Added {added_count} new essays from session (non-empty list case)')
+                                    logger.debug('Added %s new essays from session (non-empty list case)', added_count)
                             should_update = False
                         else:
                             # Field already exists (has been modified at runtime), preserve it
@@ -691,22 +773,22 @@ def update_participant_experiment_params(participant, session):
                     value = get_value_from_session_params(session, init_path)
                     # Debug logging for essays
                     if param_name == 'essays' and init_path == 'Session.essays':
-                        print(f'[Participant] Initializing essays from session: {len(value) if isinstance(value, list) else "not a list"} items')
-                        print(f'[Participant] Essays value: {value}')
+                        logger.debug('Initializing essays from session: %s items', len(value) if isinstance(value, list) else "not a list")
+                        logger.debug('Essays value: %s', value)
                     
                     # Special handling for word_list: convert comma-separated string to list
                     if param_name == 'word_list' and init_path == 'Session.Params.wordList':
-                        print(f'[Participant] Processing word_list initialization. Raw value from session: {value} (type: {type(value)})')
+                        logger.debug('Processing word_list initialization. Raw value from session: %s (type: %s)', value, type(value))
                         if isinstance(value, str):
                             # Split by comma and strip whitespace from each word
                             value = [word.strip() for word in value.split(',') if word.strip()]
-                            print(f'[Participant] Converted wordList string to list: {value}')
+                            logger.debug('Converted wordList string to list: %s', value)
                         elif isinstance(value, list):
                             # Already a list, use as is
-                            print(f'[Participant] wordList is already a list: {value}')
+                            logger.debug('wordList is already a list: %s', value)
                         else:
                             # If value is None or not a string/list, default to empty list
-                            print(f'[Participant] wordList value is None or invalid, defaulting to empty list')
+                            logger.debug('wordList value is None or invalid, defaulting to empty list')
                             value = []
 
             # (2) Functions-based init: e.g., "Functions.assign_tasks"
@@ -761,7 +843,7 @@ def update_participant_experiment_params(participant, session):
                     if not isinstance(value, list):
                         value = []
                     participant['experiment_params'][param_name] = value
-                    print(f'[Participant] Set word_list to: {value} (type: {type(value)}, length: {len(value)})')
+                    logger.debug('Set word_list to: %s (type: %s, length: %s)', value, type(value), len(value))
                 elif value is not None:
                     participant['experiment_params'][param_name] = value
 
@@ -805,21 +887,21 @@ def update_participant_experiment_params(participant, session):
                         # Resolve binding value from Participant.* path
                         if b.get('path'):
                             v = _get_participant_value_by_path(participant, b.get('path'))
-                            print(f'[Participant] Resolving binding value for path: {b.get("path")}, resolved value: {v} (type: {type(v)})')
+                            logger.debug('Resolving binding value for path: %s, resolved value: %s (type: %s)', b.get("path"), v, type(v))
                             if v is not None:
                                 b['value'] = v
-                                print(f'[Participant] Set binding value to: {v}')
+                                logger.debug('Set binding value to: %s', v)
                             # For word_list, also set value even if it's an empty list
                             elif b.get('path') == 'Participant.word_list':
-                                print(f'[Participant] word_list path resolved to None for participant {participant.get("id")}, role: {participant.get("role")}')
+                                logger.debug('word_list path resolved to None for participant %s, role: %s', participant.get("id"), participant.get("role"))
                                 # Check if word_list exists in experiment_params
                                 exp_params = participant.get('experiment_params', {})
                                 if 'word_list' in exp_params:
                                     word_list_value = exp_params['word_list']
-                                    print(f'[Participant] word_list found in experiment_params: {word_list_value}')
+                                    logger.debug('word_list found in experiment_params: %s', word_list_value)
                                     b['value'] = word_list_value
                                 else:
-                                    print(f'[Participant] word_list NOT found in experiment_params. Available keys: {list(exp_params.keys())}')
+                                    logger.debug('word_list NOT found in experiment_params. Available keys: %s', list(exp_params.keys()))
                                     # Set to empty list as fallback
                                     b['value'] = []
 
@@ -877,14 +959,14 @@ def update_participant_experiment_params(participant, session):
                             if isinstance(options_path, str) and options_path == 'Participant.word_list':
                                 # Get word_list from participant
                                 word_list = _get_participant_value_by_path(participant, 'Participant.word_list')
-                                print(f'[Participant] Resolving word_list options. Path: {options_path}, Resolved value: {word_list} (type: {type(word_list)})')
+                                logger.debug('Resolving word_list options. Path: %s, Resolved value: %s (type: %s)', options_path, word_list, type(word_list))
                                 
                                 if word_list is not None and isinstance(word_list, list):
                                     b['options'] = word_list
-                                    print(f'[Participant] Set word_list options to: {word_list}')
+                                    logger.debug('Set word_list options to: %s', word_list)
                                 else:
                                     b['options'] = []
-                                    print(f'[Participant] word_list is None or not a list, setting options to empty list')
+                                    logger.debug('word_list is None or not a list, setting options to empty list')
 
                         new_bindings.append(b)
                     panel['bindings'] = new_bindings
@@ -994,10 +1076,10 @@ def get_participants(session_identifier):
         
         participants_list = found_session.get('participants', [])
         
-        return jsonify({
+        return session_module.json_response({
             'participants': participants_list,
             'count': len(participants_list)
-        }), 200
+        })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1007,10 +1089,10 @@ def get_participants(session_identifier):
 # to ensure Flask matches the more specific route first
 @participant_bp.route('/api/sessions/<path:session_identifier>/participants/<participant_id>/start_production', methods=['POST'])
 def handle_start_production(session_identifier, participant_id):
-    print(f'[DEBUG] handle_start_production called: session={session_identifier}, participant={participant_id}')
+    logger.debug('handle_start_production called: session=%s, participant=%s', session_identifier, participant_id)
     try:
         data = request.get_json()
-        print(f'[DEBUG] Request data: {data}')
+        logger.debug('Request data: %s', data)
         if not data:
             return jsonify({'success': False, 'error': 'No data provided'}), 400
         
@@ -1182,14 +1264,14 @@ def handle_submit_shape(session_identifier, participant_id):
             update_type='partial'
         )
         
-        return jsonify({
+        return session_module.json_response({
             'success': True,
             'message': f'Successfully fulfilled {shape} order',
             'shape': shape,
             'incentive_money': incentive_money,
             'new_money': exp_params['money'],
             'new_order_progress': exp_params['order_progress']
-        }), 200
+        })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1232,6 +1314,10 @@ def update_participant(session_identifier, participant_id):
             if participant.get('id') == participant_id:
                 # Update participant fields (exclude screenshot/html_snapshot)
                 participants_list[i].update(update_data)
+                if 'experiment_params' in update_data:
+                    # Assigned material may have changed; drop the agent's cached copy
+                    from agent.agent_runner import invalidate_assigned_document
+                    invalidate_assigned_document(participant_id)
                 # Update participant's experiment_params based on init_path
                 update_participant_experiment_params(participants_list[i], found_session)
                 participant_found = True
@@ -1308,11 +1394,11 @@ def register_agent_guide(session_identifier, participant_id):
             update_type='partial'
         )
 
-        return jsonify({
+        return session_module.json_response({
             'success': True,
             'message': 'Participant registered as AI guide',
             'participant': participant
-        }), 200
+        })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -1356,17 +1442,13 @@ def transcribe_audio():
             tmp_path = tmp.name
         
         try:
-            from openai import OpenAI, AzureOpenAI
+            from services.openai_clients import get_azure_openai_client, get_openai_client
             
             if use_azure:
-                client = AzureOpenAI(
-                    api_key=azure_key,
-                    api_version=azure_version,
-                    azure_endpoint=azure_endpoint.rstrip('/')
-                )
+                client = get_azure_openai_client(azure_key, azure_version, azure_endpoint.rstrip('/'))
                 model = azure_deployment
             else:
-                client = OpenAI(api_key=openai_key)
+                client = get_openai_client(openai_key)
                 model = 'whisper-1'
             
             # ISO-639-1 (e.g. en). Whisper uses this to bias recognition; default English.
@@ -1497,12 +1579,12 @@ def handle_participant_login():
             'status': found_session.get('status')
         }
         
-        return jsonify({
+        return session_module.json_response({
             'success': True,
             'token': token,
             'participant': participant_response,
             'session': session_response
-        }), 200
+        })
         
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
@@ -1548,7 +1630,8 @@ def update_map_progress(session_identifier, participant_id):
             participant['experiment_params'] = {}
         participant['experiment_params']['map_progress'] = map_progress
 
-        session_module.commit_session(session_key, found_session)
+        # Posted continuously while the follower draws; the writer thread stores it
+        session_module.commit_session(session_key, found_session, wait=False)
 
         broadcast_session_id = found_session.get('session_id') or session_key
         broadcast_participant_update(
@@ -1558,7 +1641,7 @@ def update_map_progress(session_identifier, participant_id):
             update_type='partial'
         )
 
-        return jsonify({'success': True, 'map_progress': map_progress}), 200
+        return session_module.json_response({'success': True, 'map_progress': map_progress})
 
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1583,7 +1666,7 @@ def log_action_endpoint(session_identifier, participant_id):
         participant = _find_participant(found_session, participant_id)
         if not participant:
             return jsonify({'success': False, 'error': 'Participant not found'}), 404
-        if (participant.get('type') or '').lower() in ('ai', 'ai_agent'):
+        if (participant.get('type') or '').lower() in AI_PARTICIPANT_TYPES:
             return jsonify({'success': False, 'error': 'Only human participants can log client actions'}), 403
 
         actual_session_id = found_session.get('session_id') or session_key
@@ -1628,7 +1711,7 @@ def log_action_endpoint(session_identifier, participant_id):
                     trigger_annotation(session_key, found_session, checkpoint, sessions)
             except Exception as ann_err:
                 print(f'[Annotation] Error checking/triggering after log_action: {ann_err}')
-        return jsonify({'success': True, 'action_id': action_id}), 200
+        return session_module.json_response({'success': True, 'action_id': action_id})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -1658,7 +1741,7 @@ def submit_annotation(session_identifier, participant_id):
         participant = next((p for p in found_session.get('participants', []) if p.get('id') == participant_id), None)
         if not participant:
             return jsonify({'success': False, 'error': 'Participant not found'}), 404
-        if (participant.get('type') or '').lower() in ('ai', 'ai_agent'):
+        if (participant.get('type') or '').lower() in AI_PARTICIPANT_TYPES:
             return jsonify({'success': False, 'error': 'Only human participants can submit annotations'}), 403
 
         from services.annotation_service import submit_annotation as annotation_submit
@@ -1671,7 +1754,7 @@ def submit_annotation(session_identifier, participant_id):
             submitted_at=submitted_at,
             elapsed_seconds=elapsed_seconds,
         )
-        return jsonify({'success': True, 'resumed': resumed}), 200
+        return session_module.json_response({'success': True, 'resumed': resumed})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -1690,8 +1773,8 @@ def maptask_submit_confirm(session_identifier):
             get_human_participant_ids,
         )
         from routes.session import commit_session
-        from services.timer_service import pause_timer, get_timer
-        from websocket.handlers import get_socketio
+        from services.timer_service import get_timer
+        from websocket.handlers import emit_async
 
         session_key, found_session = find_session_by_identifier(session_identifier)
         if not found_session:
@@ -1708,7 +1791,7 @@ def maptask_submit_confirm(session_identifier):
         participant = _find_participant(found_session, participant_id)
         if not participant:
             return jsonify({'success': False, 'error': 'Participant not found'}), 404
-        if (participant.get('type') or '').lower() in ('ai', 'ai_agent'):
+        if (participant.get('type') or '').lower() in AI_PARTICIPANT_TYPES:
             return jsonify({'success': False, 'error': 'Only human participants may confirm'}), 403
 
         canonical_pid = participant.get('id') or participant.get('participant_id') or participant_id
@@ -1719,8 +1802,8 @@ def maptask_submit_confirm(session_identifier):
         found_session['maptask_submit_confirmed_ids'] = confirmed
         session_id = found_session.get('session_id') or session_key
 
-        socketio = get_socketio()
-        socketio.emit(
+        # Queued for the background sender, in order with the other room broadcasts
+        emit_async(
             'maptask_submit_status',
             {
                 'session_id': session_id,
@@ -1743,21 +1826,22 @@ def maptask_submit_confirm(session_identifier):
                 }
             ), 200
 
-        pause_timer(session_id)
+        # One registry lookup serves both the pause and the remaining time
         timer = get_timer(session_id)
         if timer:
+            timer.pause()
             found_session['remaining_seconds'] = timer.get_remaining_seconds()
         found_session['status'] = 'paused'
         commit_session(session_key, found_session)
 
-        socketio.emit('maptask_post_annotation_ready', {'session_id': session_id}, room=session_id)
+        emit_async('maptask_post_annotation_ready', {'session_id': session_id}, session_id)
         broadcast_participant_update(
             session_id=session_id,
             participants=found_session.get('participants', []),
             session_info=found_session,
             update_type='maptask_post_annotation_ready',
         )
-        return jsonify({'success': True, 'all_confirmed': True}), 200
+        return session_module.json_response({'success': True, 'all_confirmed': True})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -1793,74 +1877,102 @@ def serve_log_file(session_identifier, filename):
         return jsonify({'error': str(e)}), 500
 
 
+def _json_errors(fn):
+    """
+    Route wrapper for the post-annotation endpoints: an unhandled exception is logged with its
+    traceback and answered as {'error': str(e)}, 500, instead of each handler carrying its own
+    try/except around the whole body.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            logger.exception('%s failed', fn.__name__)
+            return jsonify({'error': str(e)}), 500
+
+    return wrapper
+
+
+# DB sources for post_annotation_data, (session_id, participant_id) -> (monotonic time, sources).
+# The annotator page reloads this view in bursts (route changes, remounts, retries) once the session
+# is over; saving answers drops the entry so a reload after saving reads them back at once.
+POST_ANNOTATION_SOURCES_TTL = 2.0
+_post_annotation_sources_cache = {}
+
+
+def _load_post_annotation_sources_cached(session_id, participant_id):
+    from services.db import load_post_annotation_sources
+
+    key = (session_id, participant_id)
+    now = time.monotonic()
+    cached = _post_annotation_sources_cache.get(key)
+    if cached is None or now - cached[0] >= POST_ANNOTATION_SOURCES_TTL:
+        cached = (now, load_post_annotation_sources(session_id, participant_id))
+        _post_annotation_sources_cache[key] = cached
+    logs, saved, in_session = cached[1]
+    # Shallow copies: the view appends to / merges into these lists
+    return list(logs), dict(saved), list(in_session)
+
+
 # Post-session annotation: get merged logs and annotation moments
 @participant_bp.route('/api/sessions/<path:session_identifier>/post_annotation_data', methods=['GET'])
+@_json_errors
 def get_post_annotation_data(session_identifier):
     """Return merged interaction logs and annotation moments for post-session annotation."""
-    try:
-        import json
-        from services.action_logger import LOGS_BASE_DIR
-        from urllib.parse import unquote
-        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        sample_data_dir = os.path.join(backend_dir, 'sample_annotation_data')
-
-        session_id = unquote(session_identifier)
-        participant_id = request.args.get('participant_id')
-        if not participant_id:
-            return jsonify({'error': 'participant_id is required'}), 400
-
-        # Resolve session - may use sample data
-        session_key, found_session = find_session_by_identifier(session_id)
-        use_sample = False
-        logs_dir = os.path.join(LOGS_BASE_DIR, session_id)
-        if not os.path.isdir(logs_dir):
-            sample_logs_dir = sample_data_dir
-            if os.path.isdir(sample_logs_dir):
-                use_sample = True
-                logs_dir = sample_logs_dir
-
-        # Collect participant IDs from jsonl files in logs dir
-        participant_ids = []
-        if os.path.isdir(logs_dir):
-            for f in os.listdir(logs_dir):
-                if f.endswith('.jsonl') and f != 'files':
-                    pid = f[:-6]  # strip .jsonl
+    import json
+    from services.action_logger import LOGS_BASE_DIR
+    from urllib.parse import unquote
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sample_data_dir = os.path.join(backend_dir, 'sample_annotation_data')
+
+    session_id = unquote(session_identifier)
+    participant_id = request.args.get('participant_id')
+    if not participant_id:
+        return jsonify({'error': 'participant_id is required'}), 400
+
+    # Resolve session - may use sample data
+    session_key, found_session = find_session_by_identifier(session_id)
+    use_sample = False
+    logs_dir = os.path.join(LOGS_BASE_DIR, session_id)
+    if not os.path.isdir(logs_dir):
+        sample_logs_dir = sample_data_dir
+        if os.path.isdir(sample_logs_dir):
+            use_sample = True
+            logs_dir = sample_logs_dir
+
+    # Collect participant IDs from jsonl files in logs dir. scandir's DirEntry carries the
+    # file type from the directory read, so no extra stat per log file is needed below.
+    participant_ids = []
+    log_paths = {}
+    if os.path.isdir(logs_dir):
+        with os.scandir(logs_dir) as it:
+            for e in it:
+                if e.name.endswith('.jsonl') and e.is_file():
+                    pid = e.name[:-6]  # strip .jsonl
                     participant_ids.append(pid)
-
-        # If no jsonl in logs, use sample participant IDs
-        if not participant_ids and use_sample:
-            participant_ids = ['a59bed79-e55a-417e-92cc-e0ff70fc8cf9', 'b6adf54e-f7e9-41f7-af48-a605c95f3d20']
-
-        # Load and merge all logs: jsonl on disk + PostgreSQL (union, dedupe by action_id).
-        # Previously we only read DB when no jsonl existed — that dropped rows that lived only in DB
-        # or from participants without a log file, so interaction logs looked incomplete vs session.messages.
-        all_entries = []
-        seen_action_ids = set()
-        for pid in participant_ids:
-            log_path = os.path.join(logs_dir, f'{pid}.jsonl')
-            if not os.path.isfile(log_path):
-                continue
-            try:
-                with open(log_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        entry = json.loads(line)
-                        aid = entry.get('action_id')
-                        if aid:
-                            if aid in seen_action_ids:
-                                continue
-                            seen_action_ids.add(aid)
-                        all_entries.append(entry)
-            except Exception as e:
-                print(f'[PostAnnotation] Error reading {log_path}: {e}')
-
+                    log_paths[pid] = e.path
+
+    # If no jsonl in logs, use sample participant IDs
+    if not participant_ids and use_sample:
+        participant_ids = ['a59bed79-e55a-417e-92cc-e0ff70fc8cf9', 'b6adf54e-f7e9-41f7-af48-a605c95f3d20']
+
+    # Load and merge all logs: jsonl on disk + PostgreSQL (union, dedupe by action_id).
+    # Previously we only read DB when no jsonl existed — that dropped rows that lived only in DB
+    # or from participants without a log file, so interaction logs looked incomplete vs session.messages.
+    all_entries = []
+    seen_action_ids = set()
+    for pid in participant_ids:
+        log_path = log_paths.get(pid)
+        if not log_path:
+            continue
         try:
-            from services.db import is_db_configured, load_session_logs
-
-            if is_db_configured():
-                for entry in load_session_logs(session_id):
+            with open(log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    entry = json.loads(line)
                     aid = entry.get('action_id')
                     if aid:
                         if aid in seen_action_ids:
@@ -1868,235 +1980,220 @@ def get_post_annotation_data(session_identifier):
                         seen_action_ids.add(aid)
                     all_entries.append(entry)
         except Exception as e:
-            print(f'[PostAnnotation] DB merge: {e}')
-
-        if not all_entries:
-            try:
-                from services.db import load_session_logs
-
-                all_entries = load_session_logs(session_id)
-            except Exception as e:
-                print(f'[PostAnnotation] DB load: {e}')
-
-        # Sort by parsed instant (string sort breaks across Z vs naive ISO)
-        all_entries.sort(key=lambda e: _parse_action_timestamp_sort_key(e.get('timestamp')))
-
-        # Filter out initial system auto-generated reset actions for map task follower
-        # These are the first reset actions that happen when the session just started
-        filtered_entries = all_entries
-        if found_session and found_session.get('experiment_type') == 'maptask':
-            # Find first non-reset action for each participant, keep resets before that
-            participant_first_action = {}
-            for e in all_entries:
-                pid = e.get('participant_id')
-                if pid and pid not in participant_first_action:
-                    if e.get('action_type') != 'map_tool_click' or e.get('action_content') != 'reset':
-                        participant_first_action[pid] = e
-            # Filter: keep resets only if they appear before participant's first real action
-            filtered_entries = []
-            for e in all_entries:
-                pid = e.get('participant_id')
-                is_reset = e.get('action_type') == 'map_tool_click' and e.get('action_content') == 'reset'
-                if is_reset and pid:
-                    first_action = participant_first_action.get(pid)
-                    if first_action:
-                        e_time = e.get('timestamp', '')
-                        f_time = first_action.get('timestamp', '')
-                        if _parse_action_timestamp_sort_key(e_time) < _parse_action_timestamp_sort_key(f_time):
-                            continue  # Skip this auto-generated reset
-                filtered_entries.append(e)
-
-        # Build participant name map (from session or defaults)
-        participant_names = {}
-        if found_session:
-            for p in found_session.get('participants', []):
-                pid = p.get('id') or p.get('participant_id')
-                name = p.get('name') or p.get('participant_name')
-                role = (p.get('experiment_params') or {}).get('role', '')
-                if pid:
-                    participant_names[pid] = name or role or pid[:8]
-        for pid in participant_ids:
-            if pid not in participant_names:
-                participant_names[pid] = pid[:8] + '...'
+            print(f'[PostAnnotation] Error reading {log_path}: {e}')
 
-        try:
-            from services.s3_storage import resolve_s3_fields_in_entry
-            filtered_entries = [resolve_s3_fields_in_entry(dict(e)) for e in filtered_entries]
-        except Exception as ex:
-            print(f'[PostAnnotation] S3 resolve: {ex}')
-
-        # Annotation moments: current participant's actions that have screenshots (from filtered, after S3 presign).
-        # Exclude brush/eraser tool picks — only brush_release / eraser_release (map_draw_stop) are annotatable map actions.
-        def _post_annotation_moment_ok(entry):
-            if entry.get('action_type') != 'map_tool_click':
-                return True
-            c = (entry.get('action_content') or '').strip()
-            return c not in ('brush', 'eraser')
-
-        annotation_moments = [
-            e
-            for e in filtered_entries
-            if e.get('participant_id') == participant_id
-            and e.get('screenshot')
-            and _post_annotation_moment_ok(e)
-        ]
-
-        # Base URL for log files (local files/ paths); s3:// assets are expanded to presigned HTTPS above
-        files_base = f'/api/sessions/{session_id}/log_files'
-
-        # Get session name - try from session, or from first log entry
-        session_name = ''
-        if found_session:
-            session_name = found_session.get('session_name', '')
-        # If no session_name found, try to get from first log entry
-        if not session_name and all_entries:
-            session_name = all_entries[0].get('session_name', '')
-
-        # Post-session saved answers: PostgreSQL first, then local JSON fallback
-        saved_annotations = {}
-        try:
-            from services.db import load_post_session_annotations
+    # Action logs, saved post-session answers and in-session annotations in one DB round trip
+    db_logs, db_saved, in_session_annotations = [], {}, []
+    try:
+        db_logs, db_saved, in_session_annotations = _load_post_annotation_sources_cached(session_id, participant_id)
+    except Exception as e:
+        print(f'[PostAnnotation] DB load: {e}')
 
-            db_saved = load_post_session_annotations(session_id, participant_id)
-            if db_saved:
-                saved_annotations = db_saved
-        except Exception as e:
-            print(f'[PostAnnotation] DB post_annotations: {e}')
-        if not saved_annotations:
-            ann_path = os.path.join(LOGS_BASE_DIR, session_id, f'post_annotations_{participant_id}.json')
-            if os.path.isfile(ann_path):
-                try:
-                    with open(ann_path, 'r', encoding='utf-8') as f:
-                        saved_annotations = json.load(f)
-                except Exception as e:
-                    print(f'[PostAnnotation] Error reading annotations file: {e}')
-
-        in_session_annotations = []
-        try:
-            from services.db import load_in_session_annotations
+    for entry in db_logs:
+        aid = entry.get('action_id')
+        if aid:
+            if aid in seen_action_ids:
+                continue
+            seen_action_ids.add(aid)
+        all_entries.append(entry)
+
+    # Sort by parsed instant (string sort breaks across Z vs naive ISO)
+    all_entries.sort(key=lambda e: _parse_action_timestamp_sort_key(e.get('timestamp')))
+
+    # Filter out initial system auto-generated reset actions for map task follower
+    # These are the first reset actions that happen when the session just started
+    filtered_entries = all_entries
+    if found_session and found_session.get('experiment_type') == 'maptask':
+        # Find first non-reset action for each participant, keep resets before that
+        participant_first_action = {}
+        for e in all_entries:
+            pid = e.get('participant_id')
+            if pid and pid not in participant_first_action:
+                if e.get('action_type') != 'map_tool_click' or e.get('action_content') != 'reset':
+                    participant_first_action[pid] = e
+        # Filter: keep resets only if they appear before participant's first real action
+        filtered_entries = []
+        for e in all_entries:
+            pid = e.get('participant_id')
+            is_reset = e.get('action_type') == 'map_tool_click' and e.get('action_content') == 'reset'
+            if is_reset and pid:
+                first_action = participant_first_action.get(pid)
+                if first_action:
+                    e_time = e.get('timestamp', '')
+                    f_time = first_action.get('timestamp', '')
+                    if _parse_action_timestamp_sort_key(e_time) < _parse_action_timestamp_sort_key(f_time):
+                        continue  # Skip this auto-generated reset
+            filtered_entries.append(e)
+
+    # Build participant name map (from session or defaults)
+    participant_names = {}
+    if found_session:
+        for p in found_session.get('participants', []):
+            pid = p.get('id') or p.get('participant_id')
+            name = p.get('name') or p.get('participant_name')
+            role = (p.get('experiment_params') or {}).get('role', '')
+            if pid:
+                participant_names[pid] = name or role or pid[:8]
+    for pid in participant_ids:
+        if pid not in participant_names:
+            participant_names[pid] = pid[:8] + '...'
 
-            in_session_annotations = load_in_session_annotations(session_id, participant_id)
-        except Exception as e:
-            print(f'[PostAnnotation] DB in_session: {e}')
-
-        # Fallback: in-memory session snapshot (no DB / dev) has annotation_data
-        if not in_session_annotations and found_session:
-            raw = (found_session.get('annotation_data') or {}).get(participant_id)
-            if isinstance(raw, list) and raw:
-                for item in sorted(raw, key=lambda x: x.get('checkpoint', 0)):
-                    in_session_annotations.append(
-                        {
-                            'checkpoint_index': item.get('checkpoint'),
-                            'transcription': (item.get('transcription') or ''),
-                            'created_at': item.get('created_at') or '',
-                            'elapsed_seconds': item.get('elapsed_seconds'),
-                        }
-                    )
-
-        # Session timing for post-annotation UI (progress % of action vs duration)
-        session_duration_seconds = None
-        session_started_at = None
-        if found_session:
-            session_started_at = found_session.get('started_at')
-            dm = get_value_from_session_params(found_session, 'Session.Params.duration')
-            if dm is None:
-                dm = found_session.get('duration_minutes')
-            if dm is not None:
-                try:
-                    session_duration_seconds = int(float(dm)) * 60
-                except (TypeError, ValueError):
-                    session_duration_seconds = None
-
-        saved_annotation_asset_urls = {}
-        try:
-            from services.s3_storage import presign_saved_annotation_asset_urls
+    try:
+        from services.s3_storage import resolve_s3_fields_in_entry
+        filtered_entries = [resolve_s3_fields_in_entry(dict(e)) for e in filtered_entries]
+    except Exception as ex:
+        print(f'[PostAnnotation] S3 resolve: {ex}')
+
+    # Annotation moments: current participant's actions that have screenshots (from filtered, after S3 presign).
+    # Exclude brush/eraser tool picks — only brush_release / eraser_release (map_draw_stop) are annotatable map actions.
+    def _post_annotation_moment_ok(entry):
+        if entry.get('action_type') != 'map_tool_click':
+            return True
+        c = (entry.get('action_content') or '').strip()
+        return c not in ('brush', 'eraser')
+
+    annotation_moments = [
+        e
+        for e in filtered_entries
+        if e.get('participant_id') == participant_id
+        and e.get('screenshot')
+        and _post_annotation_moment_ok(e)
+    ]
+
+    # Base URL for log files (local files/ paths); s3:// assets are expanded to presigned HTTPS above
+    files_base = f'/api/sessions/{session_id}/log_files'
+
+    # Get session name - try from session, or from first log entry
+    session_name = ''
+    if found_session:
+        session_name = found_session.get('session_name', '')
+    # If no session_name found, try to get from first log entry
+    if not session_name and all_entries:
+        session_name = all_entries[0].get('session_name', '')
+
+    # Post-session saved answers: PostgreSQL first, then local JSON fallback
+    saved_annotations = db_saved
+    if not saved_annotations:
+        ann_path = os.path.join(LOGS_BASE_DIR, session_id, f'post_annotations_{participant_id}.json')
+        if os.path.isfile(ann_path):
+            try:
+                with open(ann_path, 'r', encoding='utf-8') as f:
+                    saved_annotations = json.load(f)
+            except Exception as e:
+                print(f'[PostAnnotation] Error reading annotations file: {e}')
+
+    # Fallback: in-memory session snapshot (no DB / dev) has annotation_data
+    if not in_session_annotations and found_session:
+        raw = (found_session.get('annotation_data') or {}).get(participant_id)
+        if isinstance(raw, list) and raw:
+            for item in sorted(raw, key=lambda x: x.get('checkpoint', 0)):
+                in_session_annotations.append(
+                    {
+                        'checkpoint_index': item.get('checkpoint'),
+                        'transcription': (item.get('transcription') or ''),
+                        'created_at': item.get('created_at') or '',
+                        'elapsed_seconds': item.get('elapsed_seconds'),
+                    }
+                )
 
-            saved_annotation_asset_urls = presign_saved_annotation_asset_urls(saved_annotations)
-        except Exception as e:
-            print(f'[PostAnnotation] presign saved assets: {e}')
+    # Session timing for post-annotation UI (progress % of action vs duration)
+    session_duration_seconds = None
+    session_started_at = None
+    if found_session:
+        session_started_at = found_session.get('started_at')
+        dm = get_value_from_session_params(found_session, 'Session.Params.duration')
+        if dm is None:
+            dm = found_session.get('duration_minutes')
+        if dm is not None:
+            try:
+                session_duration_seconds = int(float(dm)) * 60
+            except (TypeError, ValueError):
+                session_duration_seconds = None
 
-        experiment_type = ''
-        if found_session:
-            experiment_type = (found_session.get('experiment_type') or '')[:128]
-        elif filtered_entries:
-            experiment_type = (filtered_entries[0].get('experiment_type') or '')[:128]
+    saved_annotation_asset_urls = {}
+    try:
+        from services.s3_storage import presign_saved_annotation_asset_urls
 
-        return jsonify({
-            'merged_logs': filtered_entries,
-            'annotation_moments': annotation_moments,
-            'saved_annotations': saved_annotations,
-            'saved_annotation_asset_urls': saved_annotation_asset_urls,
-            'in_session_annotations': in_session_annotations,
-            'participant_names': participant_names,
-            'files_base': files_base,
-            'session_id': session_id,
-            'session_name': session_name,
-            'experiment_type': experiment_type,
-            'session_duration_seconds': session_duration_seconds,
-            'session_started_at': session_started_at,
-        })
+        saved_annotation_asset_urls = presign_saved_annotation_asset_urls(saved_annotations)
     except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
+        print(f'[PostAnnotation] presign saved assets: {e}')
+
+    experiment_type = ''
+    if found_session:
+        experiment_type = (found_session.get('experiment_type') or '')[:128]
+    elif filtered_entries:
+        experiment_type = (filtered_entries[0].get('experiment_type') or '')[:128]
+
+    return session_module.json_response({
+        'merged_logs': filtered_entries,
+        'annotation_moments': annotation_moments,
+        'saved_annotations': saved_annotations,
+        'saved_annotation_asset_urls': saved_annotation_asset_urls,
+        'in_session_annotations': in_session_annotations,
+        'participant_names': participant_names,
+        'files_base': files_base,
+        'session_id': session_id,
+        'session_name': session_name,
+        'experiment_type': experiment_type,
+        'session_duration_seconds': session_duration_seconds,
+        'session_started_at': session_started_at,
+    })
 
 
 # Post-session annotation: save annotations to local file
 @participant_bp.route('/api/sessions/<path:session_identifier>/participants/<participant_id>/post_annotations', methods=['POST', 'PUT'])
+@_json_errors
 def save_post_annotations(session_identifier, participant_id):
     """Save post-session annotations to logs/{session_id}/post_annotations_{participant_id}.json"""
-    try:
-        import json
-        from services.action_logger import LOGS_BASE_DIR
-        from urllib.parse import unquote
-
-        session_id = unquote(session_identifier)
-        data = request.get_json()
-        if not data or 'annotations' not in data:
-            return jsonify({'error': 'annotations object required'}), 400
-
-        annotations = data.get('annotations', {})
-        if not isinstance(annotations, dict):
-            return jsonify({'error': 'annotations must be a JSON object'}), 400
-
-        # Screenshots are captured at session time on actions/logs, not during post_annotation.
-        stripped = {}
-        for aid, row in annotations.items():
-            if isinstance(row, dict):
-                stripped[aid] = {k: v for k, v in row.items() if k != 'screenshot_s3'}
-            else:
-                stripped[aid] = row
-        annotations = stripped
+    import json
+    from services.action_logger import LOGS_BASE_DIR
+    from urllib.parse import unquote
 
-        from services.db import _json_safe_payload, is_db_configured, upsert_post_session_annotations
+    session_id = unquote(session_identifier)
+    data = request.get_json()
+    if not data or 'annotations' not in data:
+        return jsonify({'error': 'annotations object required'}), 400
 
-        safe = _json_safe_payload(annotations)
+    annotations = data.get('annotations', {})
+    if not isinstance(annotations, dict):
+        return jsonify({'error': 'annotations must be a JSON object'}), 400
 
-        # When DATABASE_URL is set, persist to PostgreSQL; failures must not look like success.
-        if is_db_configured():
-            try:
-                upsert_post_session_annotations(session_id, participant_id, safe)
-            except Exception as db_err:
-                import traceback
+    # Screenshots are captured at session time on actions/logs, not during post_annotation.
+    stripped = {}
+    for aid, row in annotations.items():
+        if isinstance(row, dict):
+            stripped[aid] = {k: v for k, v in row.items() if k != 'screenshot_s3'}
+        else:
+            stripped[aid] = row
+    annotations = stripped
 
-                traceback.print_exc()
-                return jsonify({'error': f'Database save failed: {db_err}'}), 500
+    from services.db import is_db_configured, upsert_post_session_annotations
 
-        session_dir = os.path.join(LOGS_BASE_DIR, session_id)
-        os.makedirs(session_dir, exist_ok=True)
-        ann_path = os.path.join(session_dir, f'post_annotations_{participant_id}.json')
+    # Parsed from the request body, so already plain JSON types; upsert serializes it once.
+    safe = annotations
 
+    # When DATABASE_URL is set, persist to PostgreSQL; failures must not look like success.
+    if is_db_configured():
         try:
-            with open(ann_path, 'w', encoding='utf-8') as f:
-                json.dump(safe, f, ensure_ascii=False, indent=2)
-        except OSError as file_err:
-            return jsonify({'error': f'Failed to write annotation file: {file_err}'}), 500
+            upsert_post_session_annotations(session_id, participant_id, safe)
+            _post_annotation_sources_cache.pop((session_id, participant_id), None)
+        except Exception as db_err:
+            import traceback
 
-        return jsonify({'success': True})
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
+            traceback.print_exc()
+            return jsonify({'error': f'Database save failed: {db_err}'}), 500
+
+    session_dir = os.path.join(LOGS_BASE_DIR, session_id)
+    os.makedirs(session_dir, exist_ok=True)
+    ann_path = os.path.join(session_dir, f'post_annotations_{participant_id}.json')
+
+    try:
+        with open(ann_path, 'w', encoding='utf-8') as f:
+            json.dump(safe, f, ensure_ascii=False, indent=2)
+    except OSError as file_err:
+        return jsonify({'error': f'Failed to write annotation file: {file_err}'}), 500
+
+    return Response(_SUCCESS_BODY, status=200, mimetype='application/json')
 
 
 # Presigned S3 PUT for post-session annotation assets (browser uploads directly to S3; bytes do not pass through this app)
@@ -2104,56 +2201,54 @@ def save_post_annotations(session_identifier, participant_id):
     '/api/sessions/<path:session_identifier>/participants/<participant_id>/post_annotation_presign',
     methods=['POST'],
 )
+@_json_errors
 def post_annotation_presign(session_identifier, participant_id):
-    try:
-        import re
-        from urllib.parse import unquote
+    import re
+    from urllib.parse import unquote
 
-        from services import s3_storage
+    from services import s3_storage
 
-        session_id = unquote(session_identifier)
-        data = request.get_json() or {}
-        action_id = (data.get('action_id') or '').strip()
-        asset = (data.get('asset') or '').strip()
-        content_type = (data.get('content_type') or '').strip() or 'application/octet-stream'
+    session_id = unquote(session_identifier)
+    data = request.get_json() or {}
+    action_id = (data.get('action_id') or '').strip()
+    asset = (data.get('asset') or '').strip()
+    content_type = (data.get('content_type') or '').strip() or 'application/octet-stream'
 
-        uuid_pat = re.compile(
-            r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
-        )
-        if not uuid_pat.match(action_id):
-            return jsonify({'error': 'action_id must be a UUID'}), 400
-        if asset not in ('screenshot', 'html_snapshot'):
-            return jsonify({'error': 'asset must be screenshot or html_snapshot'}), 400
-
-        if asset == 'screenshot':
-            filename = 'screenshot.jpg'
-            if 'image/' not in content_type:
-                content_type = 'image/jpeg'
-        else:
-            filename = 'html_snapshot.html'
-            if 'html' not in content_type and 'text/' not in content_type:
-                content_type = 'text/html; charset=utf-8'
-
-        if not s3_storage.is_s3_configured():
-            return jsonify({'error': 'S3 is not configured on the server'}), 503
-
-        key = s3_storage.build_post_annotation_asset_key(session_id, participant_id, action_id, filename)
-        upload_url = s3_storage.presign_put_url(key, content_type)
-        if not upload_url:
-            return jsonify({'error': 'Could not create upload URL'}), 500
-        s3_uri = s3_storage.s3_uri_for_key(key)
-        view_url = s3_storage.presign_get_url(s3_uri)
-        return jsonify(
-            {
-                'upload_url': upload_url,
-                's3_uri': s3_uri,
-                'key': key,
-                'method': 'PUT',
-                'view_url': view_url,
-            }
-        ), 200
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    uuid_pat = re.compile(
+        r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
+    )
+    if not uuid_pat.match(action_id):
+        return jsonify({'error': 'action_id must be a UUID'}), 400
+    if asset not in ('screenshot', 'html_snapshot'):
+        return jsonify({'error': 'asset must be screenshot or html_snapshot'}), 400
+
+    if asset == 'screenshot':
+        filename = 'screenshot.jpg'
+        if 'image/' not in content_type:
+            content_type = 'image/jpeg'
+    else:
+        filename = 'html_snapshot.html'
+        if 'html' not in content_type and 'text/' not in content_type:
+            content_type = 'text/html; charset=utf-8'
+
+    if not s3_storage.is_s3_configured():
+        return jsonify({'error': 'S3 is not configured on the server'}), 503
+
+    key = s3_storage.build_post_annotation_asset_key(session_id, participant_id, action_id, filename)
+    upload_url = s3_storage.presign_put_url(key, content_type)
+    if not upload_url:
+        return jsonify({'error': 'Could not create upload URL'}), 500
+    s3_uri = s3_storage.s3_uri_for_key(key)
+    view_url = s3_storage.presign_get_url(s3_uri)
+    return jsonify(
+        {
+            'upload_url': upload_url,
+            's3_uri': s3_uri,
+            'key': key,
+            'method': 'PUT',
+            'view_url': view_url,
+        }
+    ), 200
 
 
 # Submit trade offer
@@ -2311,11 +2406,11 @@ def submit_trade(session_identifier, participant_id):
             data=data,
         )
         
-        return jsonify({
+        return session_module.json_response({
             'success': True,
             'offer_id': offer_id,
             'offer': offer
-        }), 200
+        })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -2404,10 +2499,11 @@ def submit_investment(session_identifier, participant_id):
         session_module.commit_session(session_key, found_session)
         
         # Log the update for debugging
-        print(f'[submit_investment] Updated participant {participant_id}:')
-        print(f'  - Money: ${current_money} -> ${exp_params["money"]}')
-        print(f'  - Investment history count: {len(exp_params["investment_history"])}')
-        print(f'  - Latest investment: {investment_record}')
+        logger.debug(
+            'submit_investment: participant %s money %s -> %s, %s investments, latest %s',
+            participant_id, current_money, exp_params['money'],
+            len(exp_params['investment_history']), investment_record,
+        )
         
         # Broadcast update to all participants
         broadcast_participant_update(
@@ -2426,13 +2522,13 @@ def submit_investment(session_identifier, participant_id):
             data=data,
         )
         
-        return jsonify({
+        return session_module.json_response({
             'success': True,
             'investment_id': investment_record['id'],
             'investment': investment_record,
             'remaining_money': exp_params['money'],
             'investment_history_count': len(exp_params['investment_history'])
-        }), 200
+        })
         
     except ValueError as e:
         return jsonify({'success': False, 'error': f'Invalid investment amount: {str(e)}'}), 400
@@ -2454,10 +2550,10 @@ def get_pending_offers(session_identifier):
         # Filter out cancelled/declined offers (only show pending)
         active_offers = [o for o in pending_offers if o.get('status') == 'pending']
         
-        return jsonify({
+        return session_module.json_response({
             'success': True,
             'offers': active_offers
-        }), 200
+        })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -2474,10 +2570,10 @@ def get_completed_trades(session_identifier):
         # Get completed trades
         completed_trades = found_session.get('completed_trades', [])
         
-        return jsonify({
+        return session_module.json_response({
             'success': True,
             'trades': completed_trades
-        }), 200
+        })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -2773,11 +2869,11 @@ def respond_to_offer(session_identifier, participant_id):
             except Exception as ann_err:
                 print(f'[Annotation] Error checking/triggering after trade: {ann_err}')
         
-        return jsonify({
+        return session_module.json_response({
             'success': True,
             'response': response,
             'offer': offer
-        }), 200
+        })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -2867,10 +2963,10 @@ def cancel_offer(session_identifier, participant_id):
             result='success', metadata={'offer_id': offer_id}, data=data,
         )
         
-        return jsonify({
+        return session_module.json_response({
             'success': True,
             'offer': offer
-        }), 200
+        })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -2969,10 +3065,10 @@ def submit_essay_rank(session_identifier, participant_id):
         session_module.commit_session(session_key, found_session)
         
         # Log the update for debugging
-        print(f'[submit_essay_rank] Updated participant {participant_id}:')
-        print(f'  - Essay: {essay.get("title", essay_id)}')
-        print(f'  - Rank: {essay_rank}')
-        print(f'  - Total rankings: {len(exp_params["rankings"])}')
+        logger.debug(
+            'submit_essay_rank: participant %s essay %s rank %s, %s rankings',
+            participant_id, essay.get('title', essay_id), essay_rank, len(exp_params['rankings']),
+        )
         
         # Broadcast update to all participants
         broadcast_participant_update(
@@ -2982,11 +3078,11 @@ def submit_essay_rank(session_identifier, participant_id):
             update_type='ranking_update'
         )
         
-        return jsonify({
+        return session_module.json_response({
             'success': True,
             'ranking': ranking_record,
             'total_rankings': len(exp_params['rankings'])
-        }), 200
+        })
         
     except Exception as e:
         import traceback
@@ -12,6 +12,7 @@ import requests
 from flask import Blueprint, jsonify, request
 
 from agent.agent_context_protocol import AgentContextProtocol
+from config.experiments import AI_PARTICIPANT_TYPES
 from routes.participant import find_session_by_identifier
 from services.realtime_session_config import (
     build_azure_client_secrets_session_json,
@@ -26,6 +27,10 @@ from services.realtime_session_config import (
 
 realtime_bp = Blueprint("realtime", __name__)
 
+# Keep-alive connections to the OpenAI / Azure endpoints across call setups (token mint and
+# SDP exchange hit the same host back to back, and every participant joining does both).
+_http = requests.Session()
+
 
 def _is_vad_leader_agent(sess: Dict[str, Any], agent_participant_id: str) -> bool:
     first = first_ai_participant_id(sess)
@@ -77,7 +82,7 @@ def _mint_azure_ephemeral_token(session_inner: Dict[str, Any]) -> str:
     url = _azure_realtime_client_secrets_url()
     body = {"session": session_inner}
     headers = {"api-key": key, "Content-Type": "application/json"}
-    r = requests.post(url, headers=headers, json=body, timeout=60)
+    r = _http.post(url, headers=headers, json=body, timeout=60)
     if r.status_code >= 400:
         raise ValueError(
             f"[client_secrets {r.status_code}] {r.text or r.reason}"
@@ -95,7 +100,7 @@ def _azure_realtime_sdp_exchange(ephemeral_token: str, sdp_body: str) -> tuple[s
         "Authorization": f"Bearer {ephemeral_token}",
         "Content-Type": "application/sdp",
     }
-    r = requests.post(url, headers=headers, data=sdp_body.encode("utf-8"), timeout=60)
+    r = _http.post(url, headers=headers, data=sdp_body.encode("utf-8"), timeout=60)
     if r.status_code >= 400:
         raise ValueError(f"[realtime/calls {r.status_code}] {r.text or r.reason}")
     return r.text, r.status_code
@@ -127,7 +132,7 @@ def realtime_calls():
             break
     if not agent_p:
         return jsonify({"error": "agent_participant_id not in session"}), 404
-    if (agent_p.get("type") or "").lower() not in ("ai", "ai_agent"):
+    if (agent_p.get("type") or "").lower() not in AI_PARTICIPANT_TYPES:
         return jsonify({"error": "agent_participant_id must be an AI participant"}), 400
 
     experiment_type = sess.get("experiment_type") or ""
@@ -174,7 +179,7 @@ def realtime_calls():
             if not key:
                 return jsonify({"error": "OPENAI_API_KEY not set"}), 503
             headers = {"Authorization": f"Bearer {key}", "OpenAI-Beta": "realtime=v1"}
-            r = requests.post(_realtime_calls_url_openai(), headers=headers, files=files, timeout=60)
+            r = _http.post(_realtime_calls_url_openai(), headers=headers, files=files, timeout=60)
 
         if r.status_code >= 400:
             return (
@@ -211,7 +216,7 @@ def realtime_session_update():
             break
     if not agent_p:
         return jsonify({"error": "agent_participant_id not in session"}), 404
-    if (agent_p.get("type") or "").lower() not in ("ai", "ai_agent"):
+    if (agent_p.get("type") or "").lower() not in AI_PARTICIPANT_TYPES:
         return jsonify({"error": "agent_participant_id must be an AI participant"}), 400
 
     experiment_type = sess.get("experiment_type") or ""
@@ -263,7 +268,7 @@ def execute_function():
             break
     if not agent_p:
         return jsonify({"error": "Agent not in session"}), 404
-    if (agent_p.get("type") or "").lower() not in ("ai", "ai_agent"):
+    if (agent_p.get("type") or "").lower() not in AI_PARTICIPANT_TYPES:
         return jsonify({"error": "Not an AI participant"}), 400
 
     experiment_type = sess.get("experiment_type") or ""
@@ -1,18 +1,29 @@
 # REST API for sessions setting
 
-from flask import request, jsonify, Blueprint
+from flask import request, jsonify, Blueprint, Response
 from datetime import datetime, timezone
+import atexit
+import hashlib
+import threading
+import time
 import uuid
 import os
 import json
+import logging
+from functools import lru_cache
 from werkzeug.utils import secure_filename
-from config.experiments import get_experiment_by_id, EXPERIMENTS, PARTICIPANTS
+from config.experiments import get_experiment_by_id, AI_PARTICIPANT_TYPES, EXPERIMENTS, PARTICIPANTS
 
 try:
     import yaml
 except Exception:
     yaml = None
 
+# libyaml's C loader when PyYAML was built with it (same safe subset, several times faster)
+_YAML_SAFE_LOADER = getattr(yaml, 'CSafeLoader', None) or getattr(yaml, 'SafeLoader', None)
+
+logger = logging.getLogger(__name__)
+
 # Create a blueprint for session routes
 session_bp = Blueprint('session', __name__)
 
@@ -21,17 +32,49 @@ def _utc_now_iso_z() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+def json_response(obj, status=200):
+    """
+    Like jsonify for large payloads (full sessions, merged action logs): encodes with orjson
+    when available, which is several times faster than the stdlib encoder on big dicts/lists.
+    """
+    from websocket.json_codec import dumpb
+    return Response(dumpb(obj), status=status, mimetype='application/json')
+
+
+def _conditional_json_response(body):
+    """
+    Wrap an encoded JSON body in a response carrying a weak ETag derived from the body.
+    Clients that poll with a matching If-None-Match get an empty 304 instead of the payload.
+    """
+    response = Response(body, status=200, mimetype='application/json')
+    response.set_etag(hashlib.blake2b(body, digest_size=12).hexdigest(), weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+
+# Experiment and participant configs are static for the life of the process; encode them once.
+_static_json_bodies = {}
+
+
+def _static_json_body(name, build):
+    body = _static_json_bodies.get(name)
+    if body is None:
+        body = jsonify(build()).get_data()
+        _static_json_bodies[name] = body
+    return body
+
+
 # Get all experiments (single source of truth for frontend)
 @session_bp.route('/api/experiments', methods=['GET'])
 def get_experiments():
     """Return experiment configs - frontend uses this for setup UI structure."""
-    return jsonify(EXPERIMENTS), 200
+    return _conditional_json_response(_static_json_body('experiments', lambda: EXPERIMENTS))
 
 
 @session_bp.route('/api/participants/templates', methods=['GET'])
 def get_participant_templates():
     """Return participant templates keyed by experiment id."""
-    return jsonify(_get_participant_templates_map()), 200
+    return _conditional_json_response(_static_json_body('participant_templates', _get_participant_templates_map))
 
 
 def _get_participant_templates_map():
@@ -64,6 +107,15 @@ def _extract_schema_keys(node, path=''):
     return keys
 
 
+@lru_cache(maxsize=32)
+def _canonical_schema_keys(exp_id):
+    """Key paths of the canonical experiment config and participant template (static, so cached)."""
+    return (
+        frozenset(_extract_schema_keys(get_experiment_by_id(exp_id))),
+        frozenset(_extract_schema_keys(_get_participant_templates_map().get(exp_id))),
+    )
+
+
 def _try_parse_uploaded_config(content_text, file_name):
     ext = os.path.splitext(file_name or '')[1].lower()
     parse_errors = []
@@ -77,7 +129,7 @@ def _try_parse_uploaded_config(content_text, file_name):
     # Fallback to YAML when available
     if ext in ['.yaml', '.yml'] and yaml is not None:
         try:
-            return yaml.safe_load(content_text), None
+            return yaml.load(content_text, Loader=_YAML_SAFE_LOADER), None
         except Exception as e:
             parse_errors.append(f'YAML parse failed: {e}')
 
@@ -210,7 +262,7 @@ def _build_validation_result(uploaded_config):
             })
 
     # Schema compatibility check (key-level): detect unknown keys and missing canonical keys
-    canonical_exp_keys = _extract_schema_keys(canonical_experiment)
+    canonical_exp_keys, canonical_participant_keys = _canonical_schema_keys(exp_id)
     uploaded_exp_keys = _extract_schema_keys(experiment)
     missing_exp_keys = sorted(k for k in canonical_exp_keys if k not in uploaded_exp_keys)
     unknown_exp_keys = sorted(k for k in uploaded_exp_keys if k not in canonical_exp_keys)
@@ -229,7 +281,6 @@ def _build_validation_result(uploaded_config):
         warnings.append(f'{len(unknown_exp_keys) - 30} additional unknown experiment keys omitted.')
 
     # Participant schema check (for the selected experiment)
-    canonical_participant_keys = _extract_schema_keys(canonical_participant_template)
     uploaded_participant_keys = _extract_schema_keys(participant_for_exp)
     missing_participant_keys = sorted(k for k in canonical_participant_keys if k not in uploaded_participant_keys)
     unknown_participant_keys = sorted(k for k in uploaded_participant_keys if k not in canonical_participant_keys)
@@ -266,6 +317,38 @@ def _build_validation_result(uploaded_config):
     }
 
 
+# Researchers re-validate the same file while iterating on a setup. Parsing and the schema
+# comparison depend only on the content, so results are kept per content hash as the encoded
+# response body. Equal digests mean equal content; the content argument is only read on a miss.
+_VALIDATION_CACHE_MAX = 64
+_validation_cache = {}  # (blake2b digest, is_yaml) -> (JSON bytes, status)
+
+
+def _validate_upload_content(digest, is_yaml, content):
+    key = (digest, is_yaml)
+    cached = _validation_cache.get(key)
+    if cached is not None:
+        return cached
+
+    parsed, parse_error = _try_parse_uploaded_config(content, 'upload.yaml' if is_yaml else '')
+    if parse_error:
+        result = {
+            'valid': False,
+            'errors': [{'path': 'file', 'message': parse_error}],
+            'warnings': []
+        }
+        status = 400
+    else:
+        result = _build_validation_result(parsed)
+        status = 200 if result.get('valid') else 422
+
+    entry = (jsonify(result).get_data(), status)
+    if len(_validation_cache) >= _VALIDATION_CACHE_MAX:
+        _validation_cache.pop(next(iter(_validation_cache)), None)
+    _validation_cache[key] = entry
+    return entry
+
+
 @session_bp.route('/api/experiments/validate-upload', methods=['POST'])
 def validate_uploaded_experiment_config():
     """
@@ -288,17 +371,11 @@ def validate_uploaded_experiment_config():
                 'warnings': []
             }), 400
 
-        parsed, parse_error = _try_parse_uploaded_config(content, file_name)
-        if parse_error:
-            return jsonify({
-                'valid': False,
-                'errors': [{'path': 'file', 'message': parse_error}],
-                'warnings': []
-            }), 400
-
-        result = _build_validation_result(parsed)
-        status = 200 if result.get('valid') else 422
-        return jsonify(result), status
+        # Only the extension's YAML-ness affects parsing, so key on that rather than the name
+        is_yaml = os.path.splitext(file_name or '')[1].lower() in ['.yaml', '.yml']
+        digest = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+        body, status = _validate_upload_content(digest, is_yaml, content)
+        return Response(body, status=status, mimetype='application/json')
     except Exception as e:
         return jsonify({
             'valid': False,
@@ -309,16 +386,213 @@ def validate_uploaded_experiment_config():
 # In-memory storage for sessions (also persisted to PostgreSQL when configured)
 sessions = {}
 
+# Session name (lowercased) -> sessions key. Every handler accepts either the key or the
+# session_name, and participant URLs and agent lookups usually carry the name, which otherwise
+# means scanning every session per request. Hits are re-checked against the live dict, so
+# renamed or deleted sessions fall through to the scan without explicit invalidation.
+_SESSION_NAME_INDEX_MAX = 4096
+_session_name_index = {}
+
+
+def find_session_key_by_name(session_name):
+    """Return the sessions key whose session_name matches case-insensitively, or None."""
+    name = (session_name or '').lower()
+    sid = _session_name_index.get(name)
+    if sid is not None:
+        session = sessions.get(sid)
+        if session is not None and session.get('session_name', '').lower() == name:
+            return sid
+
+    for sid, session in list(sessions.items()):
+        if session.get('session_name', '').lower() == name:
+            if len(_session_name_index) >= _SESSION_NAME_INDEX_MAX:
+                _session_name_index.clear()
+            _session_name_index[name] = sid
+            return sid
+    return None
+
+# Serialized GET /api/sessions/<id> bodies, session_id -> (monotonic time, JSON bytes). The
+# researcher dashboard polls that endpoint; commit_session drops the entry so status changes
+# show up at once, while timer ticks (deferred commits) are at most SESSION_RESPONSE_TTL stale.
+SESSION_RESPONSE_TTL = 0.5
+_session_response_cache = {}
+
+
+def _session_response_body(found_session, reuse=True):
+    """
+    Encoded session JSON with the 'id' field the frontend expects. Endpoints that change a
+    session (reuse=False) encode it once and leave the body in _session_response_cache, so the
+    dashboard's next GET poll serves those bytes instead of copying and encoding it again.
+    """
+    session_id = found_session['session_id']
+    now = time.monotonic()
+    if reuse:
+        cached = _session_response_cache.get(session_id)
+        if cached is not None and now - cached[0] < SESSION_RESPONSE_TTL:
+            return cached[1]
+    from websocket.json_codec import dumpb
+    body = dumpb({**found_session, 'id': session_id})
+    if sessions.get(session_id) is found_session:
+        _session_response_cache[session_id] = (now, body)
+    return body
+
+
+def _session_json_response(found_session):
+    return Response(_session_response_body(found_session, reuse=False), status=200, mimetype='application/json')
 
-def commit_session(session_key: str, session_dict: dict) -> None:
-    """Store session in memory and upsert to database (full JSON snapshot)."""
+
+def commit_session(session_key: str, session_dict: dict, wait: bool = True) -> None:
+    """
+    Store session in memory and upsert it to the database (full JSON snapshot). By default the
+    upsert is made before returning, so a status change is durable before it is acknowledged
+    and broadcast. High-frequency callers pass wait=False to hand it to the session writer
+    thread, which runs it right away without holding up the caller.
+    """
     sessions[session_key] = session_dict
+    _session_response_cache.pop(session_key, None)
+    with _deferred_lock:
+        if not wait:
+            _deferred_commits[session_key] = (session_dict, None)  # supersedes any pending write
+            _urgent_commits.add(session_key)
+            _start_flusher_locked()
+        else:
+            _deferred_commits.pop(session_key, None)  # this write supersedes any pending one
+            _urgent_commits.discard(session_key)
+    if not wait:
+        _flush_now.set()
+        return
+    # Serialized with the writer for this session: a snapshot it is already writing lands before
+    # this one, and a delete that removed the session meanwhile is not undone
+    with _session_write_lock(session_key):
+        if sessions.get(session_key) is session_dict:
+            _persist_session(session_dict)
+
+
+def _persist_session(session_dict: dict) -> None:
     try:
         from services.db import persist_research_session
 
         persist_research_session(session_dict)
-    except Exception as e:
-        print(f'[Session] DB persist: {e}')
+    except Exception:
+        logger.exception('DB persist failed for session %s', session_dict.get('session_id'))
+
+
+# High-frequency updates (the per-second timer tick, chat messages) go through
+# commit_session_deferred: the in-memory session is updated at once, but only the latest state
+# per session is written to the database, at most every DEFERRED_COMMIT_INTERVAL seconds.
+# commit_session(wait=False) uses the same writer thread but wakes it to write at once.
+DEFERRED_COMMIT_INTERVAL = 5.0
+# session_key -> (session dict, top-level fields to write or None for the full snapshot)
+_deferred_commits = {}
+_urgent_commits = set()  # keys queued by commit_session(wait=False), written as soon as the writer wakes
+_deferred_lock = threading.Lock()
+_deferred_flusher = None
+_flush_now = threading.Event()
+# session_key -> lock held around that session's database writes (commit_session, the writer,
+# delete_persisted_session), so a delete cannot interleave with an in-flight write of the same
+# session while writes for different sessions still run concurrently on the pool
+_session_write_locks = {}
+
+
+def _session_write_lock(session_key: str) -> threading.Lock:
+    with _deferred_lock:
+        lock = _session_write_locks.get(session_key)
+        if lock is None:
+            lock = _session_write_locks[session_key] = threading.Lock()
+        return lock
+
+
+def _start_flusher_locked() -> None:
+    """Start the writer thread on first use; call with _deferred_lock held."""
+    global _deferred_flusher
+    if _deferred_flusher is None:
+        _deferred_flusher = threading.Thread(target=_deferred_commit_loop, daemon=True)
+        _deferred_flusher.start()
+
+
+def commit_session_deferred(session_key: str, session_dict: dict, fields=None) -> None:
+    """
+    Like commit_session, but coalesces the database write with later updates. Pass fields
+    (top-level keys) when only those changed, so the flush patches them into the stored JSONB
+    instead of rewriting the whole session (which carries the chat log).
+    """
+    sessions[session_key] = session_dict
+    with _deferred_lock:
+        pending = _deferred_commits.get(session_key)
+        if fields is None or (pending is not None and (pending[0] is not session_dict or pending[1] is None)):
+            fields = None  # a full snapshot covers any fields queued alongside it
+        elif pending is not None:
+            fields = pending[1] | frozenset(fields)
+        else:
+            fields = frozenset(fields)
+        _deferred_commits[session_key] = (session_dict, fields)
+        _start_flusher_locked()
+
+
+def _persist_session_fields(session_dict: dict, fields) -> None:
+    try:
+        from services.db import patch_research_session
+
+        patch = {k: session_dict.get(k) for k in fields}
+        if patch_research_session(session_dict.get('session_id'), patch):
+            return
+    except Exception:
+        logger.exception('DB patch failed for session %s', session_dict.get('session_id'))
+    _persist_session(session_dict)  # row missing (or patch failed): write the full snapshot
+
+
+def flush_deferred_commits(urgent_only: bool = False) -> None:
+    """Persist every pending commit now (or only those queued by commit_session(wait=False))."""
+    with _deferred_lock:
+        if urgent_only:
+            pending = [(k, _deferred_commits.pop(k)) for k in _urgent_commits if k in _deferred_commits]
+        else:
+            pending = list(_deferred_commits.items())
+            _deferred_commits.clear()
+        _urgent_commits.clear()
+    for session_key, (session_dict, fields) in pending:
+        with _session_write_lock(session_key):
+            if sessions.get(session_key) is not session_dict:
+                continue  # deleted or replaced meanwhile
+            if fields:
+                _persist_session_fields(session_dict, fields)
+            else:
+                _persist_session(session_dict)
+
+
+def _deferred_commit_loop() -> None:
+    next_full_flush = time.monotonic() + DEFERRED_COMMIT_INTERVAL
+    while True:
+        _flush_now.wait(max(next_full_flush - time.monotonic(), 0))
+        _flush_now.clear()
+        if time.monotonic() >= next_full_flush:
+            flush_deferred_commits()
+            next_full_flush = time.monotonic() + DEFERRED_COMMIT_INTERVAL
+        else:
+            flush_deferred_commits(urgent_only=True)
+
+
+def delete_persisted_session(session_key: str, session_id: str) -> None:
+    """
+    Drop any queued write for a session and delete its database row. Remove the session from
+    `sessions` first: the writer skips sessions no longer in memory, and the delete waits for a
+    write already in progress, so a queued snapshot cannot recreate the row afterwards.
+    """
+    with _deferred_lock:
+        _deferred_commits.pop(session_key, None)
+        _urgent_commits.discard(session_key)
+    with _session_write_lock(session_key):
+        try:
+            from services.db import delete_research_session
+
+            delete_research_session(session_id)
+        except Exception:
+            logger.exception('DB delete failed for session %s', session_id)
+    with _deferred_lock:
+        _session_write_locks.pop(session_key, None)
+
+
+atexit.register(flush_deferred_commits)
 
 
 def set_session_started_at_when_timer_starts(session_timer_id: str, iso_z: str) -> None:
@@ -335,7 +609,7 @@ def set_session_started_at_when_timer_starts(session_timer_id: str, iso_z: str)
         if cur is None or (isinstance(cur, str) and not str(cur).strip()):
             sess['started_at'] = iso_z
             commit_session(session_key, sess)
-            print(f'[Session] started_at aligned to timer start for {session_timer_id}')
+            logger.info('started_at aligned to timer start for %s', session_timer_id)
         return
 
 
@@ -350,9 +624,9 @@ def hydrate_sessions_from_db() -> None:
         for sid, s in loaded.items():
             sessions[sid] = s
         if loaded:
-            print(f'[Session] Loaded {len(loaded)} session(s) from database')
-    except Exception as e:
-        print(f'[Session] hydrate from DB failed: {e}')
+            logger.info('Loaded %s session(s) from database', len(loaded))
+    except Exception:
+        logger.exception('Hydrating sessions from DB failed')
 
 # Create a new session
 @session_bp.route('/api/sessions', methods=['POST'])
@@ -369,12 +643,11 @@ def create_session():
             return jsonify({'error': 'sessionName cannot be empty'}), 400
         
         # Check if session name already exists (case-insensitive)
-        for session_id, session in sessions.items():
-            if session.get('session_name', '').lower() == session_name.lower():
-                return jsonify({
-                    'error': 'Session name already exists. Please use a different name or load the existing session.',
-                    'code': 'SESSION_EXISTS'
-                }), 409
+        if find_session_key_by_name(session_name) is not None:
+            return jsonify({
+                'error': 'Session name already exists. Please use a different name or load the existing session.',
+                'code': 'SESSION_EXISTS'
+            }), 409
         
         # Generate unique session ID
         session_id = str(uuid.uuid4())
@@ -420,23 +693,32 @@ def get_session(session_identifier):
             found_session = sessions[session_identifier]
         else:
             # Search for session by name (case-insensitive search)
-            for sid, session in sessions.items():
-                if session.get('session_name', '').lower() == session_identifier.lower():
-                    found_session = session
-                    break
+            sid = find_session_key_by_name(session_identifier)
+            if sid is not None:
+                found_session = sessions.get(sid)
         
         if not found_session:
             return jsonify({'error': 'Session not found'}), 404
-        
-        # Return session info with 'id' field for frontend compatibility
-        session_response = found_session.copy()
-        session_response['id'] = found_session['session_id']
-        
-        return jsonify(session_response), 200
+
+        return _conditional_json_response(_session_response_body(found_session))
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Fields PUT /api/sessions/<id> may update, and the subset that affects participant interfaces
+SESSION_UPDATE_FIELDS = frozenset({
+    'experiment_type',
+    'status',
+    'config',
+    'params',
+    'interaction',
+    'duration_minutes',
+    'remaining_seconds',
+    'session_name',
+    'experiment_config',
+})
+UI_RELATED_SESSION_FIELDS = frozenset({'experiment_type', 'config', 'params', 'interaction', 'experiment_config'})
+
 # Update session info (supports updating by session_id or session_name)
 @session_bp.route('/api/sessions/<path:session_identifier>', methods=['PUT'])
 def update_session(session_identifier):
@@ -458,41 +740,39 @@ def update_session(session_identifier):
             session_key = session_identifier
         else:
             # Try to find by session_name (case-insensitive)
-            for sid, session in sessions.items():
-                if session.get('session_name', '').lower() == session_identifier.lower():
-                    found_session = session
-                    session_key = sid
-                    break
+            sid = find_session_key_by_name(session_identifier)
+            if sid is not None:
+                found_session = sessions.get(sid)
+                session_key = sid
         
         if not found_session:
             return jsonify({'error': 'Session not found'}), 404
         
-        # Update allowed fields
-        allowed_fields = [
-            'experiment_type',
-            'status',
-            'config',
-            'params',
-            'interaction',
-            'duration_minutes',
-            'remaining_seconds',
-            'session_name',
-            'experiment_config'
-        ]
-        
         # Update fields from request data
         updated = False
+        changed = False
         experiment_type_updated = False
         ui_related_changed = False
         status_changed_to_running = False
         
         for key, value in data.items():
-            if key in allowed_fields:
+            if key in SESSION_UPDATE_FIELDS:
+                updated = True
+                # The setup UI re-sends params/interaction on every local edit; skip values that
+                # already match. experiment_type always applies (it resets params/interaction).
+                if key != 'experiment_type':
+                    current = found_session.get(key)
+                    if key == 'experiment_config' and isinstance(value, dict) and isinstance(current, dict):
+                        if all(k in current and current[k] == v for k, v in value.items()):
+                            continue
+                    elif key in found_session and current == value:
+                        continue
+                changed = True
                 # If experiment_type is being updated, mark it for special handling
                 if key == 'experiment_type':
                     experiment_type_updated = True
                 # 标记与 UI / interface 相关的字段是否被修改
-                if key in ('experiment_type', 'config', 'params', 'interaction', 'experiment_config'):
+                if key in UI_RELATED_SESSION_FIELDS:
                     ui_related_changed = True
                 # Check if status is being changed to 'running'
                 if key == 'status' and value == 'running' and found_session.get('status') != 'running':
@@ -504,7 +784,10 @@ def update_session(session_identifier):
                     found_session[key] = {**existing_config, **value}
                 else:
                     found_session[key] = value
-                updated = True
+        
+        if updated and not changed:
+            # Nothing differs from the stored session: no write, interface rebuild or broadcast
+            return _session_json_response(found_session)
         
         # If experiment_type was updated, automatically update all experiment config fields
         if experiment_type_updated and found_session.get('experiment_type'):
@@ -535,7 +818,7 @@ def update_session(session_identifier):
                 agents_registered = False
                 for participant in participants:
                     participant_type = participant.get('type', '').lower()
-                    if participant_type in ['ai', 'ai_agent']:
+                    if participant_type in AI_PARTICIPANT_TYPES:
                         participant_role = participant.get('role')  # For wordguessing
                         register_agent_runner(
                             participant_id=participant.get('id'),
@@ -546,8 +829,10 @@ def update_session(session_identifier):
                         # Mark agent as online
                         participant['status'] = 'online'
                         agents_registered = True
-                        participant_name = participant.get('name') or participant.get('participant_name')
-                        print(f'[Session] Registered agent runner for participant {participant.get("id")} ({participant_name}) after experiment_type update, marked as online')
+                        logger.debug(
+                            'Registered agent runner for participant %s (%s) after experiment_type update, marked as online',
+                            participant.get('id'), participant.get('name') or participant.get('participant_name'),
+                        )
                         updated_participants.append(participant)
                     else:
                         updated_participants.append(participant)
@@ -562,15 +847,15 @@ def update_session(session_identifier):
                         session_info=found_session,
                         update_type='partial'
                     )
-                    print(f'[Session] Broadcasted online status update for {len([p for p in updated_participants if p.get("type", "").lower() in ["ai", "ai_agent"]])} AI participants')
-            except Exception as e:
-                print(f'[Session] Error registering agent runners after experiment_type update: {e}')
-                import traceback
-                traceback.print_exc()
+                    logger.debug('Broadcasted online status update for session %s', session_id)
+            except Exception:
+                logger.exception('Error registering agent runners after experiment_type update')
         
         # 如果这次请求修改了会影响前端 UI 的字段，则重算所有 participant 的 interface
         updated_participants = None
         if ui_related_changed:
+            from routes.participant import invalidate_session_params
+            invalidate_session_params(found_session.get('session_id'))
             try:
                 # 懒加载，避免循环依赖
                 from routes.participant import update_participant_experiment_params
@@ -579,9 +864,9 @@ def update_session(session_identifier):
                 for p in participants:
                     updated_participants.append(update_participant_experiment_params(p, found_session))
                 found_session['participants'] = updated_participants
-            except Exception as e:
+            except Exception:
                 # 不要因为这里失败而让整个 session 更新失败，先打印错误
-                print(f'Error updating participants after session config change: {e}')
+                logger.exception('Error updating participants after session config change')
         
         if not updated:
             return jsonify({'error': 'No valid fields to update'}), 400
@@ -589,28 +874,25 @@ def update_session(session_identifier):
         # If status changed to 'running', start all agent runners
         if status_changed_to_running:
             try:
-                from agent.agent_runner import start_agent_runner, get_agent_runner
+                from agent.agent_runner import start_agent_runners, get_agent_runner
                 participants = found_session.get('participants', [])
                 session_id = found_session.get('session_id') or session_key
                 experiment_type = found_session.get('experiment_type')
                 
                 # Check if there are any human participants
                 has_human_participant = any(
-                    p.get('type', '').lower() not in ['ai', 'ai_agent'] 
+                    p.get('type', '').lower() not in AI_PARTICIPANT_TYPES 
                     for p in participants
                 )
                 
                 # Collect all agent participant IDs first
-                agent_participant_ids = []
-                for participant in participants:
-                    participant_type = participant.get('type', '').lower()
-                    if participant_type in ['ai', 'ai_agent']:
-                        start_agent_runner(
-                            participant_id=participant.get('id'),
-                            session_id=session_id
-                        )
-                        print(f'[Session] Started agent runner for participant {participant.get("id")} in session {session_id}')
-                        agent_participant_ids.append(participant.get('id'))
+                agent_participant_ids = [
+                    participant.get('id')
+                    for participant in participants
+                    if participant.get('type', '').lower() in AI_PARTICIPANT_TYPES
+                ]
+                start_agent_runners(agent_participant_ids, session_id)
+                logger.debug('Started %s agent runner(s) in session %s', len(agent_participant_ids), session_id)
                 
                 # For hiddenprofile experiment, trigger initial vote for all agents
                 # If no human participants, trigger immediately
@@ -662,7 +944,7 @@ def update_session(session_identifier):
                         human_with_vote_popup_shown = False
                         for participant in participants:
                             participant_type = participant.get('type', '').lower()
-                            if participant_type not in ['ai', 'ai_agent']:
+                            if participant_type not in AI_PARTICIPANT_TYPES:
                                 # Check if this human participant has initial vote popup shown
                                 # If initial_vote is 'none' or not set, popup might be shown
                                 initial_vote = participant.get('experiment_params', {}).get('initial_vote')
@@ -674,15 +956,16 @@ def update_session(session_identifier):
                         # If we detect that initial vote popup should be shown, trigger agents
                         # This handles the case where session starts and popup is already shown
                         if human_with_vote_popup_shown:
-                            print(f'[Session] HiddenProfile: Human participant detected with initial vote popup, triggering {len(agent_participant_ids)} AI agents')
+                            logger.debug(
+                                'HiddenProfile: human participant detected with initial vote popup, triggering %s AI agents',
+                                len(agent_participant_ids),
+                            )
                             # Use WebSocket handler logic to trigger agents (simulate vote_popup_shown event)
                             # We'll trigger via the same mechanism as WebSocket handler
                             for agent_id in agent_participant_ids:
                                 threading.Thread(target=trigger_initial_vote_for_agent, args=(agent_id,), daemon=True).start()
-            except Exception as e:
-                print(f'[Session] Error starting agent runners: {e}')
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                logger.exception('Error starting agent runners')
         
         # Update the session in storage
         commit_session(session_key, found_session)
@@ -703,17 +986,12 @@ def update_session(session_identifier):
                     session_info=found_session,
                     update_type='config_changed'
                 )
-                print(f'[Session] Broadcasted session update (interaction/config changed)')
-            except Exception as e:
-                print(f'Error broadcasting participant update after session config change: {e}')
-                import traceback
-                traceback.print_exc()
+                logger.debug('Broadcasted session update (interaction/config changed)')
+            except Exception:
+                logger.exception('Error broadcasting participant update after session config change')
         
         # Return updated session info with 'id' field for frontend compatibility
-        session_response = found_session.copy()
-        session_response['id'] = found_session['session_id']
-        
-        return jsonify(session_response), 200
+        return _session_json_response(found_session)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -735,33 +1013,47 @@ def delete_session(session_id):
             session_key = session_identifier
         else:
             # Try to find by session_name (case-insensitive)
-            for sid, session in sessions.items():
-                if session.get('session_name', '').lower() == session_identifier.lower():
-                    found_session = session
-                    session_key = sid
-                    break
+            sid = find_session_key_by_name(session_identifier)
+            if sid is not None:
+                found_session = sessions.get(sid)
+                session_key = sid
         
         if not found_session:
             return jsonify({'error': 'Session not found'}), 404
 
-        try:
-            from services.db import delete_research_session
-
-            delete_research_session(found_session.get('session_id') or session_key)
-        except Exception as e:
-            print(f'[Session] DB delete: {e}')
-
         # Delete session
         del sessions[session_key]
+        _session_response_cache.pop(session_key, None)
+        delete_persisted_session(session_key, found_session.get('session_id') or session_key)
+        from routes.participant import invalidate_session_params
+        invalidate_session_params(found_session.get('session_id'))
+
+        # Stop the session's agents (after removal, so they do not re-commit online status)
+        try:
+            from agent.agent_runner import stop_session_agent_runners
+
+            stop_session_agent_runners(found_session.get('session_id') or session_key)
+        except Exception:
+            logger.exception('Error stopping agent runners on delete')
 
         return jsonify({'message': 'Session deleted successfully'}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _broadcast_agents_stopped(session_id, participant_ids):
+    """Tell the session room that the agent runners detached by a reset have finished stopping."""
+    from websocket.handlers import emit_async
+    emit_async('agent_runners_stopped', {'session_id': session_id, 'participant_ids': participant_ids}, session_id)
+
+
 # Helper function to update session status and broadcast
-def update_session_status(session_identifier, new_status, started_at=None, remaining_seconds=None):
-    """Update session status and broadcast to all participants via WebSocket"""
+def update_session_status(session_identifier, new_status, started_at=None, remaining_seconds=None, persist=True):
+    """
+    Update session status and broadcast to all participants via WebSocket. Callers that
+    commit_session the same session again right afterwards pass persist=False, so the status
+    change is applied in memory and its database write is folded into that later commit.
+    """
     try:
         from urllib.parse import unquote
         session_identifier = unquote(session_identifier)
@@ -775,11 +1067,10 @@ def update_session_status(session_identifier, new_status, started_at=None, remai
             session_key = session_identifier
         else:
             # Try to find by session_name (case-insensitive)
-            for sid, session in sessions.items():
-                if session.get('session_name', '').lower() == session_identifier.lower():
-                    found_session = session
-                    session_key = sid
-                    break
+            sid = find_session_key_by_name(session_identifier)
+            if sid is not None:
+                found_session = sessions.get(sid)
+                session_key = sid
         
         if not found_session:
             return None, None, jsonify({'error': 'Session not found'}), 404
@@ -796,48 +1087,79 @@ def update_session_status(session_identifier, new_status, started_at=None, remai
         if remaining_seconds is not None:
             found_session['remaining_seconds'] = remaining_seconds
         
-        # Save session
-        commit_session(session_key, found_session)
+        participants_list = found_session.get('participants', [])
+        session_id_for_agents = found_session.get('session_id') or session_key
+        agent_ids = [
+            p.get('id') for p in participants_list
+            if p.get('type', '').lower() in AI_PARTICIPANT_TYPES
+        ]
+        start_agents = new_status == 'running' and old_status != 'running'
+        stop_agents = new_status == 'waiting' and old_status in ['running', 'paused']
+        
+        # For pause/resume, agent runners automatically check session status
+        # so no explicit pause/resume needed, but we should still update online status
+        # (set before the save below, so both changes go out in one commit)
+        agent_status = None
+        status_ids = agent_ids
+        if start_agents:
+            pass  # start_agent_runners marks the agents online itself
+        elif stop_agents:
+            # Resetting to waiting: the runners are unregistered here, but joining their
+            # perception threads (up to 2 s each) happens in a background task, so the request
+            # does not wait on it. The detached agents go offline with the save below.
+            agent_status = 'offline'
+            try:
+                from agent.agent_runner import detach_agent_runners
+                status_ids = detach_agent_runners(
+                    agent_ids,
+                    session_id_for_agents,
+                    on_stopped=lambda ids: _broadcast_agents_stopped(session_id_for_agents, ids),
+                )
+                logger.debug('Stopping %s agent runner(s) in the background', len(status_ids))
+            except Exception:
+                logger.exception('Error stopping agent runners')
+                status_ids = []
+        elif new_status == 'paused' and old_status == 'running':
+            # Mark as offline when paused (agent runner will pause automatically)
+            agent_status = 'offline'
+        elif new_status == 'running' and old_status == 'paused':
+            # Mark as online when resuming (agent runner will resume automatically)
+            agent_status = 'online'
+        if agent_status and status_ids:
+            wanted = set(status_ids)
+            for participant in participants_list:
+                if participant.get('id') in wanted:
+                    participant['status'] = agent_status
+        
+        # Save session. When agents are started below, their one status commit
+        # (start_agent_runners) carries this change too, so the write is only queued here and
+        # superseded by it; it is made directly if no agent changed.
+        if persist and not (start_agents and agent_ids):
+            commit_session(session_key, found_session)
+        else:
+            commit_session_deferred(session_key, found_session)
         
-        # Start/stop agent runners based on status FIRST (before broadcasting)
+        # Start agent runners based on status FIRST (before broadcasting)
         # This ensures online status is updated before we broadcast
         # Note: Agent runners check session status in their perception loop,
         # so they automatically pause when status is not 'running'
         try:
-            from agent.agent_runner import start_agent_runner, stop_agent_runner
-            participants_list = found_session.get('participants', [])
-            session_id_for_agents = found_session.get('session_id') or session_key
-            
-            for participant in participants_list:
-                participant_type = participant.get('type', '').lower()
-                if participant_type in ['ai', 'ai_agent']:
-                    participant_id = participant.get('id')
-                    if new_status == 'running' and old_status != 'running':
-                        # Start agent runner (this will update online status and broadcast)
-                        start_agent_runner(participant_id=participant_id, session_id=session_id_for_agents)
-                        print(f'[Session] Started agent runner for participant {participant_id}')
-                    elif new_status == 'waiting' and old_status in ['running', 'paused']:
-                        # Stop agent runner when resetting to waiting (this will update online status and broadcast)
-                        stop_agent_runner(participant_id=participant_id, session_id=session_id_for_agents)
-                        print(f'[Session] Stopped agent runner for participant {participant_id}')
-                    # For pause/resume, agent runners automatically check session status
-                    # so no explicit pause/resume needed, but we should still update online status
-                    elif new_status == 'paused' and old_status == 'running':
-                        # Mark as offline when paused (agent runner will pause automatically)
-                        participant['status'] = 'offline'
-                        commit_session(session_key, found_session)
-                    elif new_status == 'running' and old_status == 'paused':
-                        # Mark as online when resuming (agent runner will resume automatically)
-                        participant['status'] = 'online'
-                        commit_session(session_key, found_session)
+            if start_agents:
+                from agent.agent_runner import start_agent_runners
+
+                # Start agent runners (marked online and broadcast with one commit)
+                changed = start_agent_runners(agent_ids, session_id_for_agents)
+                logger.debug('Started %s agent runner(s)', len(changed))
+                if persist and agent_ids and not changed:
+                    commit_session(session_key, found_session)  # no agent status commit happened
             
             # Re-fetch participants list after agent runner updates
             found_session = sessions[session_key]
             participants_list = found_session.get('participants', [])
-        except Exception as e:
-            print(f'[Session] Error managing agent runners: {e}')
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception('Error managing agent runners')
+            if persist and start_agents and agent_ids:
+                commit_session(session_key, found_session)  # the status was only queued above
         
         # Broadcast status update via WebSocket (after online status is updated)
         try:
@@ -850,9 +1172,9 @@ def update_session_status(session_identifier, new_status, started_at=None, remai
                 session_info=found_session,
                 update_type='status_changed'
             )
-            print(f'[Session] Broadcasted status change: {old_status} -> {new_status} for session {session_id_for_broadcast}')
-        except Exception as e:
-            print(f'[Session] Error broadcasting status update: {e}')
+            logger.debug('Broadcasted status change: %s -> %s for session %s', old_status, new_status, session_id_for_broadcast)
+        except Exception:
+            logger.exception('Error broadcasting status update')
         
         return found_session, session_key, None, None
         
@@ -879,11 +1201,10 @@ def start_session(session_identifier):
             found_before = sessions[session_id]
             session_key_before = session_id
         else:
-            for sid, session in sessions.items():
-                if session.get('session_name', '').lower() == session_id.lower():
-                    found_before = session
-                    session_key_before = sid
-                    break
+            sid = find_session_key_by_name(session_id)
+            if sid is not None:
+                found_before = sessions.get(sid)
+                session_key_before = sid
         
         # started_at must match when the countdown actually runs (see TimerService.start +
         # set_session_started_at_when_timer_starts). Do not set it here on first run — avoids
@@ -892,11 +1213,13 @@ def start_session(session_identifier):
         if found_before and found_before.get('started_at'):
             started_at_value = found_before.get('started_at')
 
-        # Update status
+        # Update status (persisted by the commit_session below, together with the timer fields;
+        # the key resolved above is passed so the session is not looked up by name again)
         found_session, session_key, error_response, error_code = update_session_status(
-            session_identifier,
+            session_key_before or session_identifier,
             'running',
             started_at=started_at_value,
+            persist=False,
         )
         
         if error_response:
@@ -954,13 +1277,11 @@ def start_session(session_identifier):
                         timer.start()
                 
                 if found_session.get('maptask_untimed_timer'):
-                    print(f'[Session] Started timer for session {session_id_for_timer}, map task untimed (internal cap {duration_seconds}s)')
+                    logger.debug('Started timer for session %s, map task untimed (internal cap %ss)', session_id_for_timer, duration_seconds)
                 else:
-                    print(f'[Session] Started timer for session {session_id_for_timer}, duration: {duration_minutes} minutes')
-            except Exception as e:
-                print(f'[Session] Error starting timer: {e}')
-                import traceback
-                traceback.print_exc()
+                    logger.debug('Started timer for session %s, duration: %s minutes', session_id_for_timer, duration_minutes)
+            except Exception:
+                logger.exception('Error starting timer')
         else:
             # Create timer but don't start it yet
             try:
@@ -972,18 +1293,13 @@ def start_session(session_identifier):
                     timer = create_timer(session_id_for_timer, duration_seconds)
                     # Don't start timer - it will be started later after popups complete
                     if found_session.get('maptask_untimed_timer'):
-                        print(f'[Session] Created timer for session {session_id_for_timer} (delayed start), map task untimed')
+                        logger.debug('Created timer for session %s (delayed start), map task untimed', session_id_for_timer)
                     else:
-                        print(f'[Session] Created timer for session {session_id_for_timer} (delayed start), duration: {duration_minutes} minutes')
-            except Exception as e:
-                print(f'[Session] Error creating timer: {e}')
-                import traceback
-                traceback.print_exc()
-        
-        session_response = found_session.copy()
-        session_response['id'] = found_session['session_id']
+                        logger.debug('Created timer for session %s (delayed start), duration: %s minutes', session_id_for_timer, duration_minutes)
+            except Exception:
+                logger.exception('Error creating timer')
         
-        return jsonify(session_response), 200
+        return _session_json_response(found_session)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1005,14 +1321,11 @@ def pause_session(session_identifier):
             from services.timer_service import pause_timer
             session_id_for_timer = found_session.get('session_id') or session_key
             pause_timer(session_id_for_timer)
-            print(f'[Session] Paused timer for session {session_id_for_timer}')
-        except Exception as e:
-            print(f'[Session] Error pausing timer: {e}')
-        
-        session_response = found_session.copy()
-        session_response['id'] = found_session['session_id']
+            logger.debug('Paused timer for session %s', session_id_for_timer)
+        except Exception:
+            logger.exception('Error pausing timer')
         
-        return jsonify(session_response), 200
+        return _session_json_response(found_session)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1040,7 +1353,7 @@ def resume_session(session_identifier):
             timer = get_timer(session_id_for_timer)
             if timer:
                 timer.resume()
-                print(f'[Session] Resumed timer for session {session_id_for_timer}')
+                logger.debug('Resumed timer for session %s', session_id_for_timer)
             else:
                 # If timer doesn't exist, start it
                 from services.timer_service import create_timer
@@ -1057,14 +1370,11 @@ def resume_session(session_identifier):
                 timer = create_timer(session_id_for_timer, duration_seconds)
                 timer.start()
                 commit_session(session_key, found_session)
-                print(f'[Session] Created and started timer for session {session_id_for_timer}')
-        except Exception as e:
-            print(f'[Session] Error resuming timer: {e}')
-        
-        session_response = found_session.copy()
-        session_response['id'] = found_session['session_id']
+                logger.debug('Created and started timer for session %s', session_id_for_timer)
+        except Exception:
+            logger.exception('Error resuming timer')
         
-        return jsonify(session_response), 200
+        return _session_json_response(found_session)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1085,32 +1395,34 @@ def reset_session(session_identifier):
             session_key = session_identifier
         else:
             # Try to find by session_name (case-insensitive)
-            for sid, session in sessions.items():
-                if session.get('session_name', '').lower() == session_identifier.lower():
-                    found_session = session
-                    session_key = sid
-                    break
+            sid = find_session_key_by_name(session_identifier)
+            if sid is not None:
+                found_session = sessions.get(sid)
+                session_key = sid
         
         if not found_session:
             return jsonify({'error': 'Session not found'}), 404
         
-        # Reset status to waiting
+        # Reset status to waiting (persisted by the commit_session below, with the rest of the reset)
         found_session, session_key, error_response, error_code = update_session_status(
-            session_identifier, 
-            'waiting'
+            session_key, 
+            'waiting',
+            persist=False,
         )
         
         if error_response:
             return error_response, error_code
         
+        # Room / timer id, resolved once for the timer reset and the broadcast below
+        session_id = found_session.get('session_id') or session_key
+        
         # Reset timer and started_at
         found_session['started_at'] = None
         
         # Reset timer service
         try:
-            from services.timer_service import reset_timer, stop_timer
+            from services.timer_service import reset_timer
             from routes.participant import get_value_from_session_params
-            session_id_for_timer = found_session.get('session_id') or session_key
             
             # Get duration from Session.Params.duration
             duration_minutes = get_value_from_session_params(found_session, 'Session.Params.duration')
@@ -1133,10 +1445,10 @@ def reset_session(session_identifier):
             found_session['duration_minutes'] = duration_minutes
             
             # Reset timer
-            reset_timer(session_id_for_timer, duration_seconds)
-            print(f'[Session] Reset timer for session {session_id_for_timer}')
-        except Exception as e:
-            print(f'[Session] Error resetting timer: {e}')
+            reset_timer(session_id, duration_seconds)
+            logger.debug('Reset timer for session %s', session_id)
+        except Exception:
+            logger.exception('Error resetting timer')
             # Fallback: set remaining_seconds to None
             found_session['remaining_seconds'] = None
         
@@ -1152,28 +1464,24 @@ def reset_session(session_identifier):
                 # Re-initialize from session params
                 update_participant_experiment_params(participant, found_session)
             found_session['participants'] = participants
-        except Exception as e:
-            print(f'[Session] Error resetting participants: {e}')
+        except Exception:
+            logger.exception('Error resetting participants')
         
         commit_session(session_key, found_session)
         
         # Broadcast update
         try:
             from websocket.handlers import broadcast_participant_update
-            session_id_for_broadcast = found_session.get('session_id') or session_key
             broadcast_participant_update(
-                session_id=session_id_for_broadcast,
+                session_id=session_id,
                 participants=found_session.get('participants', []),
                 session_info=found_session,
                 update_type='status_changed'
             )
-        except Exception as e:
-            print(f'[Session] Error broadcasting reset update: {e}')
-        
-        session_response = found_session.copy()
-        session_response['id'] = found_session['session_id']
+        except Exception:
+            logger.exception('Error broadcasting reset update')
         
-        return jsonify(session_response), 200
+        return _session_json_response(found_session)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1193,11 +1501,10 @@ def upload_essays(session_identifier):
             found_session = sessions[session_identifier]
             session_key = session_identifier
         else:
-            for sid, session in sessions.items():
-                if session.get('session_name', '').lower() == session_identifier.lower():
-                    found_session = session
-                    session_key = sid
-                    break
+            sid = find_session_key_by_name(session_identifier)
+            if sid is not None:
+                found_session = sessions.get(sid)
+                session_key = sid
         
         if not found_session:
             return jsonify({'error': 'Session not found'}), 404
@@ -1331,11 +1638,10 @@ def upload_maps(session_identifier):
             found_session = sessions[session_identifier]
             session_key = session_identifier
         else:
-            for sid, session in sessions.items():
-                if session.get('session_name', '').lower() == session_identifier.lower():
-                    found_session = session
-                    session_key = sid
-                    break
+            sid = find_session_key_by_name(session_identifier)
+            if sid is not None:
+                found_session = sessions.get(sid)
+                session_key = sid
 
         if not found_session:
             return jsonify({'error': 'Session not found'}), 404
@@ -1398,6 +1704,8 @@ def upload_maps(session_identifier):
             params['maps'] = session_maps
         else:
             found_session['params'] = {'maps': session_maps}
+        from routes.participant import invalidate_session_params
+        invalidate_session_params(found_session.get('session_id'))
         commit_session(session_key, found_session)
 
         return jsonify({
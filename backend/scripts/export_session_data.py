@@ -257,13 +257,7 @@ def main() -> int:
     )
     args = parser.parse_args()
 
-    from services.db import (
-        is_db_configured,
-        list_distinct_participant_ids,
-        load_all_in_session_rows_for_session,
-        load_all_post_session_rows_for_session,
-        load_session_logs,
-    )
+    from services.db import is_db_configured, load_session_export_sources
 
     if not is_db_configured():
         print('export_session_data: DATABASE_URL or PG* not set; cannot read PostgreSQL.', file=sys.stderr)
@@ -294,7 +288,7 @@ def main() -> int:
         label = name
         name_for_json = name
 
-    all_entries = load_session_logs(session_id)
+    all_entries, in_session_all, post_all = load_session_export_sources(session_id)
     if not name_for_json and all_entries:
         name_for_json = (all_entries[0].get('session_name') or '')[:512]
     human_actions = [e for e in all_entries if e.get('is_human') is True]
@@ -318,10 +312,8 @@ def main() -> int:
             indent=2,
         )
 
-    in_session_all = load_all_in_session_rows_for_session(session_id)
-    post_all = load_all_post_session_rows_for_session(session_id)
-
-    pid_set = set(list_distinct_participant_ids(session_id))
+    # Every logged action carries its participant_id (persist_action_log requires it)
+    pid_set = {e['participant_id'] for e in all_entries if e.get('participant_id')}
     for r in in_session_all:
         pid = r.get('participant_id')
         if pid:
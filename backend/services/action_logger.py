@@ -4,19 +4,26 @@ Action Logger: Logs human and agent actions to participant-specific files.
 - Log entries: logs/{session_id}/{participant_id}.jsonl
 - Binary files (screenshot, map_image, audio): logs/{session_id}/files/
   Datapoints reference files via mapping, e.g. "files/{action_id}_screenshot.png"
+- PostgreSQL action_logs rows (when configured) are written in batches by a background thread
 """
 
+import atexit
+import logging
 import os
 import json
 import uuid
 import base64
+import queue
 import re
 import shutil
+import threading
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, Tuple
 
 from services.annotation_service import is_annotation_enabled
 
+logger = logging.getLogger(__name__)
+
 
 def utc_now_iso_z() -> str:
     """UTC instant as ISO-8601 with Z (matches browser Date parsing; avoids naive local vs UTC skew)."""
@@ -115,18 +122,42 @@ UPLOADS_AUDIO_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'up
 HTML_SNAPSHOT_INLINE_MAX = 32768
 
 
+# Directories already created by this process. log_action runs on every action, and
+# makedirs walks and stats each path component even when the directory exists.
+_created_dirs: set = set()
+
+
+def _ensure_dir(path: str) -> str:
+    if path not in _created_dirs:
+        os.makedirs(path, exist_ok=True)
+        _created_dirs.add(path)
+    return path
+
+
 def _ensure_session_log_dir(session_id: str) -> str:
     """Ensure log directory exists for session, return path."""
-    session_dir = os.path.join(LOGS_BASE_DIR, session_id)
-    os.makedirs(session_dir, exist_ok=True)
-    return session_dir
+    return _ensure_dir(os.path.join(LOGS_BASE_DIR, session_id))
 
 
 def _ensure_session_files_dir(session_id: str) -> str:
     """Ensure files subdirectory exists for session, return path."""
-    files_dir = os.path.join(LOGS_BASE_DIR, session_id, 'files')
-    os.makedirs(files_dir, exist_ok=True)
-    return files_dir
+    return _ensure_dir(os.path.join(LOGS_BASE_DIR, session_id, 'files'))
+
+
+# data:<mime>;base64,<payload> header. Only the header is matched; the (multi-MB) payload after
+# it is sliced off rather than scanned by the regex.
+_DATA_URL_HEADER_RE = re.compile(r'data:([^;,]+);base64,')
+_IMAGE_EXT_BY_MIME = {'image/png': 'png', 'image/jpeg': 'jpg', 'image/jpg': 'jpg', 'image/gif': 'gif', 'image/webp': 'webp'}
+_IMAGE_CONTENT_TYPE_BY_EXT = {'png': 'image/png', 'jpg': 'image/jpeg', 'jpeg': 'image/jpeg', 'gif': 'image/gif', 'webp': 'image/webp'}
+
+
+def _split_data_url(data: str) -> Optional[Tuple[str, str]]:
+    """'data:image/png;base64,...' -> (mime, base64 payload), or None."""
+    data = data.strip()
+    match = _DATA_URL_HEADER_RE.match(data)
+    if not match or match.end() == len(data):
+        return None
+    return match.group(1), data[match.end():]
 
 
 def _save_base64_to_file(session_id: str, action_id: str, field: str, data: str) -> Optional[str]:
@@ -137,12 +168,11 @@ def _save_base64_to_file(session_id: str, action_id: str, field: str, data: str)
     """
     if not data or not isinstance(data, str):
         return None
-    match = re.match(r'^data:([^;]+);base64,(.+)$', data.strip())
-    if not match:
+    parsed = _split_data_url(data)
+    if not parsed:
         return None
-    mime, b64 = match.group(1), match.group(2)
-    ext_map = {'image/png': '.png', 'image/jpeg': '.jpg', 'image/jpg': '.jpg', 'image/gif': '.gif', 'image/webp': '.webp'}
-    ext = ext_map.get(mime.lower(), '.png')
+    mime, b64 = parsed
+    ext = '.' + _IMAGE_EXT_BY_MIME.get(mime.lower(), 'png')
     try:
         file_bytes = base64.b64decode(b64)
     except Exception:
@@ -166,14 +196,12 @@ def _upload_annotation_screenshot_s3(session_id: str, action_id: str, data: str)
             return None
         if not data or not isinstance(data, str):
             return None
-        match = re.match(r'^data:([^;]+);base64,(.+)$', data.strip())
-        if not match:
+        parsed = _split_data_url(data)
+        if not parsed:
             return None
-        mime, b64 = match.group(1), match.group(2)
-        ext_map = {'image/png': 'png', 'image/jpeg': 'jpg', 'image/jpg': 'jpg', 'image/gif': 'gif', 'image/webp': 'webp'}
-        ext = ext_map.get(mime.lower(), 'png')
-        ct_map = {'png': 'image/png', 'jpg': 'image/jpeg', 'jpeg': 'image/jpeg', 'gif': 'image/gif', 'webp': 'image/webp'}
-        content_type = ct_map.get(ext, 'image/png')
+        mime, b64 = parsed
+        ext = _IMAGE_EXT_BY_MIME.get(mime.lower(), 'png')
+        content_type = _IMAGE_CONTENT_TYPE_BY_EXT.get(ext, 'image/png')
         try:
             raw = base64.b64decode(b64)
         except Exception:
@@ -400,24 +428,99 @@ def log_action(
                 entry['map_image'] = map_image
 
         log_path = os.path.join(session_dir, f'{participant_id}.jsonl')
-        with open(log_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        try:
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        except FileNotFoundError:
+            # Log folder was removed while the server was running; recreate it once.
+            _created_dirs.discard(session_dir)
+            _ensure_session_log_dir(session_id)
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write(line)
 
         try:
-            from services.db import is_db_configured, persist_action_log
+            from services.db import action_log_row, is_db_configured
             if is_db_configured():
-                persist_action_log(entry)
-        except Exception as db_err:
-            print(f'[ActionLogger] DB persist skipped: {db_err}')
+                # Serialized now, like the jsonl line: agent entries reference live participant
+                # state (session_status.private_state) that keeps changing after this call
+                row = action_log_row(entry)
+                if row is not None:
+                    _queue_db_persist(row)
+        except Exception:
+            logger.exception('DB persist skipped for action %s', action_id)
 
         return action_id
-    except Exception as e:
-        print(f'[ActionLogger] Error logging action: {e}')
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception('Error logging action')
         return None
 
 
+# Action rows for PostgreSQL go through one writer thread: log_action returns once the jsonl line
+# is on disk, and rows that queue up meanwhile (several agents acting at once, bursts of human
+# events) are written as one multi-row INSERT instead of one round trip each.
+# The queue holds insert parameters (services.db.action_log_row), already serialized.
+DB_PERSIST_BATCH_MAX = 500
+_db_persist_queue = queue.SimpleQueue()
+_db_writer = None
+_db_writer_lock = threading.Lock()
+
+
+def _queue_db_persist(row: Dict[str, Any]) -> None:
+    global _db_writer
+    _db_persist_queue.put(row)
+    if _db_writer is None:
+        with _db_writer_lock:
+            if _db_writer is None:
+                _db_writer = threading.Thread(target=_db_writer_loop, daemon=True)
+                _db_writer.start()
+
+
+def _drain_db_persist_queue(batch: list) -> list:
+    while len(batch) < DB_PERSIST_BATCH_MAX:
+        try:
+            batch.append(_db_persist_queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+def _persist_batch(batch: list) -> None:
+    from services.db import persist_action_log_rows
+
+    try:
+        persist_action_log_rows(batch)
+        return
+    except Exception:
+        if len(batch) == 1:
+            logger.exception('DB persist skipped for action %s', batch[0].get('p_action_id'))
+            return
+        logger.warning('DB insert of %s action(s) failed; retrying them one at a time', len(batch), exc_info=True)
+    # One bad row (e.g. a NUL character jsonb rejects) fails the whole statement; keep the rest
+    for row in batch:
+        try:
+            persist_action_log_rows([row])
+        except Exception:
+            logger.exception('DB persist skipped for action %s', row.get('p_action_id'))
+
+
+def _db_writer_loop() -> None:
+    while True:
+        _persist_batch(_drain_db_persist_queue([_db_persist_queue.get()]))
+
+
+def flush_db_persist_queue() -> None:
+    """Write every queued action row now (used at interpreter exit)."""
+    while True:
+        batch = _drain_db_persist_queue([])
+        if not batch:
+            return
+        _persist_batch(batch)
+
+
+atexit.register(flush_db_persist_queue)
+
+
 def attach_human_action_capture(
     session_id: str,
     participant_id: str,
@@ -77,9 +77,9 @@ def _openai_native_tts(tts_input: str) -> Tuple[Optional[bytes], Optional[str]]:
     model = (os.getenv('AGENT_TTS_MODEL') or 'tts-1').strip() or 'tts-1'
 
     try:
-        from openai import OpenAI
+        from services.openai_clients import get_openai_client
 
-        client = OpenAI(api_key=key)
+        client = get_openai_client(key)
         response = client.audio.speech.create(
             model=model,
             voice=voice,
@@ -105,13 +105,9 @@ def _azure_openai_tts(tts_input: str) -> Tuple[Optional[bytes], Optional[str]]:
     voice = (os.getenv('AGENT_TTS_VOICE') or 'alloy').strip() or 'alloy'
 
     try:
-        from openai import AzureOpenAI
+        from services.openai_clients import get_azure_openai_client
 
-        client = AzureOpenAI(
-            api_key=api_key,
-            api_version=api_version,
-            azure_endpoint=endpoint.rstrip('/'),
-        )
+        client = get_azure_openai_client(api_key, api_version, endpoint.rstrip('/'))
         # On Azure, `model` is the deployment name for the TTS model in your resource.
         response = client.audio.speech.create(
             model=deployment,
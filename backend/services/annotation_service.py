@@ -16,6 +16,7 @@ from typing import Any, Optional, Tuple
 
 from routes.session import commit_session
 
+from config.experiments import AI_PARTICIPANT_TYPES
 from functions import route_pixel_ratio_from_map_filename
 
 # Checkpoint ranges: (min_pct, max_pct) for each of 3 checkpoints
@@ -162,25 +163,16 @@ def get_session_progress_pct(session: dict) -> Optional[float]:
         return None
     remaining = session.get('remaining_seconds')
     duration_min = session.get('duration_minutes')
-    if duration_min is None:
-        # Fallback: try timer service
+    if duration_min is None or remaining is None:
+        # Fallback: try timer service (one lookup serves both fields)
         try:
             from services.timer_service import get_timer
             session_id = session.get('session_id')
-            if session_id:
-                timer = get_timer(session_id)
-                if timer:
+            timer = get_timer(session_id) if session_id else None
+            if timer:
+                if duration_min is None:
                     duration_min = timer.initial_duration / 60
-        except Exception:
-            pass
-    if remaining is None:
-        # Fallback: try timer
-        try:
-            from services.timer_service import get_timer
-            session_id = session.get('session_id')
-            if session_id:
-                timer = get_timer(session_id)
-                if timer:
+                if remaining is None:
                     remaining = timer.get_remaining_seconds()
         except Exception:
             pass
@@ -214,7 +206,7 @@ def get_human_participant_ids(session: dict) -> list:
     human_ids = []
     for p in participants:
         ptype = (p.get('type') or '').lower()
-        if ptype not in ('ai', 'ai_agent'):
+        if ptype not in AI_PARTICIPANT_TYPES:
             pid = p.get('id') or p.get('participant_id')
             if pid:
                 human_ids.append(pid)
@@ -317,7 +309,7 @@ def trigger_annotation(
     Caller must pass the sessions dict to update.
     """
     from services.timer_service import pause_timer
-    from websocket.handlers import get_socketio
+    from websocket.handlers import emit_async
 
     session_id = session.get('session_id') or session_key
     human_ids = get_human_participant_ids(session)
@@ -336,13 +328,12 @@ def trigger_annotation(
     session['annotation_triggered_checkpoints'] = triggered
     commit_session(session_key, session)
 
-    # Broadcast annotation popup to all participants
-    socketio = get_socketio()
-    socketio.emit('annotation_popup', {
+    # Broadcast annotation popup to all participants (queued, ahead of the participant update)
+    emit_async('annotation_popup', {
         'session_id': session_id,
         'checkpoint_index': checkpoint_index,
         'human_participant_ids': human_ids,
-    }, room=session_id)
+    }, session_id)
 
     # Broadcast status change
     from websocket.handlers import broadcast_participant_update
@@ -416,7 +407,7 @@ def submit_annotation(
     Returns True if session was resumed.
     """
     from services.timer_service import resume_timer
-    from websocket.handlers import get_socketio, broadcast_participant_update
+    from websocket.handlers import emit_async, broadcast_participant_update
 
     if not session.get('annotation_active'):
         return False
@@ -443,7 +434,11 @@ def submit_annotation(
         ann_entry['elapsed_seconds'] = elapsed_val
     annotations[participant_id].append(ann_entry)
     session['annotation_data'] = annotations
-    commit_session(session_key, session)
+    # The last submission resumes the session below, and that commit carries this state too
+    human_ids = set(get_human_participant_ids(session))
+    all_submitted = submitted >= human_ids
+    if not all_submitted:
+        commit_session(session_key, session)
 
     try:
         actual_session_id = session.get('session_id') or session_key
@@ -460,8 +455,7 @@ def submit_annotation(
     except Exception as db_err:
         print(f'[Annotation] in_session DB persist: {db_err}')
 
-    human_ids = set(get_human_participant_ids(session))
-    if submitted >= human_ids:
+    if all_submitted:
         # All submitted - resume session
         session_id = session.get('session_id') or session_key
         session['annotation_active'] = False
@@ -472,10 +466,9 @@ def submit_annotation(
 
         resume_timer(session_id)
 
-        socketio = get_socketio()
-        socketio.emit('annotation_resume', {
+        emit_async('annotation_resume', {
             'session_id': session_id,
-        }, room=session_id)
+        }, session_id)
 
         broadcast_participant_update(
             session_id=session_id,
@@ -10,17 +10,25 @@ Set PGSCHEMA or DATABASE_SCHEMA to choose the namespace (alphanumeric + undersco
 
 from __future__ import annotations
 
-import copy
-import json
+import logging
 import os
 import re
+import threading
+import time
+from contextlib import ExitStack, contextmanager
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import quote_plus
 
-from sqlalchemy import DateTime, Index, Integer, MetaData, String, Text, UniqueConstraint, cast, create_engine, func, select, text
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+from sqlalchemy import DateTime, Index, Integer, MetaData, String, Text, UniqueConstraint, bindparam, cast, create_engine, delete, event, exc, func, insert, literal, literal_column, select, text, update
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from websocket import json_codec
+
+logger = logging.getLogger(__name__)
 
 _SCHEMA_NAME_RE = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]{0,62}$')
 _DEFAULT_SCHEMA = 'humanagent_collab'
@@ -60,6 +68,18 @@ class ActionLogRow(Base):
     __table_args__ = (Index('ix_action_logs_session_created', 'session_id', 'created_at'),)
 
 
+# Session-name lookups that fall back to the logs (export by name when research_sessions has no
+# row) filter on payload->>'session_name'; without an expression index that is a full scan of
+# the largest table. session_id is the second key, matching the lookup's SELECT DISTINCT
+# session_id .. ORDER BY session_id, so it is answered from the index in order (an index-only
+# scan, without visiting the heap rows and their JSONB payloads, and no sort).
+Index(
+    'ix_action_logs_payload_session_name_session',
+    ActionLogRow.payload['session_name'].astext,
+    ActionLogRow.session_id,
+)
+
+
 class InSessionAnnotationRow(Base):
     """In-session checkpoint pop-up transcriptions (separate from action_logs)."""
 
@@ -76,7 +96,11 @@ class InSessionAnnotationRow(Base):
     # Session-timer elapsed at submit: initial_duration_seconds - remaining_seconds (same clock as UI).
     elapsed_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
-    __table_args__ = (Index('ix_in_session_ann_session_created', 'session_id', 'created_at'),)
+    __table_args__ = (
+        Index('ix_in_session_ann_session_created', 'session_id', 'created_at'),
+        # Per-participant reads (post-annotation view) filter on both ids and order by time
+        Index('ix_in_session_ann_session_participant_created', 'session_id', 'participant_id', 'created_at'),
+    )
 
 
 class PostSessionAnnotationRow(Base):
@@ -105,14 +129,109 @@ class ResearchSessionRow(Base):
     __tablename__ = 'research_sessions'
 
     session_id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    session_name: Mapped[str] = mapped_column(String(512), nullable=False, index=True)
+    session_name: Mapped[str] = mapped_column(String(512), nullable=False)
     payload: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
     )
 
+    __table_args__ = (
+        # Name lookups (find_session_ids_by_name) only read session_id back: with it in the
+        # index they are index-only scans and never fetch the row holding the session JSON
+        Index('ix_research_sessions_session_name_session', 'session_name', postgresql_include=['session_id']),
+    )
+
+
+# Statements on the per-action / per-commit paths, built once with bind parameters. A reused
+# statement object keeps its memoized cache key, so SQLAlchemy goes straight to the compiled
+# SQL instead of rebuilding and re-keying the construct on every call.
+_DELETE_RESEARCH_SESSION = delete(ResearchSessionRow).where(
+    ResearchSessionRow.session_id == bindparam('session_id')
+)
+
+# Server-side prepared statements, PREPAREd once on every new pooled connection (see
+# get_engine) so PostgreSQL parses and plans them once per connection rather than per call.
+# The action log insert runs once per action, and the research_sessions upsert/patch on every
+# session commit and timer flush; post_annotation_sources is the read behind the annotator's
+# post_annotation_data view, which is reloaded in bursts. JSONB parameters are sent as JSON text and parsed by the
+# server against the declared jsonb type. The schema name is regex-validated.
+_PREPARED_STATEMENTS = {
+    'insert_action_log': (
+        'PREPARE insert_action_log(varchar, varchar, varchar, timestamptz, jsonb) AS '
+        f'INSERT INTO "{get_app_schema()}".action_logs (action_id, session_id, participant_id, created_at, payload) '
+        'VALUES ($1, $2, $3, $4, $5) ON CONFLICT (action_id) DO NOTHING'
+    ),
+    'upsert_research_session': (
+        'PREPARE upsert_research_session(varchar, varchar, jsonb) AS '
+        f'INSERT INTO "{get_app_schema()}".research_sessions (session_id, session_name, payload) '
+        'VALUES ($1, $2, $3) ON CONFLICT (session_id) DO UPDATE '
+        'SET session_name = EXCLUDED.session_name, payload = EXCLUDED.payload, updated_at = now()'
+    ),
+    'patch_research_session': (
+        'PREPARE patch_research_session(varchar, jsonb) AS '
+        f'UPDATE "{get_app_schema()}".research_sessions '
+        'SET payload = payload || $2, updated_at = now() WHERE session_id = $1'
+    ),
+    # Same statement as _POST_ANNOTATION_SOURCES
+    'post_annotation_sources': (
+        'PREPARE post_annotation_sources(varchar, varchar) AS SELECT '
+        "(SELECT coalesce(jsonb_agg(payload ORDER BY created_at ASC), '[]'::jsonb) "
+        f'FROM "{get_app_schema()}".action_logs WHERE session_id = $1), '
+        f'(SELECT payload FROM "{get_app_schema()}".post_session_annotations '
+        'WHERE session_id = $1 AND participant_id = $2 LIMIT 1), '
+        "(SELECT coalesce(jsonb_agg(jsonb_build_object('checkpoint_index', checkpoint_index, "
+        "'transcription', transcription, 'created_at', created_at, 'elapsed_seconds', elapsed_seconds) "
+        "ORDER BY created_at ASC), '[]'::jsonb) "
+        f'FROM "{get_app_schema()}".in_session_annotations WHERE session_id = $1 AND participant_id = $2)'
+    ),
+}
+_EXECUTE_INSERT_ACTION_LOG = text(
+    'EXECUTE insert_action_log(:p_action_id, :p_session_id, :p_participant_id, :p_created_at, :p_payload)'
+)
+_EXECUTE_UPSERT_RESEARCH_SESSION = text(
+    'EXECUTE upsert_research_session(:p_session_id, :p_session_name, :p_payload)'
+)
+_EXECUTE_PATCH_RESEARCH_SESSION = text('EXECUTE patch_research_session(:p_session_id, :p_payload)')
+_EXECUTE_POST_ANNOTATION_SOURCES = text('EXECUTE post_annotation_sources(:session_id, :participant_id)')
+
+# Same statements unprepared, for connections whose PREPARE failed (e.g. opened before init_db)
+_INSERT_ACTION_LOG = (
+    pg_insert(ActionLogRow)
+    .values(
+        action_id=bindparam('p_action_id'),
+        session_id=bindparam('p_session_id'),
+        participant_id=bindparam('p_participant_id'),
+        created_at=bindparam('p_created_at'),
+        payload=cast(bindparam('p_payload', type_=Text), JSONB),
+    )
+    .on_conflict_do_nothing(index_elements=['action_id'])
+)
+_UPSERT_RESEARCH_SESSION_INSERT = pg_insert(ResearchSessionRow).values(
+    session_id=bindparam('p_session_id'),
+    session_name=bindparam('p_session_name'),
+    payload=cast(bindparam('p_payload', type_=Text), JSONB),
+)
+_UPSERT_RESEARCH_SESSION = _UPSERT_RESEARCH_SESSION_INSERT.on_conflict_do_update(
+    index_elements=['session_id'],
+    set_={
+        'session_name': _UPSERT_RESEARCH_SESSION_INSERT.excluded.session_name,
+        'payload': _UPSERT_RESEARCH_SESSION_INSERT.excluded.payload,
+        'updated_at': func.now(),
+    },
+)
+# Column list taken from the parameters passed to execute()
+_INSERT_IN_SESSION_ANNOTATION = insert(InSessionAnnotationRow)
+_PATCH_RESEARCH_SESSION = (
+    update(ResearchSessionRow)
+    .where(ResearchSessionRow.session_id == bindparam('p_session_id'))
+    .values(
+        payload=ResearchSessionRow.payload.op('||')(cast(bindparam('p_payload', type_=Text), JSONB)),
+        updated_at=func.now(),
+    )
+)
 
 _engine = None
+_engine_lock = threading.Lock()
 _SessionLocal: Optional[sessionmaker] = None
 
 
@@ -124,7 +243,7 @@ def _normalize_database_url(url: str) -> str:
     return u
 
 
-def get_database_url() -> Optional[str]:
+def _resolve_database_url() -> Optional[str]:
     url = (os.environ.get('DATABASE_URL') or '').strip()
     if url:
         return _normalize_database_url(url)
@@ -138,6 +257,16 @@ def get_database_url() -> Optional[str]:
     return f'postgresql+psycopg2://{user}:{password}@{host}:{port}/{database}'
 
 
+# Resolved once at import (app.py / scripts load .env and adjust PG* before importing this
+# module): is_db_configured() sits in front of every persist/load call, several per action
+# and one per timer tick, so do not rebuild the URL from env each time.
+_DATABASE_URL: Optional[str] = _resolve_database_url()
+
+
+def get_database_url() -> Optional[str]:
+    return _DATABASE_URL
+
+
 def is_db_configured() -> bool:
     return get_database_url() is not None
 
@@ -168,13 +297,12 @@ def _pg_connect_args(database_url: str) -> Dict[str, str]:
     """
     args: Dict[str, str] = {'gssencmode': 'disable'}
     ul = database_url.lower()
+    loopback = _db_url_host_is_loopback(database_url)
     # EXPORT_PG_TUNNEL_PORT must not force sslmode=disable when DATABASE_URL points at RDS/cloud:
     # that produces "no pg_hba.conf entry ... no encryption". Only apply with loopback tunnel.
-    if (os.environ.get('EXPORT_PG_TUNNEL_PORT') or '').strip() and _db_url_host_is_loopback(
-        database_url
-    ):
+    if (os.environ.get('EXPORT_PG_TUNNEL_PORT') or '').strip() and loopback:
         args['sslmode'] = 'disable'
-    elif _db_url_host_is_loopback(database_url):
+    elif loopback:
         if not any(
             s in ul
             for s in ('sslmode=require', 'sslmode=verify-full', 'sslmode=verify-ca')
@@ -185,54 +313,256 @@ def _pg_connect_args(database_url: str) -> Dict[str, str]:
     return args
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int((os.environ.get(name) or '').strip() or default)
+    except ValueError:
+        return default
+
+
+def _pooled_connect_args(database_url: str) -> Dict[str, str]:
+    """
+    _pg_connect_args plus a server-side statement_timeout for the pool (DB_STATEMENT_TIMEOUT_MS,
+    default 30000; 0 turns it off), so one slow statement cannot hold a pooled connection and
+    the request or writer thread waiting on it indefinitely. Not applied to the admin engine,
+    whose migrations (CREATE INDEX CONCURRENTLY) may legitimately run for minutes, or when the
+    URL already passes libpq options.
+    """
+    args = _pg_connect_args(database_url)
+    timeout_ms = _env_int('DB_STATEMENT_TIMEOUT_MS', 30000)
+    if timeout_ms > 0 and 'options=' not in database_url:
+        args['options'] = f'-c statement_timeout={timeout_ms}'
+    return args
+
+
+def _pool_kwargs() -> Dict[str, Any]:
+    """
+    QueuePool sizing for the threaded Flask-SocketIO server. The SQLAlchemy default (5 + 10
+    overflow, 30 s wait) is too small once agent runners, the timer scheduler and request
+    handlers all persist concurrently, and a 30 s block on checkout stalls a timer tick.
+    Override with DB_POOL_SIZE / DB_POOL_MAX_OVERFLOW / DB_POOL_TIMEOUT / DB_POOL_RECYCLE;
+    DB_POOL_DEBUG=1 logs checkouts and returns. DB_POOL_MIN_SIZE is read by warm_pool().
+    """
+    kwargs: Dict[str, Any] = {
+        'pool_size': _env_int('DB_POOL_SIZE', 5),
+        'max_overflow': _env_int('DB_POOL_MAX_OVERFLOW', 45),
+        'pool_timeout': _env_int('DB_POOL_TIMEOUT', 10),
+        'pool_recycle': _env_int('DB_POOL_RECYCLE', 300),
+    }
+    if (os.environ.get('DB_POOL_DEBUG') or '').strip().lower() in ('1', 'true', 'yes'):
+        kwargs['echo_pool'] = 'debug'
+    return kwargs
+
+
+# JSONB values are encoded with the same codec as Socket.IO packets (orjson when installed), and
+# psycopg2 decodes jsonb/json result columns with it too (the dialect registers the loads function
+# as the typecaster on each new connection). Payloads here are whole session snapshots and action
+# logs, so the stdlib encoder/decoder was a large share of every persist and hydrate.
+_JSON_CODEC_KWARGS = {'json_serializer': json_codec.dumps, 'json_deserializer': json_codec.loads}
+
+
 def get_engine():
     global _engine
     if _engine is None:
-        url = get_database_url()
-        if not url:
-            raise RuntimeError('Database is not configured')
-        _engine = create_engine(url, pool_pre_ping=True, connect_args=_pg_connect_args(url))
+        with _engine_lock:
+            if _engine is None:
+                url = get_database_url()
+                if not url:
+                    raise RuntimeError('Database is not configured')
+                # Every pooled connection is used in autocommit mode (see _autocommit_connection),
+                # so set it once per DBAPI connection instead of switching it on at each checkout
+                # and back off at each checkin; with no transaction to end, the pool's
+                # rollback-on-return is skipped too.
+                engine = create_engine(
+                    url,
+                    connect_args=_pooled_connect_args(url),
+                    isolation_level='AUTOCOMMIT',
+                    pool_reset_on_return=None,
+                    **_JSON_CODEC_KWARGS,
+                    **_pool_kwargs(),
+                )
+                event.listen(engine, 'connect', _prepare_statements)
+                event.listen(engine, 'checkin', _mark_checked_in)
+                event.listen(engine, 'checkout', _ping_if_idle)
+                _engine = engine
     return _engine
 
 
+def warm_pool() -> None:
+    """
+    Open DB_POOL_MIN_SIZE pooled connections (default 4, at most DB_POOL_SIZE) ahead of traffic.
+    QueuePool only connects on demand, so after a restart the first actions, timer flushes and
+    agent logs would each pay connect + auth + PREPARE; connections opened here stay in the pool.
+    """
+    if not is_db_configured():
+        return
+    engine = get_engine()
+    # Held open together (so each connect() opens a new one), all returned to the pool on exit
+    with ExitStack() as stack:
+        try:
+            for _ in range(min(_env_int('DB_POOL_MIN_SIZE', 4), engine.pool.size())):
+                stack.enter_context(engine.connect())
+        except Exception as e:
+            logger.warning('Pool warm-up failed: %s', e)
+
+
+# pool_pre_ping would add a SELECT 1 round trip to every checkout, i.e. to every persist call
+# (one per action, per timer flush). Connections that were just returned are known good, so
+# only ping those that sat idle long enough for the server or a proxy to have dropped them.
+_POOL_PING_IDLE_SECONDS = _env_int('DB_POOL_PING_IDLE', 10)
+
+
+def _mark_checked_in(dbapi_connection, connection_record) -> None:
+    connection_record.info['checked_in_at'] = time.monotonic()
+
+
+def _ping_if_idle(dbapi_connection, connection_record, connection_proxy) -> None:
+    checked_in_at = connection_record.info.get('checked_in_at')
+    if checked_in_at is None or time.monotonic() - checked_in_at < _POOL_PING_IDLE_SECONDS:
+        return  # brand-new connection, or returned to the pool moments ago
+    try:
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except Exception:
+        # The pool discards this connection and retries the checkout with a fresh one
+        raise exc.DisconnectionError()
+
+
+def _prepare_statements(dbapi_connection, connection_record) -> None:
+    # psycopg2: the connection block commits on success and rolls back on error, and the
+    # cursor block closes the cursor either way
+    try:
+        with dbapi_connection, dbapi_connection.cursor() as cursor:
+            for sql in _PREPARED_STATEMENTS.values():
+                cursor.execute(sql)
+    except Exception as e:
+        # e.g. tables not created yet (scripts/init_db.py); the connection stays usable
+        logger.warning('PREPARE on new connection failed: %s', e)
+
+
+@contextmanager
+def _admin_engine():
+    """
+    Unpooled engine for DDL and startup reads (init_db, session hydration). Each use opens its
+    own connection and closes it on exit, so one-off maintenance work never holds or warms
+    slots in the request pool.
+    """
+    url = get_database_url()
+    if not url:
+        raise RuntimeError('Database is not configured')
+    engine = create_engine(url, poolclass=NullPool, connect_args=_pg_connect_args(url), **_JSON_CODEC_KWARGS)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+def _autocommit_connection():
+    """
+    Pooled connection in autocommit mode, for single-statement writes and for reads: the
+    statement is its own transaction, so there are no separate BEGIN and COMMIT/ROLLBACK round
+    trips, and the connection goes straight back to the pool when the block exits.
+    """
+    return get_engine().connect()
+
+
 def get_session_factory():
     global _SessionLocal
     if _SessionLocal is None:
-        _SessionLocal = sessionmaker(bind=get_engine(), autoflush=False, autocommit=False)
+        # ORM sessions need real transactions on the otherwise autocommit pool
+        _SessionLocal = sessionmaker(
+            bind=get_engine().execution_options(isolation_level='READ COMMITTED'),
+            autoflush=False,
+            autocommit=False,
+        )
     return _SessionLocal
 
 
-def _ensure_in_session_elapsed_seconds_column(engine) -> None:
-    """Add elapsed_seconds to existing in_session_annotations (create_all does not alter tables)."""
-    schema = get_app_schema()
-    try:
-        from sqlalchemy import inspect
+# Every per-session child table is read (export, annotation views, replay) by session_id alone.
+# create_all only builds indexes together with a new table, so databases created before an
+# index was declared never get it. Names come from the model metadata (index=True columns).
+_SESSION_ID_INDEX_TABLES = (ActionLogRow, InSessionAnnotationRow, PostSessionAnnotationRow)
 
-        insp = inspect(engine)
-        cols = insp.get_columns('in_session_annotations', schema=schema)
-    except Exception:
-        return
-    names = {c['name'] for c in cols}
-    if 'elapsed_seconds' in names:
-        return
-    try:
-        with engine.begin() as conn:
-            conn.execute(
-                text(f'ALTER TABLE "{schema}"."in_session_annotations" ADD COLUMN elapsed_seconds INTEGER')
-            )
-    except Exception as e:
-        print(f'[DB] in_session_annotations.elapsed_seconds migration: {e}')
+
+def _migration_statements(schema: str) -> List[Tuple[str, str]]:
+    """
+    (label, DDL) for columns and indexes added after their table was first created. Each one is
+    idempotent (IF NOT EXISTS), so it runs as a single statement with no catalog probe first.
+    """
+    statements = [
+        (
+            'in_session_annotations.elapsed_seconds',
+            f'ALTER TABLE "{schema}"."in_session_annotations" ADD COLUMN IF NOT EXISTS elapsed_seconds INTEGER',
+        ),
+        (
+            'in_session_annotations participant index',
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_in_session_ann_session_participant_created '
+            f'ON "{schema}"."in_session_annotations" (session_id, participant_id, created_at)',
+        ),
+    ]
+    for model in _SESSION_ID_INDEX_TABLES:
+        table = model.__table__
+        for index in table.indexes:
+            if [c.name for c in index.columns] == ['session_id']:
+                statements.append(
+                    (
+                        f'{table.name}.session_id index',
+                        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index.name} '
+                        f'ON "{schema}"."{table.name}" (session_id)',
+                    )
+                )
+    statements.append(
+        (
+            'action_logs session_name index',
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_action_logs_payload_session_name_session '
+            f'ON "{schema}"."action_logs" ((payload ->> \'session_name\'), session_id)',
+        )
+    )
+    # Superseded by the index above (its leading column)
+    statements.append(
+        (
+            'action_logs single-column session_name index',
+            f'DROP INDEX CONCURRENTLY IF EXISTS "{schema}".ix_action_logs_payload_session_name',
+        )
+    )
+    statements.append(
+        (
+            'research_sessions session_name index',
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_research_sessions_session_name_session '
+            f'ON "{schema}"."research_sessions" (session_name) INCLUDE (session_id)',
+        )
+    )
+    # Replaced by the covering index above (this was the default name for index=True)
+    statements.append(
+        (
+            'research_sessions single-column session_name index',
+            f'DROP INDEX CONCURRENTLY IF EXISTS "{schema}".ix_{schema}_research_sessions_session_name',
+        )
+    )
+    return statements
+
+
+def _run_migrations(engine) -> None:
+    """Apply _migration_statements over one connection (the admin engine is unpooled)."""
+    # AUTOCOMMIT: CREATE INDEX CONCURRENTLY cannot run in a transaction block (it does not block
+    # inserts meanwhile), and a failed statement does not abort the ones after it.
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        for label, ddl in _migration_statements(get_app_schema()):
+            try:
+                conn.execute(text(ddl))
+            except Exception as e:
+                print(f'[DB] {label} migration: {e}')
 
 
 def init_db() -> None:
     """Create application schema (if needed) and tables if they do not exist."""
     schema = get_app_schema()
-    engine = get_engine()
-    # Identifier is regex-validated; safe to interpolate as bare PostgreSQL identifier.
-    with engine.begin() as conn:
-        conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS {schema}'))
-    Base.metadata.create_all(bind=engine)
-    _ensure_in_session_elapsed_seconds_column(engine)
+    with _admin_engine() as engine:
+        # Identifier is regex-validated; safe to interpolate as bare PostgreSQL identifier.
+        with engine.begin() as conn:
+            conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS {schema}'))
+        Base.metadata.create_all(bind=engine)
+        _run_migrations(engine)
 
 
 def _parse_entry_timestamp(ts: Optional[str]) -> datetime:
@@ -249,43 +579,62 @@ def _parse_entry_timestamp(ts: Optional[str]) -> datetime:
         return datetime.now(timezone.utc)
 
 
-def persist_action_log(entry: Dict[str, Any]) -> None:
-    """Insert one action log row (idempotent on action_id)."""
-    if not is_db_configured():
-        return
+def action_log_row(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Insert parameters for one action log entry (None when it lacks an id). The payload is
+    serialized here, so later changes to the entry are not recorded.
+    """
     action_id = entry.get('action_id')
     session_id = entry.get('session_id')
     participant_id = entry.get('participant_id')
     if not action_id or not session_id or not participant_id:
+        return None
+    return {
+        'p_action_id': action_id,
+        'p_session_id': session_id,
+        'p_participant_id': participant_id,
+        'p_created_at': _parse_entry_timestamp(entry.get('timestamp')),
+        'p_payload': json_codec.dumps(entry, default=str),
+    }
+
+
+def persist_action_log(entry: Dict[str, Any]) -> None:
+    """Insert one action log row (idempotent on action_id)."""
+    if not is_db_configured():
         return
-    SessionLocal = get_session_factory()
-    row = ActionLogRow(
-        action_id=action_id,
-        session_id=session_id,
-        participant_id=participant_id,
-        created_at=_parse_entry_timestamp(entry.get('timestamp')),
-        payload=entry,
-    )
-    with SessionLocal() as db:
-        existing = db.scalar(select(ActionLogRow).where(ActionLogRow.action_id == action_id))
-        if existing:
-            return
-        db.add(row)
-        db.commit()
+    params = action_log_row(entry)
+    if params is None:
+        return
+    with _autocommit_connection() as conn:
+        # A repeated action_id is skipped by the unique index (ON CONFLICT DO NOTHING) in the
+        # same statement, rather than probing for it first.
+        _execute_prepared(conn, _EXECUTE_INSERT_ACTION_LOG, _INSERT_ACTION_LOG, params)
+
+
+def persist_action_log_rows(rows: List[Dict[str, Any]]) -> None:
+    """Insert rows built by action_log_row in one statement (idempotent on action_id)."""
+    if not rows or not is_db_configured():
+        return
+    with _autocommit_connection() as conn:
+        if len(rows) == 1:
+            _execute_prepared(conn, _EXECUTE_INSERT_ACTION_LOG, _INSERT_ACTION_LOG, rows[0])
+        else:
+            # executemany of an INSERT: psycopg2's dialect sends it as multi-row VALUES pages
+            # (insertmanyvalues), one round trip per up to 1000 rows.
+            conn.execute(_INSERT_ACTION_LOG, rows)
 
 
 def load_session_logs(session_id: str) -> List[Dict[str, Any]]:
     """Return all action payloads for a session, ordered by time."""
     if not is_db_configured():
         return []
-    SessionLocal = get_session_factory()
-    with SessionLocal() as db:
-        rows = db.scalars(
-            select(ActionLogRow)
+    with _autocommit_connection() as conn:
+        payloads = conn.scalars(
+            select(ActionLogRow.payload)
             .where(ActionLogRow.session_id == session_id)
             .order_by(ActionLogRow.created_at.asc())
         ).all()
-        return [dict(r.payload) for r in rows]
+        return [dict(p) for p in payloads]
 
 
 def persist_in_session_annotation(
@@ -300,51 +649,50 @@ def persist_in_session_annotation(
         return
     if not session_id or not participant_id or not transcription:
         return
-    SessionLocal = get_session_factory()
-    ts = created_at if created_at is not None else datetime.now(timezone.utc)
-    if ts.tzinfo is None:
-        ts = ts.replace(tzinfo=timezone.utc)
-    else:
-        ts = ts.astimezone(timezone.utc)
-    row = InSessionAnnotationRow(
-        session_id=session_id,
-        participant_id=participant_id,
-        checkpoint_index=int(checkpoint_index),
-        transcription=transcription,
-        created_at=ts,
-        elapsed_seconds=elapsed_seconds,
-    )
-    with SessionLocal() as db:
-        db.add(row)
-        db.commit()
+    row = {
+        'session_id': session_id,
+        'participant_id': participant_id,
+        'checkpoint_index': int(checkpoint_index),
+        'transcription': transcription,
+    }
+    # Optional columns are only sent when supplied; created_at otherwise takes the server default
+    if created_at is not None:
+        row['created_at'] = (
+            created_at.replace(tzinfo=timezone.utc) if created_at.tzinfo is None else created_at.astimezone(timezone.utc)
+        )
+    if elapsed_seconds is not None:
+        row['elapsed_seconds'] = elapsed_seconds
+    with _autocommit_connection() as conn:
+        conn.execute(_INSERT_IN_SESSION_ANNOTATION, row)
 
 
 def load_in_session_annotations(session_id: str, participant_id: str) -> List[Dict[str, Any]]:
     """In-session annotations for one participant, chronological."""
     if not is_db_configured():
         return []
-    SessionLocal = get_session_factory()
-    with SessionLocal() as db:
-        rows = db.scalars(
-            select(InSessionAnnotationRow)
+    with _autocommit_connection() as conn:
+        rows = conn.execute(
+            select(
+                InSessionAnnotationRow.checkpoint_index,
+                InSessionAnnotationRow.transcription,
+                InSessionAnnotationRow.created_at,
+                InSessionAnnotationRow.elapsed_seconds,
+            )
             .where(
                 InSessionAnnotationRow.session_id == session_id,
                 InSessionAnnotationRow.participant_id == participant_id,
             )
             .order_by(InSessionAnnotationRow.created_at.asc())
-        ).all()
-        out = []
-        for r in rows:
-            ts = r.created_at.isoformat() if r.created_at else ''
-            out.append(
-                {
-                    'checkpoint_index': r.checkpoint_index,
-                    'transcription': r.transcription,
-                    'created_at': ts,
-                    'elapsed_seconds': r.elapsed_seconds,
-                }
-            )
-        return out
+        )
+        return [
+            {
+                'checkpoint_index': checkpoint_index,
+                'transcription': transcription,
+                'created_at': created_at.isoformat() if created_at else '',
+                'elapsed_seconds': elapsed_seconds,
+            }
+            for checkpoint_index, transcription, created_at, elapsed_seconds in rows
+        ]
 
 
 def upsert_post_session_annotations(
@@ -356,54 +704,164 @@ def upsert_post_session_annotations(
         return
     if not isinstance(annotations, dict):
         return
-    # JSONB must receive JSON-serializable structures (no stray types from clients).
-    safe = _json_safe_payload(dict(annotations))
-    SessionLocal = get_session_factory()
-    now = datetime.now(timezone.utc)
-    with SessionLocal() as db:
-        row = db.scalar(
-            select(PostSessionAnnotationRow).where(
-                PostSessionAnnotationRow.session_id == session_id,
-                PostSessionAnnotationRow.participant_id == participant_id,
-            )
-        )
-        if row:
-            row.payload = safe
-            row.updated_at = now
-        else:
-            db.add(
-                PostSessionAnnotationRow(
-                    session_id=session_id,
-                    participant_id=participant_id,
-                    payload=safe,
-                    updated_at=now,
-                )
-            )
-        db.commit()
+    # Serialized once (stray non-JSON types become strings) and parsed by the server as jsonb,
+    # instead of a dumps/loads round trip here followed by the JSONB bind serializing it again.
+    payload = cast(literal(json_codec.dumps(annotations, default=str), Text), JSONB)
+    # One INSERT .. ON CONFLICT against uq_post_session_annotations_session_participant: a
+    # single round trip, and two concurrent first saves can no longer both miss the UPDATE and
+    # race to INSERT. updated_at comes from the server default on insert.
+    stmt = pg_insert(PostSessionAnnotationRow).values(
+        session_id=session_id,
+        participant_id=participant_id,
+        payload=payload,
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint='uq_post_session_annotations_session_participant',
+        set_={'payload': stmt.excluded.payload, 'updated_at': func.now()},
+    )
+    with _autocommit_connection() as conn:
+        conn.execute(stmt)
 
 
 def load_post_session_annotations(session_id: str, participant_id: str) -> Dict[str, Any]:
     """Return saved post-session annotation object (action_id -> fields), or {}."""
     if not is_db_configured():
         return {}
-    SessionLocal = get_session_factory()
-    with SessionLocal() as db:
-        row = db.scalar(
-            select(PostSessionAnnotationRow).where(
+    with _autocommit_connection() as conn:
+        payload = conn.scalar(
+            select(PostSessionAnnotationRow.payload).where(
                 PostSessionAnnotationRow.session_id == session_id,
                 PostSessionAnnotationRow.participant_id == participant_id,
             )
         )
-        if not row or not row.payload:
-            return {}
-        return dict(row.payload)
+        return dict(payload) if payload else {}
+
+
+def _jsonb_agg_or_empty(expr, order_by):
+    return func.coalesce(func.jsonb_agg(aggregate_order_by(expr, order_by)), literal_column("'[]'::jsonb"))
 
 
-def _json_safe_payload(d: Dict[str, Any]) -> Dict[str, Any]:
+# Everything the post-annotation view reads from the database, as one statement: three scalar
+# subqueries evaluated server-side and returned in a single row (one round trip, not three).
+_POST_ANNOTATION_SOURCES = select(
+    select(_jsonb_agg_or_empty(ActionLogRow.payload, ActionLogRow.created_at.asc()))
+    .where(ActionLogRow.session_id == bindparam('session_id'))
+    .scalar_subquery(),
+    select(PostSessionAnnotationRow.payload)
+    .where(
+        PostSessionAnnotationRow.session_id == bindparam('session_id'),
+        PostSessionAnnotationRow.participant_id == bindparam('participant_id'),
+    )
+    .limit(1)
+    .scalar_subquery(),
+    select(
+        _jsonb_agg_or_empty(
+            func.jsonb_build_object(
+                'checkpoint_index', InSessionAnnotationRow.checkpoint_index,
+                'transcription', InSessionAnnotationRow.transcription,
+                'created_at', InSessionAnnotationRow.created_at,
+                'elapsed_seconds', InSessionAnnotationRow.elapsed_seconds,
+            ),
+            InSessionAnnotationRow.created_at.asc(),
+        )
+    )
+    .where(
+        InSessionAnnotationRow.session_id == bindparam('session_id'),
+        InSessionAnnotationRow.participant_id == bindparam('participant_id'),
+    )
+    .scalar_subquery(),
+)
+
+
+def load_post_annotation_sources(
+    session_id: str, participant_id: str
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Combined load_session_logs + load_post_session_annotations + load_in_session_annotations
+    for one participant: (action payloads, saved post-session answers, in-session annotations).
+    """
+    if not is_db_configured():
+        return [], {}, []
+    with _autocommit_connection() as conn:
+        logs, saved, in_session = _execute_prepared(
+            conn,
+            _EXECUTE_POST_ANNOTATION_SOURCES,
+            _POST_ANNOTATION_SOURCES,
+            {'session_id': session_id, 'participant_id': participant_id},
+        ).one()
+    for item in in_session:
+        # Same ISO format as load_in_session_annotations (jsonb renders timestamps itself)
+        ts = item.get('created_at')
+        item['created_at'] = datetime.fromisoformat(ts).isoformat() if ts else ''
+    return logs, dict(saved) if saved else {}, in_session
+
+
+def _execute_prepared(conn, prepared, fallback, params):
+    """EXECUTE a statement from _PREPARED_STATEMENTS, or run its plain form if it was never prepared."""
     try:
-        return json.loads(json.dumps(d, default=str))
-    except Exception:
-        return dict(d)
+        return conn.execute(prepared, params)
+    except exc.DBAPIError as e:
+        if getattr(e.orig, 'pgcode', None) != '26000':  # invalid_sql_statement_name
+            raise
+        return conn.execute(fallback, params)
+
+
+# The per-session export (scripts/export_session_data.py) as one statement: all action payloads,
+# every participant's in-session annotations and every post-session annotation row.
+_SESSION_EXPORT_SOURCES = select(
+    select(_jsonb_agg_or_empty(ActionLogRow.payload, ActionLogRow.created_at.asc()))
+    .where(ActionLogRow.session_id == bindparam('session_id'))
+    .scalar_subquery(),
+    select(
+        _jsonb_agg_or_empty(
+            func.jsonb_build_object(
+                'participant_id', InSessionAnnotationRow.participant_id,
+                'checkpoint_index', InSessionAnnotationRow.checkpoint_index,
+                'transcription', InSessionAnnotationRow.transcription,
+                'created_at', InSessionAnnotationRow.created_at,
+                'elapsed_seconds', InSessionAnnotationRow.elapsed_seconds,
+            ),
+            InSessionAnnotationRow.created_at.asc(),
+        )
+    )
+    .where(InSessionAnnotationRow.session_id == bindparam('session_id'))
+    .scalar_subquery(),
+    select(
+        _jsonb_agg_or_empty(
+            func.jsonb_build_object(
+                'participant_id', PostSessionAnnotationRow.participant_id,
+                'payload', PostSessionAnnotationRow.payload,
+                'updated_at', PostSessionAnnotationRow.updated_at,
+            ),
+            PostSessionAnnotationRow.id.asc(),
+        )
+    )
+    .where(PostSessionAnnotationRow.session_id == bindparam('session_id'))
+    .scalar_subquery(),
+)
+
+
+def load_session_export_sources(
+    session_id: str,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Combined load_session_logs + load_all_in_session_rows_for_session +
+    load_all_post_session_rows_for_session in one round trip: (action payloads,
+    in-session annotation rows, post-session annotation rows).
+    """
+    if not is_db_configured() or not session_id:
+        return [], [], []
+    with _autocommit_connection() as conn:
+        logs, in_session, post = conn.execute(_SESSION_EXPORT_SOURCES, {'session_id': session_id}).one()
+    # Same ISO formats and shapes as the single-table loaders (jsonb renders timestamps itself)
+    for item in in_session:
+        ts = item.get('created_at')
+        item['created_at'] = datetime.fromisoformat(ts).isoformat() if ts else ''
+    for item in post:
+        ts = item.get('updated_at')
+        item['updated_at'] = datetime.fromisoformat(ts).isoformat() if ts else ''
+        item['payload'] = item.get('payload') or {}
+    return logs, in_session, post
 
 
 def persist_research_session(session_dict: Dict[str, Any]) -> None:
@@ -414,60 +872,59 @@ def persist_research_session(session_dict: Dict[str, Any]) -> None:
     if not sid:
         return
     sn = (session_dict.get('session_name') or '')[:512]
-    payload = _json_safe_payload(copy.deepcopy(session_dict))
-    now = datetime.now(timezone.utc)
-    SessionLocal = get_session_factory()
-    with SessionLocal() as db:
-        row = db.scalar(select(ResearchSessionRow).where(ResearchSessionRow.session_id == sid))
-        if row:
-            row.session_name = sn
-            row.payload = payload
-            row.updated_at = now
-        else:
-            db.add(
-                ResearchSessionRow(
-                    session_id=sid,
-                    session_name=sn,
-                    payload=payload,
-                    updated_at=now,
-                )
-            )
-        db.commit()
+    payload = json_codec.dumps(session_dict, default=str)
+    with _autocommit_connection() as conn:
+        # One INSERT .. ON CONFLICT (session_id) DO UPDATE: a single round trip for both the
+        # first write and every later one, with no UPDATE-miss/INSERT race between two commits.
+        _execute_prepared(
+            conn,
+            _EXECUTE_UPSERT_RESEARCH_SESSION,
+            _UPSERT_RESEARCH_SESSION,
+            {'p_session_id': sid, 'p_session_name': sn, 'p_payload': payload},
+        )
+
+
+def patch_research_session(session_id: str, fields: Dict[str, Any]) -> bool:
+    """
+    Merge top-level fields into the stored session JSON (payload || patch) without resending
+    the rest of it. Returns False when there is no row for session_id.
+    """
+    if not is_db_configured() or not session_id:
+        return False
+    params = {'p_session_id': session_id, 'p_payload': json_codec.dumps(fields, default=str)}
+    with _autocommit_connection() as conn:
+        result = _execute_prepared(conn, _EXECUTE_PATCH_RESEARCH_SESSION, _PATCH_RESEARCH_SESSION, params)
+        return result.rowcount > 0
 
 
 def delete_research_session(session_id: str) -> None:
     if not is_db_configured() or not session_id:
         return
-    SessionLocal = get_session_factory()
-    with SessionLocal() as db:
-        row = db.scalar(select(ResearchSessionRow).where(ResearchSessionRow.session_id == session_id))
-        if row:
-            db.delete(row)
-            db.commit()
+    # One DELETE on a pooled autocommit connection: no ORM load of the row (and its JSONB
+    # payload) beforehand, and no separate transaction around it. Deleting a missing id is a no-op.
+    with _autocommit_connection() as conn:
+        conn.execute(_DELETE_RESEARCH_SESSION, {'session_id': session_id})
 
 
 def load_all_research_sessions() -> Dict[str, Dict[str, Any]]:
-    """Return all sessions keyed by session_id (matches in-memory ``sessions`` dict keys)."""
+    """
+    Return all sessions keyed by session_id (matches in-memory ``sessions`` dict keys).
+    Startup-only read, so it goes through the unpooled admin engine.
+    """
     if not is_db_configured():
         return {}
-    SessionLocal = get_session_factory()
-    with SessionLocal() as db:
-        rows = db.scalars(select(ResearchSessionRow)).all()
-        out: Dict[str, Dict[str, Any]] = {}
-        for r in rows:
-            if r.payload:
-                out[r.session_id] = dict(r.payload)
-        return out
+    with _admin_engine() as engine, Session(engine) as db:
+        rows = db.execute(select(ResearchSessionRow.session_id, ResearchSessionRow.payload))
+        return {session_id: dict(payload) for session_id, payload in rows if payload}
 
 
 def find_session_ids_by_name(session_name: str) -> List[str]:
     """Return session_id values whose research_sessions.session_name matches (exact)."""
     if not is_db_configured() or not (session_name or '').strip():
         return []
-    SessionLocal = get_session_factory()
     name = session_name.strip()[:512]
-    with SessionLocal() as db:
-        rows = db.scalars(
+    with _autocommit_connection() as conn:
+        rows = conn.scalars(
             select(ResearchSessionRow.session_id).where(ResearchSessionRow.session_name == name)
         ).all()
         return [str(x) for x in rows]
@@ -481,11 +938,10 @@ def find_session_ids_by_name_from_action_logs(session_name: str) -> List[str]:
     if not is_db_configured() or not (session_name or '').strip():
         return []
     name = session_name.strip()[:512]
-    SessionLocal = get_session_factory()
-    with SessionLocal() as db:
-        rows = db.scalars(
+    with _autocommit_connection() as conn:
+        rows = conn.scalars(
             select(ActionLogRow.session_id)
-            .where(cast(ActionLogRow.payload['session_name'], String) == name)
+            .where(ActionLogRow.payload['session_name'].astext == name)
             .distinct()
             .order_by(ActionLogRow.session_id.asc())
         ).all()
@@ -496,9 +952,8 @@ def list_distinct_participant_ids(session_id: str) -> List[str]:
     """Distinct participant_id values present in action_logs for this session."""
     if not is_db_configured() or not session_id:
         return []
-    SessionLocal = get_session_factory()
-    with SessionLocal() as db:
-        rows = db.scalars(
+    with _autocommit_connection() as conn:
+        rows = conn.scalars(
             select(ActionLogRow.participant_id)
             .where(ActionLogRow.session_id == session_id)
             .distinct()
@@ -511,45 +966,47 @@ def load_all_in_session_rows_for_session(session_id: str) -> List[Dict[str, Any]
     """All in-session annotation rows for a session (every participant), chronological."""
     if not is_db_configured() or not session_id:
         return []
-    SessionLocal = get_session_factory()
-    with SessionLocal() as db:
-        rows = db.scalars(
-            select(InSessionAnnotationRow)
+    with _autocommit_connection() as conn:
+        rows = conn.execute(
+            select(
+                InSessionAnnotationRow.participant_id,
+                InSessionAnnotationRow.checkpoint_index,
+                InSessionAnnotationRow.transcription,
+                InSessionAnnotationRow.created_at,
+                InSessionAnnotationRow.elapsed_seconds,
+            )
             .where(InSessionAnnotationRow.session_id == session_id)
             .order_by(InSessionAnnotationRow.created_at.asc())
-        ).all()
-        out: List[Dict[str, Any]] = []
-        for r in rows:
-            ts = r.created_at.isoformat() if r.created_at else ''
-            out.append(
-                {
-                    'participant_id': r.participant_id,
-                    'checkpoint_index': r.checkpoint_index,
-                    'transcription': r.transcription,
-                    'created_at': ts,
-                    'elapsed_seconds': r.elapsed_seconds,
-                }
-            )
-        return out
+        )
+        return [
+            {
+                'participant_id': participant_id,
+                'checkpoint_index': checkpoint_index,
+                'transcription': transcription,
+                'created_at': created_at.isoformat() if created_at else '',
+                'elapsed_seconds': elapsed_seconds,
+            }
+            for participant_id, checkpoint_index, transcription, created_at, elapsed_seconds in rows
+        ]
 
 
 def load_all_post_session_rows_for_session(session_id: str) -> List[Dict[str, Any]]:
     """All post-session annotation payloads for a session (one row per participant)."""
     if not is_db_configured() or not session_id:
         return []
-    SessionLocal = get_session_factory()
-    with SessionLocal() as db:
-        rows = db.scalars(
-            select(PostSessionAnnotationRow).where(PostSessionAnnotationRow.session_id == session_id)
-        ).all()
-        out = []
-        for r in rows:
-            ts = r.updated_at.isoformat() if r.updated_at else ''
-            out.append(
-                {
-                    'participant_id': r.participant_id,
-                    'payload': dict(r.payload) if r.payload else {},
-                    'updated_at': ts,
-                }
-            )
-        return out
+    with _autocommit_connection() as conn:
+        rows = conn.execute(
+            select(
+                PostSessionAnnotationRow.participant_id,
+                PostSessionAnnotationRow.payload,
+                PostSessionAnnotationRow.updated_at,
+            ).where(PostSessionAnnotationRow.session_id == session_id)
+        )
+        return [
+            {
+                'participant_id': participant_id,
+                'payload': dict(payload) if payload else {},
+                'updated_at': updated_at.isoformat() if updated_at else '',
+            }
+            for participant_id, payload, updated_at in rows
+        ]
@@ -0,0 +1,25 @@
+"""
+Shared OpenAI / Azure OpenAI SDK clients.
+
+Each SDK client owns an httpx connection pool. Building one per call (every transcription,
+every agent TTS line, every agent runner) opened a fresh TCP + TLS connection to the API each
+time; the clients are thread-safe, so one per credential set is kept and reused.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8)
+def get_openai_client(api_key: str):
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key)
+
+
+@lru_cache(maxsize=8)
+def get_azure_openai_client(api_key: str, api_version: str, azure_endpoint: str):
+    from openai import AzureOpenAI
+
+    return AzureOpenAI(api_key=api_key, api_version=api_version, azure_endpoint=azure_endpoint)
@@ -59,12 +59,15 @@ class ProductionService:
         # Import here to avoid circular import
         from routes.participant import update_participant_experiment_params
         
-        for session_key, session in sessions.items():
+        # Snapshot: request threads add and remove sessions while this thread walks them.
+        # One clock read per sweep is enough for every production item.
+        now = datetime.now(timezone.utc)
+        for session_key, session in list(sessions.items()):
             participants = session.get('participants', [])
             updated = False
             
             for participant in participants:
-                if self._check_participant_productions(participant):
+                if self._check_participant_productions(participant, now):
                     # Recalculate interface config after updating experiment_params
                     # This ensures frontend gets updated values for money, inventory, etc.
                     update_participant_experiment_params(participant, session)
@@ -81,21 +84,25 @@ class ProductionService:
                     update_type='partial'
                 )
     
-    def _check_participant_productions(self, participant):
+    def _check_participant_productions(self, participant, now):
         """
         Check and complete productions for a single participant.
         
+        Args:
+            participant: Participant dict (updated in place)
+            now: Current UTC time for this sweep
+        
         Returns:
             True if participant was updated, False otherwise
         """
-        exp_params = participant.get('experiment_params', {})
-        in_production = exp_params.get('in_production', [])
-        inventory = exp_params.get('inventory', [])
-        
-        if not isinstance(in_production, list) or len(in_production) == 0:
+        exp_params = participant.get('experiment_params')
+        if not exp_params:
+            return False
+        in_production = exp_params.get('in_production')
+        if not isinstance(in_production, list) or not in_production:
             return False
+        inventory = exp_params.get('inventory', [])
         
-        now = datetime.now(timezone.utc)
         completed_items = []
         remaining_items = []
         
@@ -6,8 +6,10 @@ from __future__ import annotations
 
 import json
 import os
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
+from config.experiments import AI_PARTICIPANT_TYPES
 from routes.participant import get_value_from_session_params
 from services.realtime_prompt_fill import (
     apply_realtime_instruction_placeholders,
@@ -34,7 +36,7 @@ def first_ai_participant_id(session: Optional[Dict[str, Any]]) -> Optional[str]:
     if not session:
         return None
     for p in session.get("participants") or []:
-        if str(p.get("type") or "").lower() in ("ai", "ai_agent"):
+        if str(p.get("type") or "").lower() in AI_PARTICIPANT_TYPES:
             pid = p.get("id") or p.get("participant_id")
             if pid is not None and str(pid).strip() != "":
                 return str(pid)
@@ -130,23 +132,28 @@ def load_prompt_instructions(experiment_type: str, participant_role: Optional[st
     else:
         prompt_name = f"{experiment_type}_agent"
 
-    import os as _os
-
-    current_dir = _os.path.dirname(_os.path.abspath(__file__))
-    agent_dir = _os.path.join(_os.path.dirname(current_dir), "agent")
-    prompt_file = _os.path.join(agent_dir, "prompts", f"{prompt_name}_prompt.txt")
-    if _os.path.exists(prompt_file):
-        try:
-            with open(prompt_file, "r", encoding="utf-8") as f:
-                text = f.read()
-                if len(text) > 12000:
-                    return text[:12000] + "\n\n[... truncated ...]"
-                return text
-        except OSError:
-            pass
+    text = _read_prompt_file(prompt_name)
+    if text is not None:
+        return text
     return f"You are an AI participant in experiment '{experiment_type}'. Use tools to act in the environment."
 
 
+@lru_cache(maxsize=32)
+def _read_prompt_file(prompt_name: str) -> Optional[str]:
+    """Prompt files ship with the code, so each is read (and truncated) once per process."""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    agent_dir = os.path.join(os.path.dirname(current_dir), "agent")
+    prompt_file = os.path.join(agent_dir, "prompts", f"{prompt_name}_prompt.txt")
+    try:
+        with open(prompt_file, "r", encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return None
+    if len(text) > 12000:
+        return text[:12000] + "\n\n[... truncated ...]"
+    return text
+
+
 def _tool_message() -> Dict[str, Any]:
     return {
         "type": "function",
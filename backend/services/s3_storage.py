@@ -8,6 +8,8 @@ from __future__ import annotations
 
 import os
 import re
+import threading
+import time
 from typing import Optional, Tuple
 from urllib.parse import unquote
 
@@ -21,29 +23,60 @@ def is_s3_configured() -> bool:
     )
 
 
-def _client():
-    import boto3
+# One client per credential set. Building a boto3 client loads the service model and starts a
+# fresh connection pool, which dominated presign-heavy responses (one URL per logged action);
+# clients are thread-safe, so share it.
+_clients: dict = {}
+_clients_lock = threading.Lock()
+
+# Presigned GET URLs by (s3_uri, expires_in) -> (url, signed_at). Post-annotation views presign
+# every screenshot/snapshot of the session on each load; a URL is reused while at least half of
+# its lifetime remains, instead of re-signing (SigV4 HMAC chain) the same object every request.
+_PRESIGNED_GET_CACHE_MAX = 4096
+_presigned_get_cache: dict = {}
 
-    return boto3.client(
-        's3',
-        region_name=os.environ['AWS_REGION'].strip(),
-        aws_access_key_id=os.environ['AWS_ACCESS_KEY_ID'].strip(),
-        aws_secret_access_key=os.environ['AWS_SECRET_ACCESS_KEY'].strip(),
+
+def _client():
+    creds = (
+        os.environ['AWS_REGION'].strip(),
+        os.environ['AWS_ACCESS_KEY_ID'].strip(),
+        os.environ['AWS_SECRET_ACCESS_KEY'].strip(),
     )
+    c = _clients.get(creds)
+    if c is not None:
+        return c
+    with _clients_lock:
+        c = _clients.get(creds)
+        if c is None:
+            import boto3
+
+            c = boto3.client(
+                's3',
+                region_name=creds[0],
+                aws_access_key_id=creds[1],
+                aws_secret_access_key=creds[2],
+            )
+            _clients.clear()
+            _clients[creds] = c
+            _presigned_get_cache.clear()
+    return c
+
+
+_UNSAFE_KEY_CHARS_RE = re.compile(r'[^a-zA-Z0-9._-]')
 
 
 def build_annotation_key(session_id: str, action_id: str, suffix: str) -> str:
     """Key prefix for annotation assets."""
-    safe_session = re.sub(r'[^a-zA-Z0-9._-]', '_', session_id)[:200]
+    safe_session = _UNSAFE_KEY_CHARS_RE.sub('_', session_id)[:200]
     return f'annotation/{safe_session}/{action_id}_{suffix}'
 
 
 def build_post_annotation_asset_key(session_id: str, participant_id: str, action_id: str, filename: str) -> str:
     """S3 key for post-session annotator direct uploads (browser -> S3)."""
-    safe_s = re.sub(r'[^a-zA-Z0-9._-]', '_', session_id)[:200]
-    safe_p = re.sub(r'[^a-zA-Z0-9._-]', '_', participant_id)[:200]
-    safe_a = re.sub(r'[^a-zA-Z0-9._-]', '_', action_id)[:80]
-    safe_name = re.sub(r'[^a-zA-Z0-9._-]', '_', filename)[:120]
+    safe_s = _UNSAFE_KEY_CHARS_RE.sub('_', session_id)[:200]
+    safe_p = _UNSAFE_KEY_CHARS_RE.sub('_', participant_id)[:200]
+    safe_a = _UNSAFE_KEY_CHARS_RE.sub('_', action_id)[:80]
+    safe_name = _UNSAFE_KEY_CHARS_RE.sub('_', filename)[:120]
     return f'post_annotation/{safe_s}/{safe_p}/{safe_a}/{safe_name}'
 
 
@@ -97,11 +130,22 @@ def presign_get_url(s3_uri: str, expires_in: int = 3600) -> Optional[str]:
     except Exception:
         return None
     c = _client()
-    return c.generate_presigned_url(
+    now = time.time()
+    cached = _presigned_get_cache.get((s3_uri, expires_in))
+    if cached is not None and now - cached[1] < expires_in / 2:
+        return cached[0]
+    url = c.generate_presigned_url(
         'get_object',
         Params={'Bucket': bucket, 'Key': key},
         ExpiresIn=expires_in,
     )
+    if len(_presigned_get_cache) >= _PRESIGNED_GET_CACHE_MAX:
+        try:
+            del _presigned_get_cache[next(iter(_presigned_get_cache))]
+        except (KeyError, StopIteration, RuntimeError):
+            pass
+    _presigned_get_cache[(s3_uri, expires_in)] = (url, now)
+    return url
 
 
 def resolve_s3_fields_in_entry(entry: dict, expires_in: int = 3600) -> dict:
@@ -1,26 +1,54 @@
 """
 Timer Service: Manages countdown timers for experiment sessions.
+
+All running timers share one scheduler task that keeps a heap of per-session tick
+deadlines, instead of one polling thread per session.
 """
+import heapq
+import itertools
 import threading
 import time
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.experiments import AI_PARTICIPANT_TYPES
 
-# Global timer storage: session_id -> TimerService instance
+# Global timer storage: session_id -> TimerService instance. _timers_lock serializes the
+# functions that create, change or remove timers; lookups (get_timer, get_timer_snapshot) are
+# single dict reads, atomic under the GIL, and skip it. Those run on every logged action and
+# socket join, and would otherwise queue behind a control request holding the lock.
 _timers: Dict[str, 'TimerService'] = {}
 _timers_lock = threading.Lock()
 
+# Scheduler state: heap of (deadline, seq, timer, generation). Entries whose generation no
+# longer matches the timer's (paused/stopped/reset/rescheduled) are dropped lazily when popped.
+TICK_INTERVAL = 1.0
+_schedule: List[Tuple[float, int, 'TimerService', int]] = []
+_schedule_lock = threading.Lock()
+_schedule_wakeup = threading.Event()
+_schedule_seq = itertools.count()
+_scheduler_started = False
+
 
 class TimerService:
     """Manages countdown timer for a session"""
     
+    # Fixed attribute layout: the scheduler reads these on every tick of every running timer
+    __slots__ = (
+        'session_id', 'initial_duration', 'remaining_seconds', 'is_running', 'is_paused',
+        '_generation', '_last_broadcast', '_last_payload', 'paused_at', 'started_at',
+        'elapsed_while_paused',
+    )
+    
     def __init__(self, session_id: str, duration_seconds: int):
         self.session_id = session_id
         self.initial_duration = duration_seconds
         self.remaining_seconds = duration_seconds
         self.is_running = False
         self.is_paused = False
-        self.timer_thread: Optional[threading.Thread] = None
+        self._generation = 0  # Bumped to invalidate queued scheduler ticks
+        self._last_broadcast: Optional[Tuple[int, bool, bool]] = None  # State of last timer_update
+        self._last_payload: Optional[Dict[str, Any]] = None  # Last timer_update sent, replayed on join
         self.paused_at: Optional[float] = None  # Timestamp when paused
         self.started_at: Optional[float] = None  # Timestamp when started
         self.elapsed_while_paused = 0  # Total time paused
@@ -51,11 +79,8 @@ class TimerService:
         self.is_running = True
         self.is_paused = False
         
-        # Start countdown thread if not already running
-        if self.timer_thread is None or not self.timer_thread.is_alive():
-            self.timer_thread = threading.Thread(target=self._countdown, daemon=True)
-            self.timer_thread.start()
-            print(f'[TimerService] Started timer for session {self.session_id}, duration: {self.initial_duration}s')
+        self._schedule()
+        print(f'[TimerService] Started timer for session {self.session_id}, duration: {self.initial_duration}s')
     
     def pause(self):
         """Pause the timer"""
@@ -64,6 +89,8 @@ class TimerService:
         
         self.is_paused = True
         self.paused_at = time.time()
+        self._generation += 1
+        self._last_payload = None
         print(f'[TimerService] Paused timer for session {self.session_id}')
     
     def resume(self):
@@ -82,10 +109,7 @@ class TimerService:
             self.elapsed_while_paused += (now - self.paused_at)
             self.paused_at = None
         
-        # Ensure timer thread is running
-        if self.timer_thread is None or not self.timer_thread.is_alive():
-            self.timer_thread = threading.Thread(target=self._countdown, daemon=True)
-            self.timer_thread.start()
+        self._schedule()
         
         print(f'[TimerService] Resumed timer for session {self.session_id}, is_running={self.is_running}, is_paused={self.is_paused}')
     
@@ -93,9 +117,12 @@ class TimerService:
         """Reset the timer"""
         self.is_running = False
         self.is_paused = False
+        self._generation += 1
         self.paused_at = None
         self.started_at = None
         self.elapsed_while_paused = 0
+        self._last_broadcast = None
+        self._last_payload = None
         
         if new_duration is not None:
             self.initial_duration = new_duration
@@ -109,55 +136,50 @@ class TimerService:
         """Stop the timer completely"""
         self.is_running = False
         self.is_paused = False
+        self._generation += 1
+        self._last_payload = None
         print(f'[TimerService] Stopped timer for session {self.session_id}')
     
-    def _countdown(self):
-        """Countdown loop"""
-        last_broadcast_time = time.time()
-        broadcast_interval = 1.0  # Broadcast every second
+    def _schedule(self):
+        """Queue the first tick one interval from now, superseding any queued tick"""
+        self._generation += 1
+        _push_tick(self, time.monotonic() + TICK_INTERVAL, self._generation)
+    
+    def _tick(self) -> bool:
+        """
+        Called by the scheduler once per interval.
+        Remaining time is derived from started_at, so a late or missed tick self-corrects.
+        Returns True while the timer should stay scheduled.
+        """
+        if not self.is_running or self.is_paused:
+            return False
         
-        while self.is_running:
-            try:
-                # If paused, wait and continue
-                if self.is_paused:
-                    time.sleep(0.1)
-                    continue
-                
-                # Calculate elapsed time
-                now = time.time()
-                if self.started_at:
-                    elapsed = (now - self.started_at) - self.elapsed_while_paused
-                    self.remaining_seconds = max(0, int(self.initial_duration - elapsed))
-                else:
-                    # Fallback: decrement by 1 each second
-                    time.sleep(1)
-                    self.remaining_seconds = max(0, self.remaining_seconds - 1)
-                
-                # Broadcast update every second
-                if now - last_broadcast_time >= broadcast_interval:
-                    self._broadcast_update()
-                    last_broadcast_time = now
-                
-                # Check if timer expired
-                if self.remaining_seconds <= 0:
-                    self.remaining_seconds = 0
-                    self._on_timeout()
-                    break
-                
-                # Sleep for a short interval to avoid busy waiting
-                time.sleep(0.1)
-                
-            except Exception as e:
-                print(f'[TimerService] Error in countdown loop for session {self.session_id}: {e}')
-                import traceback
-                traceback.print_exc()
-                time.sleep(1)
+        if self.started_at:
+            elapsed = (time.time() - self.started_at) - self.elapsed_while_paused
+            self.remaining_seconds = max(0, int(self.initial_duration - elapsed))
+        else:
+            # Fallback: decrement by 1 each tick
+            self.remaining_seconds = max(0, self.remaining_seconds - 1)
+        
+        self._broadcast_update()
+        
+        # Check if timer expired
+        if self.remaining_seconds <= 0:
+            self.remaining_seconds = 0
+            self._on_timeout()
+            return False
+        
+        return self.is_running and not self.is_paused
     
     def _broadcast_update(self):
-        """Broadcast timer update via WebSocket"""
+        """Broadcast timer update via WebSocket (skipped when nothing visible changed)"""
+        state = (self.remaining_seconds, self.is_running and not self.is_paused, self.is_paused)
+        if state == self._last_broadcast:
+            return
+        self._last_broadcast = state
         try:
             from websocket.handlers import get_socketio
-            from routes.session import commit_session, sessions
+            from routes.session import commit_session_deferred, sessions
             from services.annotation_service import check_and_force_trigger_annotation
 
             socketio = get_socketio()
@@ -166,16 +188,22 @@ class TimerService:
             session_key = None
             found_session = None
             
-            # Try to find session by session_id
-            for sid, session in sessions.items():
-                if session.get('session_id') == self.session_id or sid == self.session_id:
-                    found_session = session
-                    session_key = sid
-                    break
+            # Sessions are keyed by session_id, so try the direct lookup before scanning
+            if self.session_id in sessions:
+                session_key = self.session_id
+                found_session = sessions[session_key]
+            else:
+                for sid, session in sessions.items():
+                    if session.get('session_id') == self.session_id:
+                        found_session = session
+                        session_key = sid
+                        break
             
             if found_session:
                 found_session['remaining_seconds'] = self.remaining_seconds
-                commit_session(session_key, found_session)
+                # Once a second per running session: coalesce the DB write and patch just this
+                # field (status changes such as pause/expiry still commit immediately)
+                commit_session_deferred(session_key, found_session, fields=('remaining_seconds',))
 
                 # If no action has triggered annotation inside a checkpoint window,
                 # force trigger near the end of that window.
@@ -198,7 +226,8 @@ class TimerService:
                 payload['timer_display_mode'] = 'count_up'
                 payload['formatted'] = self._format_time(elapsed)
 
-            # Broadcast timer update
+            # Broadcast timer update (payload is never mutated after this, so it can be shared)
+            self._last_payload = payload
             socketio.emit('timer_update', payload, room=self.session_id)
             
         except Exception as e:
@@ -213,8 +242,7 @@ class TimerService:
     def _on_timeout(self):
         """Called when timer reaches zero"""
         try:
-            from routes.session import commit_session, sessions
-            from websocket.handlers import broadcast_participant_update, get_socketio
+            from websocket.handlers import get_socketio
             
             # Emit final timer_update with remaining_seconds=0 so frontend receives it
             # (the countdown loop breaks before _broadcast_update, so we'd otherwise never send 0)
@@ -230,10 +258,28 @@ class TimerService:
                     'is_running': False,
                     'is_paused': True,
                 }
+                self._last_payload = final_payload
                 socketio.emit('timer_update', final_payload, room=self.session_id)
             except Exception as e:
                 print(f'[TimerService] Error emitting final timer_update: {e}')
             
+            self.is_running = False
+            
+            # Committing the session and broadcasting participants hits the database; do it off
+            # the shared scheduler thread so other sessions' ticks are not held up.
+            _start_background(self._expire_session)
+            
+        except Exception as e:
+            print(f'[TimerService] Error handling timeout: {e}')
+            import traceback
+            traceback.print_exc()
+    
+    def _expire_session(self):
+        """Auto-pause the session after the timer ran out (runs as a background task)"""
+        try:
+            from routes.session import commit_session, sessions
+            from websocket.handlers import broadcast_participant_update
+            
             # Find and update session status
             session_key = None
             found_session = None
@@ -255,7 +301,7 @@ class TimerService:
                 if experiment_type == 'hiddenprofile':
                     participants = found_session.get('participants', [])
                     has_human_participant = any(
-                        p.get('type', '').lower() not in ['ai', 'ai_agent'] 
+                        p.get('type', '').lower() not in AI_PARTICIPANT_TYPES 
                         for p in participants
                     )
                     
@@ -286,8 +332,6 @@ class TimerService:
                 
                 print(f'[TimerService] Timer expired for session {self.session_id}, auto-paused')
             
-            self.is_running = False
-            
         except Exception as e:
             print(f'[TimerService] Error handling timeout: {e}')
             import traceback
@@ -298,10 +342,71 @@ class TimerService:
         return self.remaining_seconds
 
 
+def _start_background(target):
+    """Run target as a SocketIO background task (plain daemon thread outside the server)"""
+    try:
+        from websocket.handlers import get_socketio
+
+        get_socketio().start_background_task(target)
+    except RuntimeError:
+        # SocketIO not registered (scripts); a plain daemon thread behaves the same
+        threading.Thread(target=target, daemon=True).start()
+
+
+def _push_tick(timer: TimerService, deadline: float, generation: int):
+    """Add a tick to the shared schedule and wake the scheduler"""
+    global _scheduler_started
+    with _schedule_lock:
+        heapq.heappush(_schedule, (deadline, next(_schedule_seq), timer, generation))
+        start_scheduler = not _scheduler_started
+        _scheduler_started = True
+    if start_scheduler:
+        _start_background(_run_scheduler)
+    _schedule_wakeup.set()
+
+
+def _run_scheduler():
+    """Single loop driving every running timer; sleeps until the earliest deadline"""
+    while True:
+        _schedule_wakeup.clear()
+        now = time.monotonic()
+        due = []
+        with _schedule_lock:
+            while _schedule and _schedule[0][0] <= now:
+                due.append(heapq.heappop(_schedule))
+            timeout = (_schedule[0][0] - now) if _schedule else None
+        
+        for deadline, _seq, timer, generation in due:
+            if generation != timer._generation:
+                continue  # Paused, stopped, reset or rescheduled since this tick was queued
+            try:
+                keep = timer._tick()
+            except Exception as e:
+                print(f'[TimerService] Error in countdown tick for session {timer.session_id}: {e}')
+                import traceback
+                traceback.print_exc()
+                keep = timer.is_running and not timer.is_paused
+            if keep and generation == timer._generation:
+                next_deadline = deadline + TICK_INTERVAL
+                now = time.monotonic()
+                if next_deadline <= now:
+                    next_deadline = now + TICK_INTERVAL
+                _push_tick(timer, next_deadline, generation)
+        
+        if due:
+            continue
+        _schedule_wakeup.wait(timeout)
+
+
 def get_timer(session_id: str) -> Optional[TimerService]:
     """Get timer service for a session"""
-    with _timers_lock:
-        return _timers.get(session_id)
+    return _timers.get(session_id)
+
+
+def get_timer_snapshot(session_id: str) -> Optional[Dict[str, Any]]:
+    """Last timer_update payload broadcast for a session, or None while paused/stopped/not yet ticked"""
+    timer = _timers.get(session_id)
+    return timer._last_payload if timer else None
 
 
 def create_timer(session_id: str, duration_seconds: int) -> TimerService:
@@ -4,10 +4,18 @@ WebSocket handlers for real-time communication
 from flask import request
 from flask_socketio import emit, join_room, leave_room
 from datetime import datetime
+import logging
+import queue
 import uuid
 
+from config.experiments import AI_PARTICIPANT_TYPES
+
+logger = logging.getLogger(__name__)
+
 # Store active connections (session_id -> set of socket_ids)
 active_connections = {}
+# Reverse index (socket_id -> set of session_ids joined), so disconnect does not walk every room
+_sid_rooms = {}
 
 # IMPORTANT:
 # Do NOT import `socketio` from app.py here.
@@ -23,32 +31,123 @@ def get_socketio():
         raise RuntimeError('SocketIO instance not registered yet. Call register_handlers(socketio) first.')
     return _socketio_instance
 
+# Room broadcasts issued from HTTP handlers (participant/config updates) are handed to one
+# background task, which sends them in order. The request returns without waiting for the
+# payload to be encoded and fanned out to every client in the room.
+_emit_queue = queue.SimpleQueue()
+
+
+# participants_updated payloads reference the live session and participant objects, so a generic
+# update still queued behind a newer participants_updated for the same room would be encoded and
+# sent with the same state as that one. Those are dropped; typed updates (status_changed,
+# trade_update, ...) trigger client handling of their own and are always sent.
+_SUPERSEDABLE_UPDATE_TYPES = frozenset({'full', 'partial'})
+
+
+def _superseded(payload, later_payload):
+    return (
+        later_payload is not None
+        and payload.get('update_type') in _SUPERSEDABLE_UPDATE_TYPES
+        and payload.get('session_info') in (None, later_payload.get('session_info'))
+    )
+
+
+def _emit_worker(socketio):
+    while True:
+        batch = [_emit_queue.get()]
+        while True:
+            try:
+                batch.append(_emit_queue.get_nowait())
+            except queue.Empty:
+                break
+        if len(batch) > 1:
+            latest = {}  # room -> newest participants_updated payload seen so far (walking back)
+            kept = []
+            for item in reversed(batch):
+                event, payload, room = item
+                if event == 'participants_updated':
+                    if _superseded(payload, latest.get(room)):
+                        continue
+                    latest[room] = payload
+                kept.append(item)
+            batch = kept[::-1]
+        for event, payload, room in batch:
+            try:
+                socketio.emit(event, payload, room=room)
+            except Exception as e:
+                logger.exception('Error emitting %s to room %s: %s', event, room, e)
+
+
+def emit_async(event, payload, room):
+    """Queue a room emit for the background sender (started by register_handlers)."""
+    _emit_queue.put((event, payload, room))
+
+# Client-supplied session identifier (session_id UUID, sessions key or session_name) ->
+# sessions key. Every socket event (typing, meeting signaling, transcripts, ...) resolves
+# its identifier, and the mapping does not change for the life of a session, so remember
+# the key instead of scanning every session per event. Hits are re-validated against the
+# live dict, which covers deleted or renamed sessions without explicit invalidation.
+_SESSION_KEY_CACHE_MAX = 4096
+_session_key_cache = {}
+
+
+def _session_matches(sid, session, session_identifier):
+    return (
+        session.get('session_id') == session_identifier
+        or sid == session_identifier
+        or session.get('session_name') == session_identifier
+    )
+
+
+def resolve_session(session_identifier):
+    """Return (sessions key, session, room id) for a client identifier, or (None, None, None)."""
+    import routes.session as session_module
+    sessions = session_module.sessions
+
+    sid = _session_key_cache.get(session_identifier)
+    if sid is not None:
+        session = sessions.get(sid)
+        if session is not None and _session_matches(sid, session, session_identifier):
+            return sid, session, session.get('session_id') or sid
+
+    for sid, session in sessions.items():
+        if _session_matches(sid, session, session_identifier):
+            if len(_session_key_cache) >= _SESSION_KEY_CACHE_MAX:
+                _session_key_cache.clear()
+            _session_key_cache[session_identifier] = sid
+            return sid, session, session.get('session_id') or sid
+    return None, None, None
+
+def _untrack_connection(room_id, sid):
+    connections = active_connections.get(room_id)
+    if connections is not None:
+        connections.discard(sid)
+        if not connections:
+            active_connections.pop(room_id, None)
+
 # Register handlers - these will be registered when app.py imports this module
 # after socketio is initialized
 def register_handlers(socketio):
     """Register all socketio handlers"""
     global _socketio_instance
     _socketio_instance = socketio
-    print('[WebSocket] Registering handlers with socketio instance')
+    socketio.start_background_task(_emit_worker, socketio)
+    logger.info('Registering handlers with socketio instance')
 
     @socketio.on('connect')
     def handle_connect():
         """Handle client connection"""
-        print(f'Client connected: {request.sid}')
+        logger.info('Client connected: %s', request.sid)
         emit('connected', {'message': 'Connected to server', 'socket_id': request.sid})
 
     @socketio.on('disconnect')
     def handle_disconnect():
         """Handle client disconnection"""
-        print(f'Client disconnected: {request.sid}')
+        logger.info('Client disconnected: %s', request.sid)
         
-        # Remove from all sessions
-        for session_id, connections in active_connections.items():
-            if request.sid in connections:
-                connections.remove(request.sid)
-                if not connections:
-                    del active_connections[session_id]
-                break
+        # Remove from the sessions this socket joined
+        for room_id in _sid_rooms.pop(request.sid, ()):
+            _untrack_connection(room_id, request.sid)
 
     @socketio.on('join_session')
     def handle_join_session(data):
@@ -61,25 +160,8 @@ def register_handlers(socketio):
                 emit('error', {'message': 'session_id is required'})
                 return
             
-            # Find session and get the actual session_id (UUID)
-            import routes.session as session_module
-            sessions = session_module.sessions
-            
-            found_session = None
-            actual_session_id = None  # This will be the UUID we use as room identifier
-            
-            # Try to find session by session_id (UUID) or session_name
-            for sid, session in sessions.items():
-                # Check if provided identifier matches session_id (UUID) or dictionary key
-                if session.get('session_id') == session_identifier or sid == session_identifier:
-                    found_session = session
-                    actual_session_id = session.get('session_id') or sid
-                    break
-                # Check if provided identifier matches session_name
-                elif session.get('session_name') == session_identifier:
-                    found_session = session
-                    actual_session_id = session.get('session_id') or sid
-                    break
+            # Find session and get the actual session_id (UUID) used as room identifier
+            _, found_session, actual_session_id = resolve_session(session_identifier)
             
             if not found_session or not actual_session_id:
                 emit('error', {'message': f'Session not found: {session_identifier}'})
@@ -92,11 +174,10 @@ def register_handlers(socketio):
             join_room(room_id)
             
             # Track the connection
-            if room_id not in active_connections:
-                active_connections[room_id] = set()
-            active_connections[room_id].add(request.sid)
+            active_connections.setdefault(room_id, set()).add(request.sid)
+            _sid_rooms.setdefault(request.sid, set()).add(room_id)
             
-            print(f'Client {request.sid} joined session room {room_id} (provided: {session_identifier}, role: {role})')
+            logger.info('Client %s joined session room %s (provided: %s, role: %s)', request.sid, room_id, session_identifier, role)
             
             # Notify the client
             emit('joined_session', {
@@ -105,6 +186,13 @@ def register_handlers(socketio):
                 'message': f'Successfully joined session {actual_session_id}'
             })
 
+            # Replay the current countdown from the timer's last broadcast (no recomputation),
+            # so the client does not wait up to a tick for its first timer_update
+            from services.timer_service import get_timer_snapshot
+            timer_snapshot = get_timer_snapshot(room_id)
+            if timer_snapshot:
+                emit('timer_update', timer_snapshot)
+
             # Notify others in the session
             emit('user_joined', {
                 'socket_id': request.sid,
@@ -112,7 +200,7 @@ def register_handlers(socketio):
             }, room=room_id, include_self=False)
             
         except Exception as e:
-            print(f'Error joining session: {e}')
+            logger.error('Error joining session: %s', e)
             emit('error', {'message': str(e)})
 
     @socketio.on('leave_session')
@@ -125,25 +213,8 @@ def register_handlers(socketio):
                 emit('error', {'message': 'session_id is required'})
                 return
             
-            # Find session and get the actual session_id (UUID)
-            import routes.session as session_module
-            sessions = session_module.sessions
-            
-            found_session = None
-            actual_session_id = None  # This will be the UUID we use as room identifier
-            
-            # Try to find session by session_id (UUID) or session_name
-            for sid, session in sessions.items():
-                # Check if provided identifier matches session_id (UUID) or dictionary key
-                if session.get('session_id') == session_identifier or sid == session_identifier:
-                    found_session = session
-                    actual_session_id = session.get('session_id') or sid
-                    break
-                # Check if provided identifier matches session_name
-                elif session.get('session_name') == session_identifier:
-                    found_session = session
-                    actual_session_id = session.get('session_id') or sid
-                    break
+            # Find session and get the actual session_id (UUID) used as room identifier
+            _, found_session, actual_session_id = resolve_session(session_identifier)
             
             if not found_session or not actual_session_id:
                 # Session not found, but still try to leave the room with provided identifier
@@ -157,12 +228,14 @@ def register_handlers(socketio):
             leave_room(room_id)
             
             # Remove from tracking
-            if room_id in active_connections:
-                active_connections[room_id].discard(request.sid)
-                if not active_connections[room_id]:
-                    del active_connections[room_id]
+            _untrack_connection(room_id, request.sid)
+            joined = _sid_rooms.get(request.sid)
+            if joined is not None:
+                joined.discard(room_id)
+                if not joined:
+                    _sid_rooms.pop(request.sid, None)
             
-            print(f'Client {request.sid} left session room {room_id} (provided: {session_identifier})')
+            logger.info('Client %s left session room %s (provided: %s)', request.sid, room_id, session_identifier)
             
             # Notify the client
             emit('left_session', {
@@ -176,15 +249,15 @@ def register_handlers(socketio):
             }, room=room_id, include_self=False)
             
         except Exception as e:
-            print(f'Error leaving session: {e}')
+            logger.error('Error leaving session: %s', e)
             emit('error', {'message': str(e)})
 
     @socketio.on('ping')
     def handle_ping(data=None):
         """Handle ping for connection testing"""
-        print(f'[WebSocket] Received ping from {request.sid}, data: {data}')
+        logger.debug('Received ping from %s, data: %s', request.sid, data)
         emit('pong', {'message': 'pong', 'timestamp': datetime.now().isoformat()})
-        print(f'[WebSocket] Sent pong to {request.sid}')
+        logger.debug('Sent pong to %s', request.sid)
     
     @socketio.on('vote_popup_shown')
     def handle_vote_popup_shown(data):
@@ -195,7 +268,7 @@ def register_handlers(socketio):
             vote_type = data.get('vote_type')  # 'initial' or 'final'
             
             if not session_identifier or not participant_id or not vote_type:
-                print(f'[WebSocket] vote_popup_shown: Missing required fields')
+                logger.warning('vote_popup_shown: Missing required fields')
                 return
             
             # Only handle for HiddenProfile experiment
@@ -203,7 +276,7 @@ def register_handlers(socketio):
             from routes.participant import find_session_by_identifier
             session_key, session = find_session_by_identifier(session_identifier)
             if not session:
-                print(f'[WebSocket] vote_popup_shown: Session {session_identifier} not found')
+                logger.warning('vote_popup_shown: Session %s not found', session_identifier)
                 return
             
             if session.get('experiment_type') != 'hiddenprofile':
@@ -220,23 +293,26 @@ def register_handlers(socketio):
                     break
             
             if not participant:
-                print(f'[WebSocket] vote_popup_shown: Participant {participant_id} not found')
+                logger.warning('vote_popup_shown: Participant %s not found', participant_id)
                 return
             
             # If this is a human participant showing the vote popup, trigger all AI agents
             # If this is an AI agent, only trigger that specific agent
             participant_type = participant.get('type', '').lower()
-            is_human = participant_type not in ['ai', 'ai_agent']
+            is_human = participant_type not in AI_PARTICIPANT_TYPES
             
             if is_human:
                 # Human participant showed vote popup - trigger all AI agents in the session
                 participants_list = session.get('participants', [])
                 ai_agents = [
                     p for p in participants_list 
-                    if p.get('type', '').lower() in ['ai', 'ai_agent']
+                    if p.get('type', '').lower() in AI_PARTICIPANT_TYPES
                 ]
                 
-                print(f'[WebSocket] vote_popup_shown: Human participant {participant_id} showed {vote_type} vote popup, triggering {len(ai_agents)} AI agents')
+                logger.info(
+                    'vote_popup_shown: Human participant %s showed %s vote popup, triggering %d AI agents',
+                    participant_id, vote_type, len(ai_agents),
+                )
                 
                 from agent.agent_runner import get_agent_runner
                 for ai_participant in ai_agents:
@@ -245,27 +321,31 @@ def register_handlers(socketio):
                         # Use actual_session_id (UUID) to find agent runner
                         runner = get_agent_runner(ai_participant_id, actual_session_id)
                         if runner:
-                            print(f'[WebSocket] vote_popup_shown: Triggering {vote_type} vote for agent {ai_participant_id} in session {actual_session_id}')
+                            logger.info('vote_popup_shown: Triggering %s vote for agent %s in session %s', vote_type, ai_participant_id, actual_session_id)
                             runner._trigger_vote(vote_type, ai_participant, session, session_key)
                         else:
-                            print(f'[WebSocket] vote_popup_shown: Agent runner not found for participant {ai_participant_id} in session {actual_session_id} (provided: {session_identifier})')
+                            logger.warning(
+                                'vote_popup_shown: Agent runner not found for participant %s in session %s (provided: %s)',
+                                ai_participant_id, actual_session_id, session_identifier,
+                            )
             else:
                 # AI agent showing vote popup - trigger only that agent
                 from agent.agent_runner import get_agent_runner
                 # Use actual_session_id (UUID) to find agent runner
                 runner = get_agent_runner(participant_id, actual_session_id)
                 if runner:
-                    print(f'[WebSocket] vote_popup_shown: Triggering {vote_type} vote for agent {participant_id} in session {actual_session_id}')
+                    logger.info('vote_popup_shown: Triggering %s vote for agent %s in session %s', vote_type, participant_id, actual_session_id)
                     # Directly trigger voting
                     # Note: We need to re-fetch participant to ensure we have the latest state
                     runner._trigger_vote(vote_type, participant, session, session_key)
                 else:
-                    print(f'[WebSocket] vote_popup_shown: Agent runner not found for participant {participant_id} in session {actual_session_id} (provided: {session_identifier})')
+                    logger.warning(
+                        'vote_popup_shown: Agent runner not found for participant %s in session %s (provided: %s)',
+                        participant_id, actual_session_id, session_identifier,
+                    )
                 
         except Exception as e:
-            print(f'[WebSocket] Error handling vote_popup_shown: {e}')
-            import traceback
-            traceback.print_exc()
+            logger.exception('Error handling vote_popup_shown: %s', e)
 
     @socketio.on('send_message')
     def handle_send_message(data):
@@ -296,28 +376,8 @@ def register_handlers(socketio):
                 emit('error', {'message': 'content cannot be empty'})
                 return
             
-            # Lazy import to avoid circular import
-            import routes.session as session_module
-            sessions = session_module.sessions
-            
-            # Find session and get the actual session_id (UUID)
-            found_session = None
-            actual_session_id = None  # This will be the UUID we use as room identifier
-            session_key = None
-            
-            for sid, session in sessions.items():
-                # Check if provided identifier matches session_id (UUID) or dictionary key
-                if session.get('session_id') == session_id or sid == session_id:
-                    found_session = session
-                    actual_session_id = session.get('session_id') or sid
-                    session_key = sid
-                    break
-                # Check if provided identifier matches session_name
-                elif session.get('session_name') == session_id:
-                    found_session = session
-                    actual_session_id = session.get('session_id') or sid
-                    session_key = sid
-                    break
+            # Find session and get the actual session_id (UUID) used as room identifier
+            session_key, found_session, actual_session_id = resolve_session(session_id)
             
             if not found_session or not actual_session_id or not session_key:
                 emit('error', {'message': 'Session not found'})
@@ -359,6 +419,10 @@ def register_handlers(socketio):
                     if 'messages' not in participant:
                         participant['messages'] = []
                     participant['messages'].append(message)
+
+            # Persist the chat log with the next coalesced session write
+            import routes.session as session_module
+            session_module.commit_session_deferred(session_key, found_session)
             
             
             # Check if sender is human or agent
@@ -371,23 +435,15 @@ def register_handlers(socketio):
             
             sender_type = sender_participant.get('type', 'unknown') if sender_participant else 'unknown'
             
-            # Broadcast message to all participants in the session
+            # Broadcast message to all participants in the session (private messages carry their
+            # receiver and go to the same room). A room emit is encoded once for every recipient.
             # Always use session_id (UUID) as the room identifier
             socketio = get_socketio()
             room_id = actual_session_id
-            
-            # Check how many clients are in the room
-            room_connections = active_connections.get(room_id, set())
-            
-            if receiver is None:
-                # Group chat: broadcast to all in session
-                socketio.emit('message_received', message, room=room_id)
-            else:
-                # Private message: send to sender and receiver only
-                socketio.emit('message_received', message, room=room_id)
+            socketio.emit('message_received', message, room=room_id)
 
             # Action log (human only gets screenshot/html_snapshot)
-            is_human_sender = (sender_type or '').lower() not in ('ai', 'ai_agent')
+            is_human_sender = (sender_type or '').lower() not in AI_PARTICIPANT_TYPES
             from services.action_logger import log_action
             logged_action_id = log_action(
                 session_id=actual_session_id,
@@ -425,9 +481,10 @@ def register_handlers(socketio):
                         client_timestamp=received_ts,
                     )
                     if should_trigger and checkpoint is not None:
-                        trigger_annotation(session_key, found_session, checkpoint, sessions)
+                        import routes.session as session_module
+                        trigger_annotation(session_key, found_session, checkpoint, session_module.sessions)
                 except Exception as ann_err:
-                    print(f'[Annotation] Error checking/triggering after message: {ann_err}')
+                    logger.error('Annotation check/trigger after message failed: %s', ann_err)
 
             # Confirm to sender (emit to the requesting client)
             emit('message_sent', {
@@ -440,8 +497,7 @@ def register_handlers(socketio):
             })
             
         except Exception as e:
-            import traceback
-            traceback.print_exc()
+            logger.exception('Error handling send_message: %s', e)
             try:
                 emit('error', {'message': str(e), 'type': 'send_message_error'})
             except Exception:
@@ -460,19 +516,7 @@ def register_handlers(socketio):
                 return
             if screenshot is None and html_snapshot is None:
                 return
-            import routes.session as session_module
-            sessions = session_module.sessions
-            found_session = None
-            actual_session_id = None
-            for sid, session in sessions.items():
-                if session.get('session_id') == session_id or sid == session_id:
-                    found_session = session
-                    actual_session_id = session.get('session_id') or sid
-                    break
-                elif session.get('session_name') == session_id:
-                    found_session = session
-                    actual_session_id = session.get('session_id') or sid
-                    break
+            _, found_session, actual_session_id = resolve_session(session_id)
             if not found_session:
                 return
             from services.action_logger import attach_human_action_capture
@@ -485,11 +529,9 @@ def register_handlers(socketio):
                 session=found_session,
             )
             if not ok:
-                print(f'[WebSocket] send_message_context: attach failed action_id={action_id} sender={sender}')
+                logger.warning('send_message_context: attach failed action_id=%s sender=%s', action_id, sender)
         except Exception as e:
-            print(f'[WebSocket] send_message_context error: {e}')
-            import traceback
-            traceback.print_exc()
+            logger.exception('send_message_context error: %s', e)
 
     @socketio.on('typing_indicator')
     def handle_typing_indicator(data):
@@ -502,17 +544,7 @@ def register_handlers(socketio):
             if not session_id or not sender:
                 return
 
-            import routes.session as session_module
-            sessions = session_module.sessions
-
-            actual_session_id = None
-            for sid, session in sessions.items():
-                if session.get('session_id') == session_id or sid == session_id:
-                    actual_session_id = session.get('session_id') or sid
-                    break
-                elif session.get('session_name') == session_id:
-                    actual_session_id = session.get('session_id') or sid
-                    break
+            _, _, actual_session_id = resolve_session(session_id)
 
             if not actual_session_id:
                 return
@@ -526,7 +558,7 @@ def register_handlers(socketio):
             socketio_inst = get_socketio()
             socketio_inst.emit('typing_indicator', payload, room=actual_session_id)
         except Exception as e:
-            print(f'[WebSocket] Error handling typing_indicator: {e}')
+            logger.error('Error handling typing_indicator: %s', e)
 
     # Meeting room: participant_id -> socket_id mapping per session
     meeting_participants = {}  # session_id -> { participant_id: socket_id }
@@ -540,13 +572,7 @@ def register_handlers(socketio):
             if not session_identifier or not participant_id:
                 emit('error', {'message': 'session_id and participant_id required'})
                 return
-            import routes.session as session_module
-            sessions = session_module.sessions
-            actual_session_id = None
-            for sid, session in sessions.items():
-                if session.get('session_id') == session_identifier or sid == session_identifier or session.get('session_name') == session_identifier:
-                    actual_session_id = session.get('session_id') or sid
-                    break
+            _, _, actual_session_id = resolve_session(session_identifier)
             if not actual_session_id:
                 actual_session_id = session_identifier
             room_id = actual_session_id
@@ -560,7 +586,7 @@ def register_handlers(socketio):
                 'session_id': actual_session_id
             }, room=room_id, include_self=False)
         except Exception as e:
-            print(f'[Meeting] Error: {e}')
+            logger.error('meeting_join error: %s', e)
             emit('error', {'message': str(e)})
 
     @socketio.on('meeting_leave')
@@ -571,13 +597,7 @@ def register_handlers(socketio):
             participant_id = data.get('participant_id')
             if not session_identifier or not participant_id:
                 return
-            import routes.session as session_module
-            sessions = session_module.sessions
-            actual_session_id = None
-            for sid, session in sessions.items():
-                if session.get('session_id') == session_identifier or sid == session_identifier or session.get('session_name') == session_identifier:
-                    actual_session_id = session.get('session_id') or sid
-                    break
+            _, _, actual_session_id = resolve_session(session_identifier)
             if not actual_session_id:
                 actual_session_id = session_identifier
             if actual_session_id in meeting_participants and participant_id in meeting_participants[actual_session_id]:
@@ -585,7 +605,7 @@ def register_handlers(socketio):
                 if not meeting_participants[actual_session_id]:
                     del meeting_participants[actual_session_id]
         except Exception as e:
-            print(f'[Meeting] Leave error: {e}')
+            logger.error('meeting_leave error: %s', e)
 
     @socketio.on('meeting_signal')
     def handle_meeting_signal(data):
@@ -599,13 +619,7 @@ def register_handlers(socketio):
             if not all([session_identifier, from_participant, to_participant, sig_type, sig_data is not None]):
                 return
             # Resolve session identifier to actual session_id (same as meeting_join)
-            import routes.session as session_module
-            sessions = session_module.sessions
-            actual_session_id = None
-            for sid, session in sessions.items():
-                if session.get('session_id') == session_identifier or sid == session_identifier or session.get('session_name') == session_identifier:
-                    actual_session_id = session.get('session_id') or sid
-                    break
+            _, _, actual_session_id = resolve_session(session_identifier)
             if not actual_session_id:
                 actual_session_id = session_identifier
             room_participants = meeting_participants.get(actual_session_id, {})
@@ -619,7 +633,7 @@ def register_handlers(socketio):
                     'data': sig_data
                 }, room=target_socket)
         except Exception as e:
-            print(f'[Meeting] Signal error: {e}')
+            logger.error('meeting_signal error: %s', e)
 
     @socketio.on('meeting_transcript_share')
     def handle_meeting_transcript_share(data):
@@ -630,17 +644,7 @@ def register_handlers(socketio):
             text = (data.get('text') or '').strip()
             if not session_identifier or not participant_id or not text:
                 return
-            import routes.session as session_module
-            sessions = session_module.sessions
-            actual_session_id = None
-            for sid, session in sessions.items():
-                if (
-                    session.get('session_id') == session_identifier
-                    or sid == session_identifier
-                    or session.get('session_name') == session_identifier
-                ):
-                    actual_session_id = session.get('session_id') or sid
-                    break
+            _, _, actual_session_id = resolve_session(session_identifier)
             if not actual_session_id:
                 actual_session_id = session_identifier
             room_id = actual_session_id
@@ -656,7 +660,7 @@ def register_handlers(socketio):
                 include_self=False,
             )
         except Exception as e:
-            print(f'[Meeting] Transcript share error: {e}')
+            logger.error('meeting_transcript_share error: %s', e)
 
 
 def broadcast_participant_update(session_id, participants, session_info=None, update_type='full'):
@@ -670,28 +674,8 @@ def broadcast_participant_update(session_id, participants, session_info=None, up
         update_type: Type of update ('full', 'partial', 'status', etc.) for future extensibility
     """
     try:
-        # Lazy import to avoid circular import
-        socketio = get_socketio()
-        
-        # Find session and get the actual session_id (UUID)
-        import routes.session as session_module
-        sessions = session_module.sessions
-        
-        found_session = None
-        actual_session_id = None  # This will be the UUID we use as room identifier
-        
-        # Try to find session by session_id (UUID) or session_name
-        for sid, session in sessions.items():
-            # Check if provided identifier matches session_id (UUID) or dictionary key
-            if session.get('session_id') == session_id or sid == session_id:
-                found_session = session
-                actual_session_id = session.get('session_id') or sid
-                break
-            # Check if provided identifier matches session_name
-            elif session.get('session_name') == session_id:
-                found_session = session
-                actual_session_id = session.get('session_id') or sid
-                break
+        # Find session and get the actual session_id (UUID) used as room identifier
+        _, found_session, actual_session_id = resolve_session(session_id)
         
         # If session_info is provided, use it to get session_id
         if not actual_session_id and session_info:
@@ -722,11 +706,9 @@ def broadcast_participant_update(session_id, participants, session_info=None, up
             'timestamp': datetime.now().isoformat()
         }
         # Broadcast to all clients in the session room using session_id (UUID) only
-        socketio.emit('participants_updated', payload, room=actual_session_id)
+        emit_async('participants_updated', payload, actual_session_id)
 
-        print(f'Broadcasted participant update for session {actual_session_id} (provided: {session_id}, type: {update_type})')
+        logger.debug('Queued participant update for session %s (provided: %s, type: %s)', actual_session_id, session_id, update_type)
     except Exception as e:
-        print(f'Error broadcasting participant update: {e}')
-        import traceback
-        traceback.print_exc()
+        logger.exception('Error broadcasting participant update: %s', e)
 
@@ -0,0 +1,49 @@
+"""
+JSON module for Socket.IO packet encoding (passed to SocketIO(json=...)).
+
+Every emit (timer_update once per second per session, participant broadcasts, chat) is
+serialized by python-socketio through this module. Uses orjson when it is installed and
+falls back to the standard library otherwise; the wire format is the same compact JSON.
+dumpb() is the bytes form, for HTTP endpoints that return large payloads; it encodes the
+same values jsonify() does.
+"""
+import json
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def dumps(obj, **kwargs):
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode('utf-8')
+        except TypeError:
+            pass  # Types orjson does not handle; let the stdlib encoder decide
+    return json.dumps(obj, **kwargs)
+
+
+def dumpb(obj):
+    # Response bodies in place of jsonify(): types JSON lacks (datetime as an HTTP date, Decimal,
+    # UUID, dataclasses) are converted by Flask's own default hook on both paths.
+    from flask.json.provider import DefaultJSONProvider
+
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj,
+                default=DefaultJSONProvider.default,
+                option=_ORJSON_OPTIONS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(',', ':'), default=DefaultJSONProvider.default).encode('utf-8')
+
+
+def loads(s, **kwargs):
+    if orjson is not None and not kwargs:
+        return orjson.loads(s)
+    return json.loads(s, **kwargs)